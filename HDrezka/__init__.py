@@ -24,6 +24,7 @@ from . import player
 from . import questions_asked
 from . import site_navigation
 from . import trailer
+from . import transport
 from . import utility
 from .connector import NetworkClient
 from .exceptions import (
@@ -32,6 +33,8 @@ from .exceptions import (
     AJAXFail,
     PageNotFound,
     ServiceUnavailable,
+    CircuitOpenError,
+    ReplayMissError,
 )
 from .filters import (
     all_genres,
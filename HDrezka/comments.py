@@ -3,14 +3,14 @@ from __future__ import annotations
 import re
 import time
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import bs4
 
 from .core_navigation import PageIterator
 from .exceptions import EmptyPage, ServiceUnavailable
 from .html_representation import PageRepresentation
-from .utility import convert_string_into_datetime, calculate_count_comments
+from .utility import convert_strings_into_datetimes, calculate_count_comments
 
 
 @dataclass
@@ -43,12 +43,24 @@ class CommentsIterator(PageIterator[List[Comment]]):
         self.page_type = page_type  # 0 - film page or 1 - question page
 
     def get(self, number: Optional[int] = None):
+        self._check_page_number(number)
+        response = self._query(page=number if number is not None else self.current_page)
+        with self._connector.measure("parse", f"{self._connector.url}/ajax/get_comments/"):
+            return self._extract_page(response)
+
+    async def aget(self, number: Optional[int] = None):
+        self._check_page_number(number)
+        response = await self._aquery(page=number if number is not None else self.current_page)
+        with self._connector.measure("parse", f"{self._connector.url}/ajax/get_comments/"):
+            return self._extract_page(response)
+
+    def _check_page_number(self, number: Optional[int]):
         if self._last_page is not None and number is not None and number > self.last_page:
             raise AttributeError(
                 f'The value of "number"={number} is greater than ' f'the value of "last_page"={self.last_page}'
             )
 
-        response = self._query(page=number if number is not None else self.current_page)
+    def _extract_page(self, response):
         soup = bs4.BeautifulSoup(response["comments"], "lxml")
 
         if self._last_page is None:
@@ -69,6 +81,15 @@ class CommentsIterator(PageIterator[List[Comment]]):
         self.last_page = self._get_last_page_number(navigation_bar)
 
     def extreact_comments(self, comments):
+        timestamps = []
+        result_lst = self._extract_comments_tree(comments, timestamps)
+        # Даты всех комментариев страницы разбираются одним пакетом
+        dates = convert_strings_into_datetimes(timestamp for _, timestamp in timestamps)
+        for (comment, _), timestamp in zip(timestamps, dates):
+            comment.timestamp = timestamp
+        return result_lst
+
+    def _extract_comments_tree(self, comments, timestamps: List[Tuple[Comment, str]]) -> List[Comment]:
         child = comments.find(class_="comments-tree-list")
         result_lst = []
         if child is not None:
@@ -82,13 +103,13 @@ class CommentsIterator(PageIterator[List[Comment]]):
                     comment.author.name = "Администрация"
                     comment.author.img_url = "https://static.hdrezka.ac/templates/hdrezka/images/avatar.png"
                     comment.text = self._extract_text(comment_tree.find("div", class_="b-comment__removed"))
-                    comment.replies = self.extreact_comments(comment_tree)
+                    comment.replies = self._extract_comments_tree(comment_tree, timestamps)
                 else:
                     comment.author.name = comment_tree.next.find("span", class_="name").text.strip()
                     comment.author.img_url = comment_tree.next.find("div", class_="ava").img.get("src").strip()
-                    comment.timestamp = self._extract_timestamp(comment_tree)
+                    timestamps.append((comment, self._extract_timestamp(comment_tree)))
                     comment.text = self._extract_text(comment_tree.next.find("div", class_="text").next)
-                    comment.replies = self.extreact_comments(comment_tree)
+                    comment.replies = self._extract_comments_tree(comment_tree, timestamps)
                     comment.likes_num = int(
                         comment_tree.next.find("span", class_="b-comment__likes_count").i.text.strip()
                     )
@@ -97,8 +118,8 @@ class CommentsIterator(PageIterator[List[Comment]]):
         return result_lst
 
     @staticmethod
-    def _extract_timestamp(comment_tree):
-        return convert_string_into_datetime(comment_tree.next.find("span", class_="date").text.strip()[9:])
+    def _extract_timestamp(comment_tree) -> str:
+        return comment_tree.next.find("span", class_="date").text.strip()[9:]
 
     def _extract_text(self, tag: bs4.element.Tag) -> str:
         result_string = ""
@@ -144,7 +165,16 @@ class CommentsIterator(PageIterator[List[Comment]]):
         return str(new_tag).format(text_from_tag)
 
     def _query(self, page: Optional[int] = None):
-        data = {
+        response = self._connector.get(f"{self._connector.url}/ajax/get_comments/", params=self._make_params(page))
+        return self._process_query_response(response)
+
+    async def _aquery(self, page: Optional[int] = None):
+        url = f"{self._connector.url}/ajax/get_comments/"
+        response = await self._connector.aget(url, params=self._make_params(page))
+        return self._process_query_response(response)
+
+    def _make_params(self, page: Optional[int] = None):
+        return {
             "t": int(time.time() * 1000),
             "news_id": self.film_id,
             "cstart": self.current_page if page is None else page,
@@ -152,7 +182,9 @@ class CommentsIterator(PageIterator[List[Comment]]):
             "comment_id": 0,
             "skin": "hdrezka",
         }
-        response = self._connector.get(f"{self._connector.url}/ajax/get_comments/", params=data)
+
+    @staticmethod
+    def _process_query_response(response):
         if response.status_code == 200:
             return response.json()
         raise ServiceUnavailable("Service is temporarily unavailable")
@@ -1,13 +1,47 @@
+# pylint: disable=C0302
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import io
+import re
+import threading
+import time
 from abc import abstractmethod, ABC
-from typing import Union, Any, Type, Dict, TypeVar
+from contextlib import contextmanager, suppress
+from datetime import timedelta
+from typing import Union, Any, Type, Dict, TypeVar, Optional, Iterator, Tuple, List
 from urllib.parse import urlsplit
 
 import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
 from requests.structures import CaseInsensitiveDict
 
+from .transport import (
+    RetryPolicy,
+    RequestGovernor,
+    MirrorPool,
+    ResponseCache,
+    CachedResponse,
+    SingleFlight,
+    ReplayArchive,
+    ReplayEntry,
+    ThrottledStream,
+    EndpointRouter,
+    ProxyPool,
+    CircuitBreaker,
+    Instrumentation,
+    PhaseTracer,
+    RequestRecord,
+    determine_endpoint_type,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: NO COVER
+    httpx = None
+
 ObjectConnector = TypeVar("ObjectConnector")
 
 DEFAULT_USERAGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/117.0"
@@ -20,6 +54,12 @@ class Connector(ABC):
     for GET and POST requests.
     """
 
+    # Атрибуты политик, которые переносятся на асинхронный адаптер NetworkClient
+    policy_attributes = (
+        "single_flight", "cache", "retry_policy", "mirror_pool", "circuit_breaker", "governor", "router", "proxy_pool",
+        "instrumentation",
+    )
+
     def __init__(self, domain, user_agent, proxies):
         """
         Initialize a new instance of the class.
@@ -31,15 +71,39 @@ class Connector(ABC):
         self.domain = domain
         self.user_agent = user_agent
         self.proxies = proxies
+        self.scheme = "https"
+        self.single_flight: Optional[SingleFlight] = None
+        self.cache: Optional[ResponseCache] = None
+        self.retry_policy: Optional[RetryPolicy] = None
+        self.mirror_pool: Optional[MirrorPool] = None
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+        self.governor: Optional[RequestGovernor] = None
+        self.router: Optional[EndpointRouter] = None
+        self.proxy_pool: Optional[ProxyPool] = None
+        self.instrumentation: Optional[Instrumentation] = None
+        self.stream_pages = False
 
     @property
     def url(self):
         """
-        This method returns the URL with the specified domain.
+        This method returns the URL with the specified scheme and domain.
+
+        :return: The URL in the format "scheme://domain".
+        """
+        return f"{self.scheme}://{self.domain}"
 
-        :return: The URL in the format "https://domain".
+    @url.setter
+    def url(self, value: str):
         """
-        return f"https://{self.domain}"
+        Sets the scheme and the domain from the base URL of the site, e.g. "http://127.0.0.1:8080".
+
+        :param value: The base URL of the site.
+        """
+        url_split = urlsplit(value)
+        if not url_split.scheme or not url_split.netloc:
+            raise ValueError(f'Attribute "url" must be an absolute URL, got "{value}".')
+        self.scheme = url_split.scheme
+        self.domain = url_split.netloc
 
     def get_headers(self, url):
         """
@@ -48,27 +112,228 @@ class Connector(ABC):
         :param url: The URL to retrieve headers for.
         :return: A dictionary containing the headers.
         """
-        domain = urlsplit(str(url)).netloc
+        url_split = urlsplit(str(url))
+        domain = url_split.netloc
+        scheme = url_split.scheme or self.scheme
         header = {
             "Host": domain,
-            "Origin": f"https://{domain}",
-            "Referer": f"https://{domain}",
+            "Origin": f"{scheme}://{domain}",
+            "Referer": f"{scheme}://{domain}",
             "User-Agent": self.user_agent,
             "X-Requested-With": "XMLHttpRequest",
         }
         return CaseInsensitiveDict(header)
 
-    @abstractmethod
-    def get(self, url: Union[str, bytes], **kwargs: Dict[str, Any]):
+    def get_site_domain(self, url: Union[str, bytes]) -> str:
+        """
+        Get the domain of the site against which the endpoint type of the URL is determined.
+
+        :param url: The URL of the request.
+        :return: The domain of the URL if it is a mirror from `mirror_pool`, otherwise `domain`.
+        """
+        if self.mirror_pool is not None:
+            # Во время переключения запрос уходит на другое зеркало раньше, чем обновляется self.domain
+            domain = urlsplit(url.decode("utf-8") if isinstance(url, bytes) else url).netloc
+            if domain in self.mirror_pool:
+                return domain
+        return self.domain
+
+    def get(self, url: Union[str, bytes], **kwargs: Any):
+        """
+        Sends a GET request through `send_request`.
+
+        :param url: The URL to send the GET request to. It can be either a string or bytes.
+        :param kwargs: Additional keyword arguments to be passed to the underlying HTTP library.
+        :return: The response object of the underlying HTTP library.
+        """
+        return self.send_request("GET", url, **kwargs)
+
+    def post(self, url: Union[str, bytes], **kwargs: Any):
         """
-        Abstract implementation of the GET method
+        Sends a POST request through `send_request`.
+
+        :param url: The URL for the POST request. It can be either a string or bytes.
+        :param kwargs: Additional keyword arguments to be passed to the underlying HTTP library.
+        :return: The response object of the underlying HTTP library.
         """
+        return self.send_request("POST", url, **kwargs)
+
+    def get_page(self, url: Union[str, bytes], **kwargs: Any):
+        """
+        Sends a GET request for an HTML page of the site.
+        If `stream_pages` is set, the request is sent with `stream=True` and the body is left unread, so that
+        `HTMLDocument` can feed it into the incremental parser without materializing the whole page.
+        Streamed requests bypass `cache` and `single_flight`.
+
+        :param url: The URL of the page.
+        :param kwargs: Additional keyword arguments to be passed to the underlying HTTP library.
+        :return: The response object of the underlying HTTP library.
+        """
+        if self.stream_pages:
+            kwargs.setdefault("stream", True)
+        return self.get(url, **kwargs)
+
+    @contextmanager
+    def measure(self, kind: str, url: Union[str, bytes] = "", method: str = "GET") -> Iterator[Optional[RequestRecord]]:
+        """
+        Records the work done in the `with` block with `instrumentation`, e.g. the parsing of a page.
+        Does nothing if `instrumentation` is not set.
+
+        :param kind: The kind of the record, e.g. "parse".
+        :param url: The URL the work belongs to.
+        :param method: The HTTP method the work belongs to.
+        :return: A context manager that yields the record or None.
+        """
+        if self.instrumentation is None:
+            yield None
+            return
+        with self.instrumentation.measure(kind, url, method) as record:
+            yield record
+
+    def send_request(self, method: str, url: Union[str, bytes], **kwargs: Any):
+        """
+        Sends the request through the policies of the connector and returns the response.
+        If `single_flight` is set, identical requests in flight share one round-trip and one response.
+        If `cache` is set, stored responses are returned without a network round-trip.
+        If `retry_policy` is set, failed requests are repeated according to it.
+        If `mirror_pool` is set, requests to the site are sent to its active mirror with failover to the others.
+        If `circuit_breaker` is set, attempts to a host and path that keep failing raise `CircuitOpenError` at once.
+        If `governor` is set, every attempt waits for the rate limit and a free slot of its endpoint class,
+        a response requested with `stream=True` holds its slot until it is closed.
+        If `router` is set, every attempt is sent by the route of its endpoint class.
+        If `proxy_pool` is set, every attempt without explicit `proxies` is sent through the best proxy of the pool.
+        If `instrumentation` is set, every attempt is measured and passed to its hooks.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request. It can be either a string or bytes.
+        :param kwargs: Additional keyword arguments to be passed to the underlying HTTP library.
+        :return: The response object of the underlying HTTP library.
+        """
+        if self.single_flight is None:
+            return self._send_cached(method, url, kwargs)
+        return self.single_flight.execute(method, url, kwargs, lambda: self._send_cached(method, url, kwargs))
+
+    def _send_cached(self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]):
+        if self.cache is None:
+            return self._send_with_retry(method, url, kwargs)
+        return self.cache.execute(
+            method,
+            url,
+            kwargs,
+            lambda request_kwargs: self._send_with_retry(method, url, request_kwargs),
+            self._build_cached_response,
+            self.get_headers,
+        )
+
+    def _send_with_retry(self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]):
+        if self.retry_policy is None:
+            return self._send_attempt(method, url, kwargs)
+        return self.retry_policy.execute(method, str(url), lambda: self._send_attempt(method, url, kwargs))
+
+    def _send_attempt(self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]):
+        if self.mirror_pool is None:
+            return self._send_guarded(method, url, kwargs)
+        try:
+            return self.mirror_pool.execute(
+                method, url, lambda mirror_url: self._send_to_mirror(method, url, mirror_url, kwargs)
+            )
+        finally:
+            self._follow_active_mirror()
+
+    def _send_guarded(self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]):
+        if self.circuit_breaker is None:
+            return self._send_governed(method, url, kwargs)
+        return self.circuit_breaker.execute(url, lambda: self._send_governed(method, url, kwargs))
+
+    def _send_governed(self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]):
+        if self.governor is None:
+            return self._send_routed(method, url, kwargs)
+        with self.governor.acquire(url, self.get_site_domain(url)) as slot:
+            response = self._send_routed(method, url, kwargs)
+            if kwargs.get("stream"):
+                # Тело потокового ответа читается уже после выхода из блока, поэтому слот живёт до его закрытия
+                slot.hold_until_closed(response)
+            return response
+
+    def _send_routed(self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]):
+        endpoint = determine_endpoint_type(url, self.get_site_domain(url))
+        if self.router is not None:
+            url, kwargs = self.router.prepare(url, kwargs, self)
+        if self.instrumentation is None:
+            return self._send_proxied(method, url, kwargs)
+        return self.instrumentation.execute(
+            method, url, kwargs, lambda request_kwargs: self._send_proxied(method, url, request_kwargs),
+            endpoint=endpoint, trace=self._add_tracer,
+        )
+
+    def _send_proxied(self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]):
+        if self.proxy_pool is None or kwargs.get("proxies") is not None:
+            return self._perform(method, url, **kwargs)
+        return self.proxy_pool.execute(lambda proxies: self._perform(method, url, **kwargs, proxies=proxies))
+
+    def _add_tracer(self, kwargs: Dict[str, Any], tracer: PhaseTracer) -> Dict[str, Any]:  # pylint: disable=W0613
+        """
+        Passes the tracer of the connection phases to the underlying HTTP library, if it supports tracing.
+
+        :param kwargs: The keyword arguments of the request.
+        :param tracer: The tracer of the instrumentation.
+        :return: The keyword arguments of the request.
+        """
+        return kwargs
+
+    def _send_to_mirror(self, method: str, url: Union[str, bytes], mirror_url: str, kwargs: Dict[str, Any]):
+        # Заголовки Host/Origin/Referer, заданные для исходного URL, должны указывать на выбранное зеркало
+        headers = kwargs.get("headers")
+        if headers is not None and str(url) != mirror_url:
+            headers = CaseInsensitiveDict(headers)
+            source_headers = self.get_headers(url)
+            for name, value in self.get_headers(mirror_url).items():
+                if headers.get(name) == source_headers[name]:
+                    headers[name] = value
+            kwargs = {**kwargs, "headers": headers}
+        return self._send_guarded(method, mirror_url, kwargs)
+
+    def _follow_active_mirror(self):
+        # Новые URL навигации строятся от self.domain, поэтому он должен указывать на активное зеркало
+        if self.domain in self.mirror_pool:
+            self.domain = self.mirror_pool.active
 
     @abstractmethod
-    def post(self, url: Union[str, bytes], **kwargs: Dict[str, Any]):
+    def _perform(self, method: str, url: Union[str, bytes], **kwargs: Any):
+        """
+        Abstract implementation of a single HTTP request
+        """
+
+    @staticmethod
+    def _build_cached_response(entry: CachedResponse) -> Response:
         """
-        Abstract implementation of the GET method
+        Converts a cached response into a `requests.Response` object.
+
+        :param entry: The cached response.
+        :return: A response object equivalent to the one received from the server.
+        """
+        response = Response()
+        response.url = entry.url
+        response.status_code = entry.status_code
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.encoding = entry.encoding
+        response.reason = "OK"
+        response._content = entry.content  # pylint: disable=W0212
+        return response
+
+    def _prepare_kwargs(self, url: Union[str, bytes], kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """
+        Fills in the default request parameters: a timeout of 15 seconds and the headers of the `get_headers` method.
+
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of the request.
+        :return: The keyword arguments with the defaults applied.
+        """
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = 15
+        if kwargs.get("headers") is None:
+            kwargs["headers"] = self.get_headers(url)
+        return kwargs
 
 
 class Singleton(type):
@@ -102,6 +367,73 @@ class Singleton(type):
         return cls._instances[cls]
 
 
+class ContextSingleton(type):
+    """
+    Metaclass that implements the Singleton design pattern within an execution context.
+
+    Every class created with this metaclass gets its own `contextvars.ContextVar`, in which the current instance
+    is stored. Calling the class returns the instance of the current context, creating it on the first call.
+    Since every thread starts with an empty context, each worker thread automatically owns its own instance,
+    while asyncio tasks inherit the instance of the context in which they were created.
+
+    Usage:
+        class MyClass(metaclass=ContextSingleton):
+            pass
+
+    Notes:
+        - `ContextSingleton.create` creates an instance that is not bound to any context.
+        - `ContextSingleton.activate` makes an existing instance current in the calling context.
+        - The instance created by the first call of the class is the default one. If the class defines
+          the class method `inherit`, the instances of other contexts that are created by a call without
+          arguments are built by `inherit` from the default instance.
+    """
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._context_instance: contextvars.ContextVar = contextvars.ContextVar(f"{cls.__qualname__}", default=None)
+        cls._default_instance = None
+
+    def __call__(cls, *args, **kwargs):
+        instance = cls._context_instance.get()
+        if instance is None:
+            default = cls._default_instance
+            if default is not None and not args and not kwargs and hasattr(cls, "inherit"):
+                instance = cls.inherit(default)
+            else:
+                instance = super().__call__(*args, **kwargs)
+            if default is None:
+                cls._default_instance = instance
+            cls._context_instance.set(instance)
+        return instance
+
+    def create(cls, *args, **kwargs):
+        """
+        Creates a new instance of the class without making it current in any context.
+
+        :param args: Positional arguments to be passed to the constructor.
+        :param kwargs: Keyword arguments to be passed to the constructor.
+        :return: The new instance.
+        """
+        return super().__call__(*args, **kwargs)
+
+    def activate(cls, instance) -> contextvars.Token:
+        """
+        Makes the instance current in the calling context.
+
+        :param instance: The instance of the class.
+        :return: A token that can be used to restore the previous instance.
+        """
+        return cls._context_instance.set(instance)
+
+    def deactivate(cls, token: contextvars.Token):
+        """
+        Restores the instance that was current before the corresponding `activate` call.
+
+        :param token: The token returned by `activate`.
+        """
+        cls._context_instance.reset(token)
+
+
 class RequestConnector(Connector):
     """
     The `RequestConnector` class is a subclass of the `Connector` class that provides methods for making HTTP requests.
@@ -124,58 +456,150 @@ class RequestConnector(Connector):
         """
         super().__init__(domain, user_agent, proxies)
 
-    def get(self, url: Union[str, bytes], **kwargs: Any) -> Response:
+    def _perform(self, method: str, url: Union[str, bytes], **kwargs: Any) -> Response:
         """
-        Method: `get`
+        Method: `_perform`
 
-        This method sends a GET request to the specified URL with the provided parameters and
-        returns the response as a Response object. If the optional timeout parameter is not provided,
-        a default timeout of 15 seconds is used. If the optional headers parameter is not provided,
-        the default headers for the URL are used. Any additional keyword arguments are passed directly
-        to the underlying requests.get() function.
+        This method sends a request with the given HTTP method to the specified URL and returns the response
+        as a Response object. If the optional timeout parameter is not provided, a default timeout of 15 seconds
+        is used. If the optional headers parameter is not provided, the default headers for the URL are used.
+        Any additional keyword arguments are passed directly to the underlying requests.request() function.
 
-        :param url: The URL to send the GET request to. It can be either a string or bytes.
-        :param kwargs: Additional keyword arguments to be passed to the `requests.post` method.
-        :return: A Response object containing the response from the GET request.
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request. It can be either a string or bytes.
+        :param kwargs: Additional keyword arguments to be passed to the `requests.request` method.
+        :return: A Response object containing the response from the request.
         """
-        timeout = 15 if kwargs.get("timeout") is None else kwargs.pop("timeout")
-        headers = self.get_headers(url) if kwargs.get("headers") is None else kwargs.pop("headers")
-        return requests.get(url, headers=headers, proxies=self.proxies, **kwargs, timeout=timeout)
+        kwargs = self._prepare_kwargs(url, kwargs)
+        kwargs.setdefault("proxies", self.proxies)
+        return requests.request(method, url, timeout=kwargs.pop("timeout"), **kwargs)
+
+
+class SessionConnector(requests.sessions.Session, Connector):
+    """A class that represents a session connector for making HTTP requests.
 
-    def post(self, url: Union[str, bytes], **kwargs: Any) -> Response:
+    Unlike `RequestConnector`, all requests are sent through one `requests.Session`, so TCP and TLS
+    connections are pooled and reused (HTTP keep-alive) instead of being opened for every request.
+    The default headers are still computed for every URL with the `get_headers` method.
+    Connections that have been idle for longer than `keep_alive_timeout` seconds are discarded
+    before the next request, since the server has most likely closed them already.
+
+    This class inherits from `requests.sessions.Session` and `Connector`.
+    """
+
+    def __init__(  # pylint: disable=R0913
+            self,
+            domain="rezka.ag",
+            user_agent=DEFAULT_USERAGENT,
+            proxies=None,
+            *,
+            pool_connections: int = 10,
+            pool_maxsize: int = 32,
+            pool_block: bool = False,
+            keep_alive_timeout: Optional[float] = 60,
+    ):
         """
-        Method: `post`
+        Initialize a new instance of the class.
 
-        This method sends a POST request to the specified URL with the provided parameters and
-        returns the response as a Response object. If the optional timeout parameter is not provided,
+        :param domain: The domain of the website.
+        :param user_agent: The user agent string to be used for making requests.
+        :param proxies: A dictionary containing proxy definitions.
+        :param pool_connections: The number of hosts for which connection pools are cached.
+        :param pool_maxsize: The maximum number of connections kept alive in the pool of each host.
+        :param pool_block: Whether to wait for a free connection instead of opening
+            a new one when the pool of the host is exhausted.
+        :param keep_alive_timeout: The number of seconds an idle connection is kept for reuse.
+            If None, idle connections are never discarded.
+        """
+        super().__init__()
+        Connector.__init__(self, domain, user_agent, proxies)
+        self.keep_alive_timeout = keep_alive_timeout
+        self._last_activity = time.monotonic()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method: str, url: Union[str, bytes], **kwargs: Any) -> Response:  # pylint: disable=W0221
+        """
+        Method: `request`
+
+        This method is called by `get`, `post` and the other HTTP methods of the session,
+        it passes the request through the policies of the connector with `send_request`.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request. It can be either a string or bytes.
+        :param kwargs: Additional keyword arguments to be passed to the `requests.Session.request` method.
+        :return: A Response object containing the response from the request.
+        """
+        return self.send_request(method, url, **kwargs)
+
+    def _perform(self, method: str, url: Union[str, bytes], **kwargs: Any) -> Response:
+        """
+        Method: `_perform`
+
+        This method sends a single request through the session. If the optional timeout parameter is not provided,
         a default timeout of 15 seconds is used. If the optional headers parameter is not provided,
-        the default headers for the URL are used. Any additional keyword arguments are passed directly
-        to the underlying requests.post() function.
+        the default headers for the URL are used.
 
-        :param url: The URL for the POST request. It can be either a string or bytes.
-        :param kwargs: Additional keyword arguments to be passed to the `requests.post` method.
-            - timeout: Optional. The timeout value for the POST request in seconds.
-            If not provided, the default value is 15.
-            - headers: Optional. The headers to be included in the POST request.
-            If not provided, the headers will be retrieved using the `get_headers` method.
-        :return: A Response object containing the response from the POST request.
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request. It can be either a string or bytes.
+        :param kwargs: Additional keyword arguments to be passed to the `requests.Session.request` method.
+        :return: A Response object containing the response from the request.
         """
-        timeout = 15 if kwargs.get("timeout") is None else kwargs.pop("timeout")
-        headers = self.get_headers(url) if kwargs.get("headers") is None else kwargs.pop("headers")
-        return requests.post(url, headers=headers, proxies=self.proxies, **kwargs, timeout=timeout)
+        self._expire_idle_connections()
+        try:
+            return super().request(method, url, **self._prepare_kwargs(url, kwargs))
+        finally:
+            self._last_activity = time.monotonic()
 
+    def _expire_idle_connections(self):
+        """
+        Discards all pooled connections if the session has been idle for longer than `keep_alive_timeout`.
+        Connections that are currently in use are not affected.
+        """
+        if self.keep_alive_timeout is None or time.monotonic() - self._last_activity <= self.keep_alive_timeout:
+            return
+        for adapter in set(self.adapters.values()):
+            adapter.poolmanager.clear()
 
-class SessionConnector(requests.sessions.Session, Connector):
-    """A class that represents a session connector for making HTTP requests.
 
-    This class inherits from `requests.sessions.Session` and `Connector`.
+class ReplayConnector(Connector):
     """
+    A connector that records real traffic into a `ReplayArchive` or replays it without the network.
 
-    def __init__(
+    In the replay mode every response is delayed by `latency` seconds and its body is delivered
+    no faster than `bandwidth` bytes per second, which allows to benchmark the whole library
+    (`HDrezka.get`, navigation iterators, the downloader) deterministically on an isolated machine.
+    Requests with a "Range: bytes=N-" header are answered with the corresponding part of the recorded body.
+
+    Usage::
+
+        >>> from HDrezka.connector import NetworkClient, ReplayConnector
+        >>> from HDrezka.transport import ReplayArchive
+        >>>
+        >>> recorder = ReplayConnector(record=True)
+        >>> NetworkClient().adapter = recorder
+        >>> HDrezka().films().page(1).get()
+        >>> recorder.archive.save("rezka_traffic.zip")
+        >>>
+        >>> NetworkClient().adapter = ReplayConnector(archive=ReplayArchive.load("rezka_traffic.zip"), latency=0.1)
+    """
+
+    def __init__(  # pylint: disable=R0913
             self,
             domain="rezka.ag",
             user_agent=DEFAULT_USERAGENT,
             proxies=None,
+            *,
+            archive: Optional[ReplayArchive] = None,
+            record: bool = False,
+            connector: Optional[Connector] = None,
+            latency: float = 0.0,
+            bandwidth: Optional[float] = None,
     ):
         """
         Initialize a new instance of the class.
@@ -183,18 +607,521 @@ class SessionConnector(requests.sessions.Session, Connector):
         :param domain: The domain of the website.
         :param user_agent: The user agent string to be used for making requests.
         :param proxies: A dictionary containing proxy definitions.
+        :param archive: The archive to replay from or to record into, an empty archive by default.
+        :param record: Whether to send the requests to the network and record them.
+        :param connector: The connector used to send the requests while recording, `SessionConnector` by default.
+        :param latency: The delay in seconds before every replayed response.
+        :param bandwidth: The maximum speed of replayed bodies in bytes per second, None means no limit.
         """
-        Connector.__init__(self, domain, user_agent, proxies)
+        super().__init__(domain, user_agent, proxies)
+        self.archive = archive if archive is not None else ReplayArchive()
+        self.record = record
+        self.connector = connector
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+    def _perform(self, method: str, url: Union[str, bytes], **kwargs: Any) -> Response:
+        if self.record:
+            if self.connector is None:
+                self.connector = SessionConnector(self.domain, self.user_agent, self.proxies)
+            response = self.connector._perform(method, url, **kwargs)  # pylint: disable=W0212
+            entry = self.archive.record(method, url, kwargs, response)
+            return self._build_response(entry, None, kwargs.get("headers"))
+        entry = self.archive.find(method, url, kwargs)
+        if self.latency:
+            time.sleep(self.latency)
+        return self._build_response(entry, self.bandwidth, kwargs.get("headers"))
+
+    def _build_response(self, entry: ReplayEntry, bandwidth: Optional[float], headers: Any = None) -> Response:
+        content = self.archive.bodies[entry.body]
+        response = Response()
+        response.url = entry.url
+        response.status_code = entry.status_code
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.reason = "OK" if entry.status_code < 400 else "Error"
+        match = re.fullmatch(r"bytes=(\d+)-", CaseInsensitiveDict(headers or {}).get("Range", ""))
+        if match and entry.status_code == 200:
+            start = min(int(match.group(1)), len(content))
+            response.status_code = 206
+            response.headers["Content-Range"] = f"bytes {start}-{len(content) - 1}/{len(content)}"
+            content = content[start:]
+        response.headers["Content-Length"] = str(len(content))
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.raw = ThrottledStream(content, bandwidth)
+        return response
+
+
+def _check_http2_support():
+    if httpx is None:  # pragma: NO COVER
+        raise ImportError('HTTP/2 requires the "httpx" package: pip install "hdrezka-api[http2]"')
+    try:
+        import h2  # pylint: disable=C0415,W0611
+    except ImportError as exc:  # pragma: NO COVER
+        raise ImportError('HTTP/2 requires the "h2" package: pip install "hdrezka-api[http2]"') from exc
+
+
+def _create_mounts(proxies: Optional[Dict[str, str]], transport_class: Type, **kwargs: Any) -> Dict[str, Any]:
+    """
+    Converts proxy definitions in the format of `requests` into `httpx` mounts.
+
+    :param proxies: The proxy definitions, e.g. {"https": "http://127.0.0.1:3128"}.
+    :param transport_class: `httpx.HTTPTransport` or `httpx.AsyncHTTPTransport`.
+    :param kwargs: Additional keyword arguments of the transports.
+    :return: The mounts of the `httpx` client.
+    """
+    # До httpx 0.26 транспорт принимает только экземпляр httpx.Proxy, а не строку
+    return {
+        scheme if "://" in scheme else f"{scheme}://": transport_class(proxy=httpx.Proxy(proxy), **kwargs)
+        for scheme, proxy in (proxies or {}).items()
+    }
+
+
+class _DecodedStream(io.RawIOBase):
+    """
+    A readable file object over the decoded body of a streamed `httpx.Response`,
+    it serves as the `raw` attribute of a `requests.Response`.
+    """
+
+    def __init__(self, response: httpx.Response):
         super().__init__()
-        self.headers = self.get_headers(self.url)
+        self._response = response
+        self._iterator = response.iter_bytes()
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._iterator)
+            except StopIteration:
+                return 0
+            except httpx.TransportError as exc:
+                raise _convert_exception(exc) from exc
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self):
+        self._response.close()
+        super().close()
+
+
+def _convert_exception(exc: BaseException) -> BaseException:
+    """
+    Converts an `httpx` transport exception into the equivalent exception of `requests`,
+    so that the code written for the default connectors keeps working.
+    """
+    if isinstance(exc, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(str(exc))
+    if isinstance(exc, httpx.ReadTimeout):
+        return requests.exceptions.ReadTimeout(str(exc))
+    if isinstance(exc, httpx.TimeoutException):
+        return requests.exceptions.Timeout(str(exc))
+    if isinstance(exc, httpx.ProxyError):
+        return requests.exceptions.ProxyError(str(exc))
+    if isinstance(exc, httpx.TooManyRedirects):
+        return requests.exceptions.TooManyRedirects(str(exc))
+    return requests.exceptions.ConnectionError(str(exc))
 
 
-class NetworkClient(metaclass=Singleton):
+class HTTP2Connector(Connector):
+    """
+    The `HTTP2Connector` class is a subclass of the `Connector` class that sends requests over HTTP/2.
+
+    All requests to a host are multiplexed over a single connection of an `httpx.Client`, which saves
+    the connection setup and the per-connection limits when many small AJAX requests (`get_cdn_series`,
+    `quick_content.php`, `person_info`) are sent to the same host from many threads. Hosts that do not
+    support HTTP/2 are served over HTTP/1.1. Responses and transport exceptions are converted
+    into `requests` objects, so the connector is a drop-in replacement for `SessionConnector`.
+    The optional "httpx" and "h2" packages must be installed: pip install "hdrezka-api[http2]".
+
+    This class inherits from `Connector`.
+    """
+
+    def __init__(  # pylint: disable=R0913
+            self,
+            domain="rezka.ag",
+            user_agent=DEFAULT_USERAGENT,
+            proxies=None,
+            *,
+            transport: Optional[httpx.BaseTransport] = None,
+            http2: bool = True,
+            max_connections: int = 32,
+    ):
+        """
+        Initialize a new instance of the class.
+
+        :param domain: The domain of the website.
+        :param user_agent: The user agent string to be used for making requests.
+        :param proxies: A dictionary containing proxy definitions.
+        :param transport: Optional. A custom `httpx` transport used instead of the network.
+        :param http2: Whether to negotiate HTTP/2, if False the connector uses pooled HTTP/1.1 connections.
+        :param max_connections: The maximum number of connections kept by the client.
+        """
+        if http2:
+            _check_http2_support()
+        super().__init__(domain, user_agent, proxies)
+        self.transport = transport
+        self.http2 = http2
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._client: Optional[httpx.Client] = None
+        self._proxy_clients: Dict[Tuple[Tuple[str, str], ...], httpx.Client] = {}
+        self._lock = threading.Lock()
+
+    def _create_client(self, proxies: Optional[Dict[str, str]]) -> httpx.Client:
+        mounts = _create_mounts(proxies, httpx.HTTPTransport, http2=self.http2, limits=self.limits)
+        return httpx.Client(
+            transport=self.transport, mounts=mounts, http2=self.http2, limits=self.limits, follow_redirects=True
+        )
+
+    def _get_client(self, proxies: Optional[Dict[str, str]]) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = self._create_client(self.proxies)
+            if proxies is None or proxies == self.proxies:
+                return self._client
+            key = tuple(sorted(proxies.items()))
+            if key not in self._proxy_clients:
+                self._proxy_clients[key] = self._create_client(proxies)
+            return self._proxy_clients[key]
+
+    def _add_tracer(self, kwargs: Dict[str, Any], tracer: PhaseTracer) -> Dict[str, Any]:
+        return {**kwargs, "extensions": {**kwargs.get("extensions", {}), "trace": tracer}}
+
+    def _perform(self, method: str, url: Union[str, bytes], **kwargs: Any) -> Response:
+        """
+        Method: `_perform`
+
+        This method sends a single request through the `httpx.Client` and converts the response into
+        a `requests.Response`. The `stream`, `allow_redirects` and `proxies` arguments of `requests` are supported.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request. It can be either a string or bytes.
+        :param kwargs: Additional keyword arguments to be passed to the `httpx.Client.build_request` method.
+        :return: A Response object containing the response from the request.
+        """
+        kwargs = self._prepare_kwargs(url, kwargs)
+        kwargs["headers"] = dict(kwargs["headers"])
+        stream = kwargs.pop("stream", False)
+        follow_redirects = kwargs.pop("allow_redirects", True)
+        client = self._get_client(kwargs.pop("proxies", None))
+        url = url.decode("utf-8") if isinstance(url, bytes) else url
+        start_time = time.perf_counter()
+        try:
+            request = client.build_request(method, url, **kwargs)
+            response = client.send(request, stream=stream, follow_redirects=follow_redirects)
+        except httpx.TransportError as exc:
+            raise _convert_exception(exc) from exc
+        result = self._convert_response(response, stream)
+        result.elapsed = timedelta(seconds=time.perf_counter() - start_time)
+        return result
+
+    @staticmethod
+    def _convert_response(response: httpx.Response, stream: bool) -> Response:
+        result = Response()
+        result.url = str(response.url)
+        result.status_code = response.status_code
+        result.reason = response.reason_phrase
+        headers = CaseInsensitiveDict()
+        for name, value in response.headers.multi_items():
+            headers[name] = f"{headers[name]}, {value}" if name in headers else value
+        result.headers = headers
+        result.encoding = requests.utils.get_encoding_from_headers(headers)
+        result.http_version = response.http_version
+        if stream:
+            # Тело уже раскодировано httpx, поэтому заголовок сжатия не должен повторно применяться requests
+            result.headers.pop("Content-Encoding", None)
+            result.raw = _DecodedStream(response)
+        else:
+            result._content = response.content  # pylint: disable=W0212
+            result._content_consumed = True  # pylint: disable=W0212
+        return result
+
+    def close(self):
+        """
+        Closes the underlying clients and releases all pooled connections.
+        """
+        with self._lock:
+            for client in self._proxy_clients.values():
+                client.close()
+            self._proxy_clients = {}
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+class AsyncConnector(Connector):
+    """
+    The `AsyncConnector` class is a subclass of the `Connector` class that provides coroutine methods
+    for making HTTP requests, so that a single event loop can keep many requests in flight.
+
+    It is built on top of `httpx.AsyncClient`, therefore the optional `httpx` package must be installed.
+    The underlying client keeps its connection pool between requests and is recreated automatically
+    when it is used from another event loop, the clients of the previous loop are closed.
+
+    This class inherits from `Connector`.
+    """
+
+    def __init__(
+            self,
+            domain="rezka.ag",
+            user_agent=DEFAULT_USERAGENT,
+            proxies=None,
+            transport: Optional[httpx.AsyncBaseTransport] = None,
+            http2: bool = False,
+    ):
+        """
+        Initialize a new instance of the class.
+
+        :param domain: The domain of the website.
+        :param user_agent: The user agent string to be used for making requests.
+        :param proxies: A dictionary containing proxy definitions.
+        :param transport: Optional. A custom `httpx` transport used instead of the network.
+        :param http2: Whether to negotiate HTTP/2, requires the "h2" package.
+        """
+        if httpx is None:  # pragma: NO COVER
+            raise ImportError('AsyncConnector requires the "httpx" package: pip install "hdrezka-api[async]"')
+        if http2:
+            _check_http2_support()
+        super().__init__(domain, user_agent, proxies)
+        self.transport = transport
+        self.http2 = http2
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._proxy_clients: Dict[Tuple[Tuple[str, str], ...], httpx.AsyncClient] = {}
+        self._retired_clients: List[httpx.AsyncClient] = []
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Returns the `httpx.AsyncClient` bound to the running event loop, creating it if necessary.
+
+        :return: The asynchronous HTTP client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._retire_clients()
+            self._client = self._create_client(self.proxies)
+            self._client_loop = loop
+        return self._client
+
+    def _retire_clients(self):
+        """
+        Detaches the clients of the previous event loop. Their connections can only be closed in that loop,
+        so the clients are closed there if it is still running, otherwise on the next request or in `close`.
+        """
+        clients = list(self._proxy_clients.values())
+        if self._client is not None:
+            clients.append(self._client)
+        self._proxy_clients = {}
+        self._client = None
+        for client in clients:
+            if self._client_loop is not None and self._client_loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), self._client_loop)
+            else:
+                self._retired_clients.append(client)
+
+    async def _close_retired_clients(self):
+        clients, self._retired_clients = self._retired_clients, []
+        for client in clients:
+            # Если прежний цикл уже закрыт, сокеты освободит сборщик мусора, но пул клиента всё равно очищается
+            with suppress(RuntimeError):
+                await client.aclose()
+
+    def _create_client(self, proxies: Optional[Dict[str, str]]) -> httpx.AsyncClient:
+        mounts = _create_mounts(proxies, httpx.AsyncHTTPTransport, http2=self.http2)
+        return httpx.AsyncClient(transport=self.transport, mounts=mounts, follow_redirects=True, http2=self.http2)
+
+    def _get_client(self, proxies: Optional[Dict[str, str]]) -> httpx.AsyncClient:
+        """
+        Returns the client for the proxy definitions of a request. `httpx` binds proxies to the client,
+        therefore a separate pooled client is kept for every set of proxies passed in the `proxies` argument.
+
+        :param proxies: The proxy definitions of the request, None to use the proxies of the connector.
+        :return: The asynchronous HTTP client.
+        """
+        client = self.client
+        if proxies is None or proxies == self.proxies:
+            return client
+        key = tuple(sorted(proxies.items()))
+        if key not in self._proxy_clients:
+            self._proxy_clients[key] = self._create_client(proxies)
+        return self._proxy_clients[key]
+
+    async def get(self, url: Union[str, bytes], **kwargs: Any) -> httpx.Response:  # pylint: disable=W0236
+        """
+        Method: `get`
+
+        This coroutine sends a GET request to the specified URL and returns the response as a `httpx.Response`
+        object. If the optional timeout parameter is not provided, a default timeout of 15 seconds is used.
+        If the optional headers parameter is not provided, the default headers for the URL are used.
+
+        :param url: The URL to send the GET request to. It can be either a string or bytes.
+        :param kwargs: Additional keyword arguments to be passed to the `httpx.AsyncClient.request` method.
+        :return: A `httpx.Response` object containing the response from the GET request.
+        """
+        return await self.send_request("GET", url, **kwargs)
+
+    async def post(self, url: Union[str, bytes], **kwargs: Any) -> httpx.Response:  # pylint: disable=W0236
+        """
+        Method: `post`
+
+        This coroutine sends a POST request to the specified URL and returns the response as a `httpx.Response`
+        object. If the optional timeout parameter is not provided, a default timeout of 15 seconds is used.
+        If the optional headers parameter is not provided, the default headers for the URL are used.
+
+        :param url: The URL for the POST request. It can be either a string or bytes.
+        :param kwargs: Additional keyword arguments to be passed to the `httpx.AsyncClient.request` method.
+        :return: A `httpx.Response` object containing the response from the POST request.
+        """
+        return await self.send_request("POST", url, **kwargs)
+
+    async def send_request(  # pylint: disable=W0236
+            self, method: str, url: Union[str, bytes], **kwargs: Any
+    ) -> httpx.Response:
+        """
+        The asynchronous version of `Connector.send_request`.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request. It can be either a string or bytes.
+        :param kwargs: Additional keyword arguments to be passed to the `httpx.AsyncClient.request` method.
+        :return: A `httpx.Response` object containing the response from the request.
+        """
+        if self.single_flight is None:
+            return await self._send_cached(method, url, kwargs)
+        return await self.single_flight.aexecute(method, url, kwargs, lambda: self._send_cached(method, url, kwargs))
+
+    async def _send_cached(  # pylint: disable=W0236
+            self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]
+    ) -> httpx.Response:
+        if self.cache is None:
+            return await self._send_with_retry(method, url, kwargs)
+        return await self.cache.aexecute(
+            method,
+            url,
+            kwargs,
+            lambda request_kwargs: self._send_with_retry(method, url, request_kwargs),
+            self._build_cached_response,
+            self.get_headers,
+        )
+
+    async def _send_with_retry(  # pylint: disable=W0236
+            self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]
+    ) -> httpx.Response:
+        if self.retry_policy is None:
+            return await self._send_attempt(method, url, kwargs)
+        return await self.retry_policy.aexecute(method, str(url), lambda: self._send_attempt(method, url, kwargs))
+
+    async def _send_attempt(  # pylint: disable=W0236
+            self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]
+    ) -> httpx.Response:
+        if self.mirror_pool is None:
+            return await self._send_guarded(method, url, kwargs)
+        try:
+            return await self.mirror_pool.aexecute(
+                method, url, lambda mirror_url: self._send_to_mirror(method, url, mirror_url, kwargs)
+            )
+        finally:
+            self._follow_active_mirror()
+
+    async def _send_guarded(  # pylint: disable=W0236
+            self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]
+    ) -> httpx.Response:
+        if self.circuit_breaker is None:
+            return await self._send_governed(method, url, kwargs)
+        return await self.circuit_breaker.aexecute(url, lambda: self._send_governed(method, url, kwargs))
+
+    async def _send_governed(  # pylint: disable=W0236
+            self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]
+    ) -> httpx.Response:
+        if self.governor is None:
+            return await self._send_routed(method, url, kwargs)
+        async with self.governor.aacquire(url, self.get_site_domain(url)):
+            return await self._send_routed(method, url, kwargs)
+
+    async def _send_routed(  # pylint: disable=W0236
+            self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]
+    ) -> httpx.Response:
+        endpoint = determine_endpoint_type(url, self.get_site_domain(url))
+        if self.router is not None:
+            url, kwargs = self.router.prepare(url, kwargs, self)
+        if self.instrumentation is None:
+            return await self._send_proxied(method, url, kwargs)
+        return await self.instrumentation.aexecute(
+            method, url, kwargs, lambda request_kwargs: self._send_proxied(method, url, request_kwargs),
+            endpoint=endpoint, trace=self._add_tracer,
+        )
+
+    async def _send_proxied(  # pylint: disable=W0236
+            self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any]
+    ) -> httpx.Response:
+        if self.proxy_pool is None or kwargs.get("proxies") is not None:
+            return await self._perform(method, url, **kwargs)
+        return await self.proxy_pool.aexecute(lambda proxies: self._perform(method, url, **kwargs, proxies=proxies))
+
+    def _add_tracer(self, kwargs: Dict[str, Any], tracer: PhaseTracer) -> Dict[str, Any]:
+        return {**kwargs, "extensions": {**kwargs.get("extensions", {}), "trace": tracer.atrace}}
+
+    async def _perform(  # pylint: disable=W0236
+            self, method: str, url: Union[str, bytes], **kwargs: Any
+    ) -> httpx.Response:
+        kwargs = self._prepare_kwargs(url, kwargs)
+        kwargs["headers"] = dict(kwargs["headers"])
+        client = self._get_client(kwargs.pop("proxies", None))
+        if self._retired_clients:
+            await self._close_retired_clients()
+        return await client.request(method, url, **kwargs)
+
+    @staticmethod
+    def _build_cached_response(entry: CachedResponse) -> httpx.Response:
+        response = httpx.Response(
+            entry.status_code,
+            headers=entry.headers,
+            content=entry.content,
+            request=httpx.Request("GET", entry.url),
+        )
+        if entry.encoding is not None:
+            response.encoding = entry.encoding
+        return response
+
+    async def close(self):
+        """
+        Closes the underlying clients and releases all pooled connections.
+        """
+        await self._close_retired_clients()
+        for client in self._proxy_clients.values():
+            await client.aclose()
+        self._proxy_clients = {}
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+
+class NetworkClient(metaclass=ContextSingleton):
     """
     This class provides a client for making network requests.
-    It is a Singleton class, and therefore any changes will affect all places where this class is used.
+    It is a Singleton within an execution context: each thread gets its own instance, and any changes
+    will affect all places where this class is used in the same thread or asyncio task.
+    The client of a new thread starts with the settings of the default client, the one created first
+    (see `inherit`), changes made afterwards are not propagated between threads.
+    To give a task or a worker its own client use `NetworkClient.create(...)` together with `scope`.
+    A client passed to `HDrezka(client=...)` or `use_client` serves the requests of that object and the iterators
+    it creates, while the objects they return (posters, banners, players, ...) use the client of the current
+    context, so run the whole job inside `scope` to route all of its requests through one client.
+
+    Usage::
+
+        >>> async def worker(mirror):
+        >>>     with NetworkClient.create(domain=mirror).scope():
+        >>>         return await HDrezka().films().aget()
 
     Allows you to access the self.adapter directly as if it were its own methods.
+    The coroutine methods `aget` and `apost` are served by a separate asynchronous adapter
+    which is created on first use with the same domain, user agent, proxies and policies.
     """
 
     def __init__(
@@ -202,7 +1129,8 @@ class NetworkClient(metaclass=Singleton):
             domain="rezka.ag",
             user_agent=DEFAULT_USERAGENT,
             proxies=None,
-            connector: Type[Connector] = RequestConnector,
+            connector: Type[Connector] = SessionConnector,
+            async_connector: Type[Connector] = AsyncConnector,
     ):
         """
         Initialize a new instance of the class.
@@ -211,8 +1139,80 @@ class NetworkClient(metaclass=Singleton):
         :param user_agent: The user agent string to be used for making requests.
         :param proxies: A dictionary containing proxy definitions.
         :param connector: The connector class to be used for making requests.
+        :param async_connector: The connector class to be used for making asynchronous requests.
         """
         self.adapter = connector(domain, user_agent, proxies)
+        self.async_connector = async_connector
+        self._async_adapter: Optional[Connector] = None
+
+    @classmethod
+    def inherit(cls, default: NetworkClient) -> NetworkClient:
+        """
+        Creates the client of a new context with the settings of the default client: the domain, scheme,
+        user agent, proxies, `stream_pages` and the policies, which are shared with the default client.
+        The connections are not shared, the new client has its own adapters.
+
+        :param default: The default client.
+        :return: The new client.
+        """
+        adapter = default.adapter
+        client = cls.create(adapter.domain, adapter.user_agent, adapter.proxies, type(adapter), default.async_connector)
+        for name in ("scheme", "stream_pages") + Connector.policy_attributes:
+            if hasattr(adapter, name):
+                setattr(client.adapter, name, getattr(adapter, name))
+        return client
+
+    @property
+    def async_adapter(self) -> Connector:
+        """
+        Returns the asynchronous adapter, creating it from the settings of the synchronous one if necessary.
+
+        :return: The asynchronous connector instance.
+        """
+        if self._async_adapter is None:
+            adapter = self.adapter
+            self._async_adapter = self.async_connector(adapter.domain, adapter.user_agent, adapter.proxies)
+            self._async_adapter.scheme = getattr(adapter, "scheme", "https")
+            for name in Connector.policy_attributes:
+                setattr(self._async_adapter, name, getattr(adapter, name, None))
+        return self._async_adapter
+
+    @async_adapter.setter
+    def async_adapter(self, value: Optional[Connector]):
+        self._async_adapter = value
+
+    @contextmanager
+    def scope(self) -> Iterator[NetworkClient]:
+        """
+        Makes this client current in the calling context until the end of the `with` block.
+
+        :return: A context manager that yields this client.
+        """
+        token = type(self).activate(self)
+        try:
+            yield self
+        finally:
+            type(self).deactivate(token)
+
+    async def aget(self, url: Union[str, bytes], **kwargs: Any):
+        """
+        Sends a GET request using the asynchronous adapter.
+
+        :param url: The URL to send the GET request to.
+        :param kwargs: Additional keyword arguments to be passed to the adapter.
+        :return: The response object returned by the asynchronous adapter.
+        """
+        return await self.async_adapter.get(url, **kwargs)
+
+    async def apost(self, url: Union[str, bytes], **kwargs: Any):
+        """
+        Sends a POST request using the asynchronous adapter.
+
+        :param url: The URL for the POST request.
+        :param kwargs: Additional keyword arguments to be passed to the adapter.
+        :return: The response object returned by the asynchronous adapter.
+        """
+        return await self.async_adapter.post(url, **kwargs)
 
     def __setattr__(self, key: str, value: Any):
         """
@@ -225,6 +1225,9 @@ class NetworkClient(metaclass=Singleton):
         if key == "adapter":
             return super().__setattr__(key, value)
         if hasattr(self.adapter, key):
+            async_adapter = self.__dict__.get("_async_adapter")
+            if async_adapter is not None and hasattr(async_adapter, key):
+                async_adapter.__setattr__(key, value)
             return self.adapter.__setattr__(key, value)
         return super().__setattr__(key, value)
 
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Optional, Union, TypeVar, Generic
+from typing import Optional, Union, TypeVar, Generic, Tuple
+
+from lxml import etree
+from requests import Response
 
 from .connector import NetworkClient
 from .filters import (
@@ -12,21 +15,61 @@ from .filters import (
     GenreCartoons,
     GenreAnimation,
 )
-from .html_representation import PageRepresentation
+from .html_representation import (
+    PageRepresentation,
+    HTMLDocument,
+    ParserBackend,
+    Subtree,
+    find_element,
+    find_elements,
+    element_text,
+)
 
 IteratorResponse = TypeVar("IteratorResponse")
 
 
+class PaginationBuilder(PageRepresentation):
+    subtrees = (("div", {"class": "b-navigation"}),)
+
+    def extract_content(self) -> int:
+        navigation = self.page.soup.find("div", class_="b-navigation")
+        if not navigation:
+            return 1
+        next_page_element = navigation.find(class_="b-navigation__next")
+        if next_page_element:
+            return int(next_page_element.parent.find_previous("a").string)
+        return int(navigation.find_all("span")[-1].text)
+
+
+class LXMLPaginationBuilder(PaginationBuilder, backend=ParserBackend.lxml):
+    # Ближайшая ссылка перед элементом в порядке документа, как find_previous("a")
+    _previous_link = etree.XPath("(preceding::a | ancestor::a)[last()]")
+
+    def extract_content(self) -> int:
+        navigation = find_element(self.page.tree, "div", "b-navigation")
+        if navigation is None:
+            return 1
+        next_page_element = find_element(navigation, class_="b-navigation__next")
+        if next_page_element is not None:
+            return int(element_text(self._previous_link(next_page_element.getparent())[0]))
+        return int(element_text(find_elements(navigation, "span")[-1]))
+
+
 class PageIterator(ABC, Generic[IteratorResponse]):
-    def __new__(cls, *args, **kwargs):
-        if not hasattr(cls, "_connector"):
-            cls._connector = NetworkClient()
-        return super().__new__(cls)
+    _client: Optional[NetworkClient] = None
 
     def __init__(self):
         self._page = 1
         self._last_page = None
 
+    @property
+    def _connector(self) -> NetworkClient:
+        return self._client if self._client is not None else NetworkClient()
+
+    def use_client(self, client: Optional[NetworkClient]):
+        self._client = client
+        return self
+
     @property
     def current_page(self):
         return self._page
@@ -50,13 +93,7 @@ class PageIterator(ABC, Generic[IteratorResponse]):
 
     @staticmethod
     def _get_last_page_number(response):
-        navigation = response.page.soup.find("div", class_="b-navigation")
-        if not navigation:
-            return 1
-        next_page_element = navigation.find(class_="b-navigation__next")
-        if next_page_element:
-            return int(next_page_element.parent.find_previous("a").string)
-        return int(navigation.find_all("span")[-1].text)
+        return PaginationBuilder(response).extract_content()
 
     def page(self, num: int):
         if isinstance(num, bool) or not isinstance(num, int) or num <= 0:
@@ -80,10 +117,24 @@ class PageIterator(ABC, Generic[IteratorResponse]):
         self.current_page += 1
         return result
 
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> IteratorResponse:
+        if self._last_page is not None and self.current_page > self.last_page:
+            raise StopAsyncIteration
+        result = await self.aget()
+        self.current_page += 1
+        return result
+
     @abstractmethod
     def get(self) -> IteratorResponse:
         ...
 
+    @abstractmethod
+    async def aget(self) -> IteratorResponse:
+        ...
+
     def __str__(self):
         return f"page/{self.current_page}/" if self.current_page > 1 else ""
 
@@ -187,13 +238,30 @@ class Country:
 
 class BaseSiteNavigation(PageIterator[IteratorResponse]):
     _name: Optional[str] = None
+    # Части страницы, нужные построителю содержимого и навигации; None - вся страница
+    _subtrees: Optional[Tuple[Subtree, ...]] = None
 
-    @abstractmethod
-    def get(self):
-        response = PageRepresentation(self._connector.get(str(self)).text)
+    def get(self) -> IteratorResponse:
+        url = str(self)
+        response = self._connector.get_page(url)
+        with self._connector.measure("parse", url):
+            return self._extract_content(self._make_page(response))
+
+    async def aget(self) -> IteratorResponse:
+        url = str(self)
+        response = await self._connector.aget(url)
+        with self._connector.measure("parse", url):
+            return self._extract_content(self._make_page(response.text))
+
+    def _make_page(self, html: Union[str, Response]) -> HTMLDocument:
+        page = HTMLDocument(html, subtrees=self._subtrees)
         if self.last_page == 1:
-            self.last_page = self._get_last_page_number(response)
-        return response.page
+            self.last_page = self._get_last_page_number(page)
+        return page
+
+    @abstractmethod
+    def _extract_content(self, page: HTMLDocument) -> IteratorResponse:
+        ...
 
     def __str__(self):
         name = f"{self._name}/" if self._name else ""
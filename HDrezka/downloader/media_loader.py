@@ -1,27 +1,37 @@
 from __future__ import annotations
 
 import json
-from typing import Optional, Dict, Any, TYPE_CHECKING, List
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, TYPE_CHECKING, List, Iterator
 
 import requests
 
 from HDrezka import connector, exceptions
 from HDrezka import player
+from HDrezka.transport.proxies import INTERRUPT_EXCEPTIONS
 from .file_manager import SafeFileLoader
 from .progress_bar import ProgressBar
 
 if TYPE_CHECKING:
     from HDrezka.player import BaseMovie
+    from HDrezka.transport import ProxyPool
 
 
-def _get_request_stream_obj(urls_list: List[str], headers: Optional[Dict[str, Any]] = None):
+def _get_request_stream_obj(
+        urls_list: List[str],
+        headers: Optional[Dict[str, Any]] = None,
+        proxies: Optional[Dict[str, str]] = None,
+):
     client = connector.NetworkClient()
     if headers is None:
         headers = {}
+    kwargs = {} if proxies is None else {"proxies": proxies}
     for url in urls_list:
         try:
-            response = client.get(url=url, headers=headers, stream=True, timeout=30)
+            response = client.get(url=url, headers=headers, stream=True, timeout=30, **kwargs)
             if 200 < response.status_code >= 400:
+                response.close()
                 raise exceptions.LoadingError(f"Status code = {response.status_code}, {response.reason}")
             return response
         except requests.exceptions.ReadTimeout:
@@ -29,6 +39,62 @@ def _get_request_stream_obj(urls_list: List[str], headers: Optional[Dict[str, An
     raise ConnectionError("Not a single url returned a positive code status.")  # TODO Change error
 
 
+@contextmanager
+def _open_stream(  # pylint: disable=W0135
+        urls_list: List[str],
+        headers: Optional[Dict[str, Any]] = None,
+        proxy_pool: Optional[ProxyPool] = None,
+) -> Iterator[Any]:
+    """
+    Opens the stream of the first available url, through the best proxy of `proxy_pool` if it is given.
+    If the client has instrumentation, the whole download is recorded as a "download" record.
+    """
+    instrumentation = connector.NetworkClient().instrumentation
+    if instrumentation is None:
+        with _open_proxied_stream(urls_list, headers, proxy_pool) as response:
+            yield response
+        return
+    with instrumentation.measure("download", urls_list[0] if urls_list else "") as record:
+        with _open_proxied_stream(urls_list, headers, proxy_pool) as response:
+            record.url = response.url
+            record.status_code = response.status_code
+            yield response
+        record.bytes_received = int(response.headers.get("Content-Length", 0))
+
+
+@contextmanager
+def _open_proxied_stream(
+        urls_list: List[str],
+        headers: Optional[Dict[str, Any]] = None,
+        proxy_pool: Optional[ProxyPool] = None,
+) -> Iterator[Any]:
+    """
+    Opens the stream of the first available url through the best proxy of `proxy_pool` if it is given
+    and yields the response. When the download is over the response is closed, which frees its in-flight slot
+    of the governor, and the proxy is scored by its throughput.
+    """
+    if proxy_pool is None:
+        with _get_request_stream_obj(urls_list, headers) as response:
+            yield response
+        return
+    proxy = proxy_pool.acquire()
+    start_time = time.monotonic()
+    try:
+        response = _get_request_stream_obj(urls_list, headers, proxy.proxies)
+        latency = time.monotonic() - start_time
+        with response:
+            yield response
+    except INTERRUPT_EXCEPTIONS:
+        proxy_pool.cancel(proxy)
+        raise
+    except BaseException:
+        # Обрыв потока посреди загрузки (ChunkedEncodingError, ConnectionError) тоже считается отказом прокси
+        proxy_pool.release(proxy, failed=True)
+        raise
+    size = int(response.headers.get("Content-Length", 0))
+    proxy_pool.release(proxy, latency=latency, size=size, elapsed=time.monotonic() - start_time)
+
+
 def load_file(  # pylint: disable=R0913
         file_name: str,
         length_data: int,
@@ -53,18 +119,18 @@ def load_file(  # pylint: disable=R0913
                 progress.update()
 
 
-def load_from_url(url, file_name, chunk_size=2 ** 10 * 512):
-    response = _get_request_stream_obj([url])
-    load_file(
-        file_name=file_name,
-        length_data=int(response.headers["Content-Length"]),
-        requests_obj=response,
-        data_to_recover={},
-        create_dump_file=False,
-        boot_recovery=False,
-        chunk_size=chunk_size,
-        unit="MB",
-    )
+def load_from_url(url, file_name, chunk_size=2 ** 10 * 512, proxy_pool: Optional[ProxyPool] = None):
+    with _open_stream([url], proxy_pool=proxy_pool) as response:
+        load_file(
+            file_name=file_name,
+            length_data=int(response.headers["Content-Length"]),
+            requests_obj=response,
+            data_to_recover={},
+            create_dump_file=False,
+            boot_recovery=False,
+            chunk_size=chunk_size,
+            unit="MB",
+        )
 
 
 def load_from_player(
@@ -73,32 +139,32 @@ def load_from_player(
         quality: player.Quality = player.Quality.MaximumAvailable,
         create_dump_file=False,
         chunk_size=2 ** 10 * 512,
+        proxy_pool: Optional[ProxyPool] = None,
 ):
     if video_player is None:
         raise TypeError("Attribute 'player' is NoneType.")
 
     urls_list = video_player.get_video_url(quality)
-    response = _get_request_stream_obj(urls_list)
-
-    data_to_recover = {
-        "metadata": dict(video_player.__dict__.get("_metadata")),
-        "quality": quality,
-        "chunk_size": chunk_size,
-    }
-    print(f'Load start file: "{file_name}"')
-    load_file(
-        file_name=file_name,
-        length_data=int(response.headers["Content-Length"]),
-        requests_obj=response,
-        data_to_recover=data_to_recover,
-        create_dump_file=create_dump_file,
-        boot_recovery=False,
-        chunk_size=chunk_size,
-        unit="MB",
-    )
-
-
-def reload_file(path_json_file):
+    with _open_stream(urls_list, proxy_pool=proxy_pool) as response:
+        data_to_recover = {
+            "metadata": dict(video_player.__dict__.get("_metadata")),
+            "quality": quality,
+            "chunk_size": chunk_size,
+        }
+        print(f'Load start file: "{file_name}"')
+        load_file(
+            file_name=file_name,
+            length_data=int(response.headers["Content-Length"]),
+            requests_obj=response,
+            data_to_recover=data_to_recover,
+            create_dump_file=create_dump_file,
+            boot_recovery=False,
+            chunk_size=chunk_size,
+            unit="MB",
+        )
+
+
+def reload_file(path_json_file, proxy_pool: Optional[ProxyPool] = None):  # pylint: disable=R0914
     """
     Позволяет продолжить загрузку видео с места
     где она была прервана, по окончанию загрузки
@@ -119,16 +185,15 @@ def reload_file(path_json_file):
 
     headers = {"Range": f"bytes={bytes_loaded}-"}
     urls_list = movie.get_video_url(quality)
-    response = _get_request_stream_obj(urls_list, headers)
-
-    load_file(
-        file_name=file_name,
-        length_data=int(response.headers["Content-Length"]) + bytes_loaded,
-        requests_obj=response,
-        data_to_recover=data_to_recover,
-        create_dump_file=create_dump_file,
-        boot_recovery=boot_recovery,
-        chunk_size=chunk_size,
-        unit="MB",
-        processed_chunks_count=bytes_loaded // chunk_size,
-    )
+    with _open_stream(urls_list, headers, proxy_pool) as response:
+        load_file(
+            file_name=file_name,
+            length_data=int(response.headers["Content-Length"]) + bytes_loaded,
+            requests_obj=response,
+            data_to_recover=data_to_recover,
+            create_dump_file=create_dump_file,
+            boot_recovery=boot_recovery,
+            chunk_size=chunk_size,
+            unit="MB",
+            processed_chunks_count=bytes_loaded // chunk_size,
+        )
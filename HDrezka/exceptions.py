@@ -18,5 +18,13 @@ class ServiceUnavailable(HDRezkaError):
     """Service is temporarily unavailable"""
 
 
+class CircuitOpenError(ServiceUnavailable):
+    """Requests to the endpoint are suspended because it keeps failing"""
+
+
 class LoadingError(HDRezkaError):
     """The server response status code is not within the range of 200"""
+
+
+class ReplayMissError(HDRezkaError):
+    """The request is missing from the replay archive"""
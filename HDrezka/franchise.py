@@ -7,7 +7,7 @@ from typing import List, TYPE_CHECKING, Optional
 
 from . import movie_page_descriptor
 from .connector import NetworkClient
-from .html_representation import PageRepresentation
+from .html_representation import PageRepresentation, ParserBackend, find_element, find_elements, element_text
 from .utility import convert_string_into_datetime
 
 if TYPE_CHECKING:
@@ -23,7 +23,10 @@ class FranchiseItem:
     url: str  # ссылка на фильм
 
     def get(self) -> MovieDetails:
-        return movie_page_descriptor.MovieDetailsBuilder(NetworkClient().get(self.url).text).extract_content()
+        connector = NetworkClient()
+        response = connector.get_page(self.url)
+        with connector.measure("parse", self.url):
+            return movie_page_descriptor.MovieDetailsBuilder(response).extract_content()
 
     def __repr__(self):
         return f"<FranchiseItem({self.title})>"
@@ -66,6 +69,31 @@ class FranchiseBuilder(PageRepresentation):
         )
 
 
+class LXMLFranchiseBuilder(FranchiseBuilder, backend=ParserBackend.lxml):
+    def extract_content(self) -> Franchise:
+        url = find_element(self.page.tree, "meta", property="og:url").get("content").strip()
+        image = find_element(self.page.tree, "img")
+        return Franchise(
+            id=int(re.search(r"/(\d*)-", url).group(1)),
+            title=image.get("data-caption-title").strip(),
+            img_url=image.getparent().get("href").strip(),
+            items_list=[self.extract_franchise_item(item)
+                        for item in find_elements(self.page.tree, "div", "b-post__partcontent_item")[::-1]],
+            url=url,
+        )
+
+    @staticmethod
+    def extract_franchise_item(item, url=None) -> FranchiseItem:
+        rating = element_text(find_element(item, "div", "rating")).strip()
+        return FranchiseItem(
+            num=int(element_text(find_element(item, "div", "num")).strip()),
+            title=element_text(find_element(item, "div", "title")).strip(),
+            year=convert_string_into_datetime(element_text(find_element(item, "div", "year")).strip()),
+            rating=float(rating) if rating != '—' else None,
+            url=item.get("data-url") or url,
+        )
+
+
 @dataclass
 class FranchiseBriefInfo:
     id: int
@@ -74,7 +102,10 @@ class FranchiseBriefInfo:
     url: str
 
     def get(self):
-        return FranchiseBuilder(NetworkClient().get(self.url).text).extract_content()
+        connector = NetworkClient()
+        response = connector.get_page(self.url)
+        with connector.measure("parse", self.url):
+            return FranchiseBuilder(response).extract_content()
 
     def __repr__(self):
         return f"<FranchiseBriefInfo({self.title})>"
@@ -95,6 +126,21 @@ class FranchiseBriefInfoBuilder(PageRepresentation):
         )
 
 
+class LXMLFranchiseBriefInfoBuilder(FranchiseBriefInfoBuilder, backend=ParserBackend.lxml):
+    def extract_content(self) -> Optional[FranchiseBriefInfo]:
+        page_url = find_element(self.page.tree, "meta", property="og:url").get("content")
+        url = find_element(self.page.tree, class_="b-post__franchise_link_title")
+        if url is None:
+            return None
+        return FranchiseBriefInfo(
+            id=int(re.search(r"/(\d*)-", url.get("href").strip()).group(1)),
+            title=element_text(url).strip(),
+            items_list=[LXMLFranchiseBuilder.extract_franchise_item(item, url=page_url)
+                        for item in find_elements(self.page.tree, "div", "b-post__partcontent_item")[::-1]],
+            url=url.get("href").strip(),
+        )
+
+
 @dataclass
 class FranchiseBanner:
     id: int
@@ -104,7 +150,10 @@ class FranchiseBanner:
     url: str
 
     def get(self):
-        return FranchiseBuilder(NetworkClient().get(self.url).text).extract_content()
+        connector = NetworkClient()
+        response = connector.get_page(self.url)
+        with connector.measure("parse", self.url):
+            return FranchiseBuilder(response).extract_content()
 
     def __repr__(self):
         return f"<FranchiseBanner({self.title})>"
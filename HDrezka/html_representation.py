@@ -1,19 +1,365 @@
 from __future__ import annotations
 
+from enum import Enum
+from functools import lru_cache
 from io import IOBase
-from typing import Union, IO
+from typing import Union, IO, Iterable, Iterator, List, Optional, Dict, Tuple, Sequence
 
-from bs4 import BeautifulSoup, Tag
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from bs4.builder import ParserRejectedMarkup
+from bs4.builder._lxml import LXMLTreeBuilder
+from lxml import etree
 from requests.models import Response
 
+STREAM_CHUNK_SIZE = 2 ** 14
+PLAYER_SCRIPT_MARKER = "sof.tv."
+
+# Имя тега и значения его атрибутов, для class достаточно одного из классов
+Subtree = Tuple[str, Dict[str, str]]
+
+
+class ParserBackend(Enum):
+    """Enumeration class to represent the libraries a page can be parsed with.
+
+    Attributes:
+        beautifulsoup: The BeautifulSoup tree built by the lxml parser, supported by all builders.
+        lxml: The raw `lxml.html` tree. The builders that have an implementation for it query the tree
+            with XPath, the others use a BeautifulSoup tree that is built from the page on demand.
+    """
+
+    beautifulsoup = "beautifulsoup"
+    lxml = "lxml"
+
+
+@lru_cache(maxsize=None)
+def _compile_query(
+        tag: str, class_: Optional[str], recursive: bool, first: bool, attributes: Tuple[Tuple[str, str], ...]
+) -> etree.XPath:
+    predicates = []
+    if class_ is not None and " " in class_:
+        # Как и в BeautifulSoup, класс с пробелом сравнивается со всем значением атрибута
+        predicates.append(f'@class="{class_}"')
+    elif class_ is not None:
+        predicates.append(f'contains(concat(" ", normalize-space(@class), " "), " {class_} ")')
+    predicates.extend(f'@{name}="{value}"' for name, value in attributes)
+    query = ("descendant::" if recursive else "") + tag + "".join(f"[{predicate}]" for predicate in predicates)
+    return etree.XPath(f"{query}[1]" if first else query)
+
+
+def find_elements(
+        element: etree.ElementBase, tag: str = "*", class_: Optional[str] = None, recursive: bool = True, **attributes
+) -> List[etree.ElementBase]:
+    """
+    The `find_all` of BeautifulSoup for the `ParserBackend.lxml` trees, the queries are compiled to XPath once.
+
+    :param element: The element to search in.
+    :param tag: The name of the elements, any element by default.
+    :param class_: The class of the elements or the whole value of the class attribute if it contains a space.
+    :param recursive: Whether to search among all descendants or among the children only.
+    :param attributes: The exact values of other attributes of the elements.
+    :return: The matching elements in document order.
+    """
+    return _compile_query(tag, class_, recursive, False, tuple(sorted(attributes.items())))(element)
+
+
+def find_element(
+        element: etree.ElementBase, tag: str = "*", class_: Optional[str] = None, recursive: bool = True, **attributes
+) -> Optional[etree.ElementBase]:
+    """
+    The `find` of BeautifulSoup for the `ParserBackend.lxml` trees, the arguments are the same as of `find_elements`.
+
+    :return: The first matching element or None.
+    """
+    found = _compile_query(tag, class_, recursive, True, tuple(sorted(attributes.items())))(element)
+    return found[0] if found else None
+
+
+def element_text(element: etree.ElementBase, strip: bool = False) -> str:
+    """
+    :param element: An element of a `ParserBackend.lxml` tree.
+    :param strip: Whether to strip every piece of text before joining them, as `get_text(strip=True)` does.
+    :return: The text of the element and its descendants without comments.
+    """
+    if strip:
+        return "".join(text.strip() for text in element.itertext())
+    return element.text_content()
+
+
+_NEXT_NODE = etree.XPath("(child::node() | following::node())[1]")
+
+
+def next_node_text(element: etree.ElementBase, strip: bool = False) -> str:
+    """
+    :param element: An element of a `ParserBackend.lxml` tree.
+    :param strip: Whether to strip the text as `get_text(strip=True)` does.
+    :return: The text of the node that follows the opening tag of the element, as `.next.text` of BeautifulSoup.
+    """
+    found = _NEXT_NODE(element)
+    if not found:
+        return ""
+    node = found[0]
+    if isinstance(node, str):
+        return str(node).strip() if strip else str(node)
+    if isinstance(node, etree._Comment):  # pylint: disable=W0212
+        return node.text.strip() if strip else node.text
+    return element_text(node, strip)
+
+
+class SubtreeStrainer(SoupStrainer):
+    """
+    The `SoupStrainer` that keeps only the elements matching any of the subtrees, together with all
+    their descendants. Everything else, including the text between the kept elements, is skipped
+    while the page is parsed.
+    """
+
+    def __init__(self, subtrees: Sequence[Subtree]):
+        """
+        :param subtrees: The name of the tag and the values of its attributes for every kept subtree,
+            the value of the class attribute matches any of the classes of the element.
+        """
+        super().__init__()
+        self.subtrees = tuple(subtrees)
+
+    def allow_tag_creation(self, nsprefix: Optional[str], name: str, attrs: Optional[Dict[str, str]]) -> bool:
+        return any(self.__matches(subtree, name, attrs or {}) for subtree in self.subtrees)
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+    def search_tag(self, name: Optional[str] = None, attrs: Optional[Dict[str, str]] = None) -> bool:
+        # beautifulsoup4 < 4.13 вызывает search_tag вместо allow_tag_creation
+        return self.allow_tag_creation(None, name, attrs)
+
+    @staticmethod
+    def __matches(subtree: Subtree, name: str, attrs: Dict[str, str]) -> bool:
+        tag, attributes = subtree
+        if tag != name:
+            return False
+        for attribute, value in attributes.items():
+            actual = attrs.get(attribute)
+            if actual is None:
+                return False
+            if attribute == "class":
+                classes = actual.split() if isinstance(actual, str) else actual
+                if value not in classes:
+                    return False
+            elif actual != value:
+                return False
+        return True
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}({self.subtrees})>"
+
+
+class _IncrementalTreeBuilder(LXMLTreeBuilder):
+    """
+    The lxml tree builder of BeautifulSoup that feeds the parser with chunks of bytes as they arrive
+    instead of the markup passed to BeautifulSoup.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], **kwargs):
+        super().__init__(**kwargs)
+        self.chunks = chunks
+
+    def feed(self, markup):
+        try:
+            self.parser = self.parser_for(self.soup.original_encoding)
+            for chunk in self.chunks:
+                if chunk:
+                    self.parser.feed(chunk)
+            self.parser.close()
+        except (UnicodeDecodeError, LookupError, etree.ParserError) as e:
+            raise ParserRejectedMarkup(e) from e
+
 
 class HTMLDocument:
-    def __init__(self, text: Union[str, bytes, IO, Response, Tag]):
-        self.html = self.__extract_html(text)
-        self.soup = BeautifulSoup(self.html, "lxml") if not isinstance(text, Tag) else text
+    """
+    The parsed HTML page.
+
+    A `requests.Response` that has been requested with `stream=True` and has not been read yet is not decoded
+    into a string: its body is fed chunk by chunk into the incremental lxml parser, so only the tree
+    is kept in memory. The raw bytes of such a page are kept in `source` only if `keep_source` is set.
+
+    In the lean mode, which is also used for streamed pages without `source`, the text of the page is dropped
+    after parsing and only the inline scripts that initialize the player are kept in `scripts`.
+
+    The page is parsed with `default_backend` unless another backend is given. With `ParserBackend.lxml`
+    the `lxml.html` tree is kept in `tree` and `soup` is built only when it is accessed.
+
+    If `subtrees` are given, BeautifulSoup keeps only the elements matching them (see `SubtreeStrainer`)
+    and skips the rest of the page while parsing. The lxml tree is always complete: libxml2 builds it
+    faster than the strainer would filter it.
+    """
+
+    default_backend = ParserBackend.beautifulsoup
+
+    def __init__(
+            self,
+            text: Union[str, bytes, IO, Response, Tag, etree.ElementBase],
+            keep_source: bool = False,
+            lean: bool = False,
+            backend: Optional[ParserBackend] = None,
+            subtrees: Optional[Sequence[Subtree]] = None,
+    ):
+        """
+        Initialize a new instance of the class.
+
+        :param text: The HTML page, a response containing it or an already parsed element.
+        :param keep_source: Whether to keep the raw bytes of a streamed response in `source`.
+        :param lean: Whether to drop the text of the page after parsing.
+        :param backend: The library the page is parsed with, `default_backend` if None.
+        :param subtrees: The only parts of the page BeautifulSoup keeps, the whole page if None.
+        """
+        self.backend = self.get_backend(text, backend)
+        self.strainer = SubtreeStrainer(subtrees) if subtrees else None
+        self.scripts: Optional[List[str]] = None
+        self.tree: Optional[etree.ElementBase] = None
+        self._soup: Optional[BeautifulSoup] = None
+        if isinstance(text, Response) and text._content is False:  # pylint: disable=W0212
+            # Кодировка берётся только из заголовка, для text/html без charset requests подставляет ISO-8859-1
+            content_type = text.headers.get("Content-Type", "").lower()
+            encoding = text.encoding if "charset" in content_type else "utf-8"
+            try:
+                self.__parse_chunks(text.iter_content(STREAM_CHUNK_SIZE), encoding, keep_source)
+            finally:
+                text.close()
+        elif isinstance(text, (Tag, etree.ElementBase)):
+            # Уже разобранное поддерево используется как есть, без сериализации и повторного разбора
+            self.source: Optional[bytes] = None
+            self._html: Optional[str] = None
+            if isinstance(text, Tag):
+                self._soup = text
+            else:
+                self.tree = text
+        else:
+            self.source = None
+            self._html = self.__extract_html(text)
+            if self.backend is ParserBackend.lxml:
+                self.tree = self.__parse_tree(self._html)
+            else:
+                self._soup = BeautifulSoup(self._html, "lxml", parse_only=self.strainer)
+            if lean:
+                self._html = None
+                self.scripts = self.__extract_scripts()
+
+    @classmethod
+    def get_backend(
+            cls, text: Union[str, bytes, IO, Response, Tag, etree.ElementBase], backend: Optional[ParserBackend] = None
+    ) -> ParserBackend:
+        """
+        :param text: The HTML page, a response containing it or an already parsed element.
+        :param backend: The requested backend, `default_backend` if None.
+        :return: The backend the page is parsed with, an already parsed element keeps the backend it belongs to.
+        """
+        if isinstance(text, Tag):
+            return ParserBackend.beautifulsoup
+        if isinstance(text, etree.ElementBase):
+            return ParserBackend.lxml
+        return backend or cls.default_backend
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """
+        :return: The BeautifulSoup tree of the page, for `ParserBackend.lxml` it is built on the first access.
+        """
+        if self._soup is None:
+            html = self._html if self._html is not None else etree.tostring(self.tree, encoding="unicode")
+            self._soup = BeautifulSoup(html, "lxml")
+        return self._soup
+
+    @property
+    def html(self) -> str:
+        """
+        :return: The source of the page, serialized from the tree for a parsed subtree or a streamed page
+            whose source was not kept.
+        """
+        if self._html is not None:
+            return self._html
+        if self.source is not None:
+            encoding = self._soup.original_encoding if self._soup is not None else None
+            return self.source.decode(encoding or "utf-8", errors="replace")
+        if self.tree is not None:
+            return etree.tostring(self.tree, encoding="unicode")
+        return str(self.soup)
+
+    @classmethod
+    def from_chunks(
+            cls,
+            chunks: Iterable[bytes],
+            encoding: str = "utf-8",
+            keep_source: bool = False,
+            backend: Optional[ParserBackend] = None,
+            subtrees: Optional[Sequence[Subtree]] = None,
+    ) -> HTMLDocument:
+        """
+        Parses the page incrementally from chunks of its bytes.
+
+        :param chunks: The chunks of the page.
+        :param encoding: The encoding of the page.
+        :param keep_source: Whether to keep the raw bytes of the page in `source`.
+        :param backend: The library the page is parsed with, `default_backend` if None.
+        :param subtrees: The only parts of the page BeautifulSoup keeps, the whole page if None.
+        :return: The parsed page.
+        """
+        document = cls.__new__(cls)
+        document.backend = backend or cls.default_backend
+        document.strainer = SubtreeStrainer(subtrees) if subtrees else None
+        document.tree = None
+        document._soup = None
+        document.__parse_chunks(chunks, encoding, keep_source)
+        return document
+
+    def __parse_chunks(self, chunks: Iterable[bytes], encoding: str, keep_source: bool):
+        self.source = None
+        self._html = None
+        if keep_source:
+            chunks = self.__keep_chunks(chunks)
+        if self.backend is ParserBackend.lxml:
+            parser = lxml.html.HTMLParser(encoding=encoding)
+            for chunk in chunks:
+                if chunk:
+                    parser.feed(chunk)
+            self.tree = self.__get_root(parser.close())
+        else:
+            self._soup = BeautifulSoup(
+                b"", builder=_IncrementalTreeBuilder(chunks), from_encoding=encoding, parse_only=self.strainer
+            )
+        self.scripts = None if keep_source else self.__extract_scripts()
+
+    @classmethod
+    def __parse_tree(cls, html: str) -> etree.ElementBase:
+        parser = lxml.html.HTMLParser()
+        if html:
+            parser.feed(html)
+        return cls.__get_root(parser.close())
+
+    @staticmethod
+    def __get_root(root: Optional[etree.ElementBase]) -> etree.ElementBase:
+        # Для пустой страницы парсер не создаёт корень, а построителям нужно дерево, пусть и без элементов
+        return root if root is not None else lxml.html.Element("html")
+
+    def __extract_scripts(self) -> List[str]:
+        # str() отвязывает текст от дерева, иначе NavigableString удерживал бы весь документ
+        if self.tree is not None:
+            return [
+                str(script.text) for script in self.tree.iter("script")
+                if script.text is not None and PLAYER_SCRIPT_MARKER in script.text
+            ]
+        return [
+            str(script.string) for script in self.soup.find_all("script")
+            if script.string is not None and PLAYER_SCRIPT_MARKER in script.string
+        ]
+
+    def __keep_chunks(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        source = []
+        for chunk in chunks:
+            source.append(chunk)
+            yield chunk
+        self.source = b"".join(source)
 
     @staticmethod
-    def __extract_html(html: Union[str, bytes, IO, Response, Tag]) -> str:
+    def __extract_html(html: Union[str, bytes, IO, Response]) -> str:
         if isinstance(html, IOBase):
             html = html.read()
         if isinstance(html, Response):
@@ -22,16 +368,45 @@ class HTMLDocument:
             return html.decode("utf-8")
         if isinstance(html, str):
             return html
-        if isinstance(html, Tag):
-            return str(html)
         raise TypeError(f"HTML document cannot be of type {type(html).__name__}")
 
 
 class PageRepresentation:
+    """
+    The base class of the builders that extract data from a page.
+
+    A builder may have implementations for other parser backends: a subclass declared with the `backend`
+    class keyword, e.g. ``class LXMLPosterBuilder(PosterBuilder, backend=ParserBackend.lxml)``,
+    is instantiated instead of the builder whenever the page is parsed with that backend.
+
+    A builder that needs only some parts of the page declares them in `subtrees`: a page given to it
+    as a string, bytes or a response is parsed with a `SubtreeStrainer`. A builder that receives
+    an already parsed `HTMLDocument` uses it as is, so the document has to contain all its subtrees.
+    A builder that sets `lean` parses the pages it is given in the lean mode of `HTMLDocument`.
+    """
+
+    _implementations: Dict[Tuple[type, ParserBackend], type] = {}
+    subtrees: Optional[Tuple[Subtree, ...]] = None
+    lean: bool = False
+
+    def __init_subclass__(cls, backend: Optional[ParserBackend] = None, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if backend is not None:
+            PageRepresentation._implementations[(cls.__base__, backend)] = cls
+
+    def __new__(cls, html_content: Union[str, bytes, IO, Response, PageRepresentation, HTMLDocument, Tag]):
+        if isinstance(html_content, PageRepresentation):
+            backend = html_content.page.backend
+        elif isinstance(html_content, HTMLDocument):
+            backend = html_content.backend
+        else:
+            backend = HTMLDocument.get_backend(html_content)
+        return super().__new__(PageRepresentation._implementations.get((cls, backend), cls))
+
     def __init__(self, html_content: Union[str, bytes, IO, Response, PageRepresentation, HTMLDocument, Tag]):
         if isinstance(html_content, HTMLDocument):
             self.page = html_content
         elif isinstance(html_content, PageRepresentation):
             self.page = html_content.page
         else:
-            self.page = HTMLDocument(html_content)
+            self.page = HTMLDocument(html_content, lean=self.lean, subtrees=self.subtrees)
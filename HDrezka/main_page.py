@@ -3,9 +3,11 @@ from __future__ import annotations
 import dataclasses
 import re
 from datetime import datetime
-from typing import Optional, List, TYPE_CHECKING, Union, overload
+from typing import Optional, List, TYPE_CHECKING, Tuple, Union, Iterable, overload
 from urllib.parse import urlsplit, urljoin, urlunsplit
 
+from requests import Response
+
 from . import franchise
 from . import (
     html_representation,
@@ -14,6 +16,7 @@ from . import (
     questions_asked,
     person,
 )
+from .connector import NetworkClient
 from .core_navigation import BaseSiteNavigation, Query
 from .filters import (
     GenreFilm,
@@ -147,44 +150,40 @@ class MainPageBuilder(html_representation.PageRepresentation):
 
 
 class HDrezka(BaseSiteNavigation[Union[MainPage, List[movie_posters.Poster]]]):
-    def __init__(self, mirror: Optional[str] = None):
+    def __init__(self, mirror: Optional[str] = None, client: Optional[NetworkClient] = None):
         super().__init__()
         assert isinstance(mirror, str) or mirror is None, 'Attribute "mirror" must be of type "str" or None.'
+        self.use_client(client)
         if isinstance(mirror, str):
-            self._connector.domain = urlsplit(mirror)[1]
+            url_split = urlsplit(mirror)
+            self._connector.domain = url_split.netloc
+            if url_split.scheme:
+                self._connector.scheme = url_split.scheme
         self._query = Query()
 
-    @staticmethod
-    def films(genre: Optional[GenreFilm] = None) -> Films:
-        return Films().selected_category(genre)
+    def films(self, genre: Optional[GenreFilm] = None) -> Films:
+        return Films().use_client(self._client).selected_category(genre)
 
-    @staticmethod
-    def cartoons(genre: Optional[GenreCartoons] = None) -> Cartoons:
-        return Cartoons().selected_category(genre)
+    def cartoons(self, genre: Optional[GenreCartoons] = None) -> Cartoons:
+        return Cartoons().use_client(self._client).selected_category(genre)
 
-    @staticmethod
-    def series(genre: Optional[GenreSeries] = None) -> Series:
-        return Series().selected_category(genre)
+    def series(self, genre: Optional[GenreSeries] = None) -> Series:
+        return Series().use_client(self._client).selected_category(genre)
 
-    @staticmethod
-    def animation(genre: Optional[GenreAnimation] = None) -> Animation:
-        return Animation().selected_category(genre)
+    def animation(self, genre: Optional[GenreAnimation] = None) -> Animation:
+        return Animation().use_client(self._client).selected_category(genre)
 
-    @staticmethod
-    def new() -> New:
-        return New()
+    def new(self) -> New:
+        return New().use_client(self._client)
 
-    @staticmethod
-    def announce() -> Announce:
-        return Announce()
+    def announce(self) -> Announce:
+        return Announce().use_client(self._client)
 
-    @staticmethod
-    def collections() -> Collections:
-        return Collections()
+    def collections(self) -> Collections:
+        return Collections().use_client(self._client)
 
-    @staticmethod
-    def search(text: str) -> Search:
-        return Search().query(text)
+    def search(self, text: str) -> Search:
+        return Search().use_client(self._client).query(text)
 
     def filter(self, pattern: Optional[Union[Filters, str]] = Filters.LAST):
         self._query.filter(pattern)
@@ -200,7 +199,7 @@ class HDrezka(BaseSiteNavigation[Union[MainPage, List[movie_posters.Poster]]]):
 
     @overload
     def get(
-            self, url: str = None
+            self, url: str = None, fields: Optional[Iterable[str]] = None, lazy: bool = False
     ) -> Union[
         MainPage,
         MovieDetails,
@@ -214,35 +213,77 @@ class HDrezka(BaseSiteNavigation[Union[MainPage, List[movie_posters.Poster]]]):
     ]:
         ...
 
-    def get(self, url: Optional[str] = None):  # pylint: disable = R0911
+    def get(self, url: Optional[str] = None, fields: Optional[Iterable[str]] = None, lazy: bool = False):
+        """
+        :param url: The URL of a page of the site, the main page or the page of posters of the iterator if None.
+        :param fields: Only for a movie page: the names of the fields of `MovieDetails` to extract,
+            the other fields are left None.
+        :param lazy: Only for a movie page: whether to return `LazyMovieDetails` whose fields are extracted
+            on first access.
+        """
+        if url is not None:
+            fields = self._check_movie_options(url, fields, lazy)
+            response = self._connector.get_page(self._remove_fragment(url))
+            with self._connector.measure("parse", url):
+                return self._extract_url_content(url, response, fields, lazy)
+        return super().get()
+
+    async def aget(self, url: Optional[str] = None, fields: Optional[Iterable[str]] = None, lazy: bool = False):
         if url is not None:
-            pure_url = urlunsplit(tuple(urlsplit(url))[:-1] + ("",))  # Removing the "fragment" from the URL
-            response = self._connector.get(pure_url).text
-            url_type = determine_url_type(url)
-            if url_type == URLsType.main:
-                return MainPageBuilder(response).extract_content()
-            if url_type == URLsType.movie:
-                movie = movie_page_descriptor.MovieDetailsBuilder(response).extract_content()
-                fragment = urlsplit(url).fragment  # t:1-s:1-e:5
-                if fragment != "":
-                    translate, season, episode = [int(i.split(":")[1]) for i in fragment.split("-")]
-                    movie.player.set_params(season_id=season, episode_id=episode, translate=translate)
-                return movie
-            if url_type == URLsType.collections:
-                return MovieCollectionBuilder(response).extract_content()
-            if url_type == URLsType.qa_info:
-                return questions_asked.QuestionsBuilder(response).extract_content()
-            if url_type == URLsType.qa:
-                return questions_asked.QuestionsBannerBuilder(response).extract_content()
-            if url_type == URLsType.franchises_info:
-                return franchise.FranchiseBuilder(response).extract_content()
-            if url_type == URLsType.franchises:
-                return franchise.FranchiseBannerBuilder(response).extract_content()
-            if url_type == URLsType.person_info:
-                return person.PersonBuilder(response).extract_content()
-            if url_type == URLsType.poster:
-                return movie_posters.PosterBuilder(response).extract_content()
-            raise ValueError(f"Unknown URL type: {url}")
+            fields = self._check_movie_options(url, fields, lazy)
+            response = await self._connector.aget(self._remove_fragment(url))
+            with self._connector.measure("parse", url):
+                return self._extract_url_content(url, response.text, fields, lazy)
+        return await super().aget()
+
+    @staticmethod
+    def _check_movie_options(url: str, fields: Optional[Iterable[str]], lazy: bool) -> Optional[Tuple[str, ...]]:
+        """
+        :return: The names of the fields to extract collected into a tuple, None if all fields are required.
+        """
+        if fields is None and not lazy:
+            return None
+        if determine_url_type(url) != URLsType.movie:
+            raise ValueError(f'Attributes "fields" and "lazy" can only be used for a movie page, got: {url}')
+        if fields is not None and lazy:
+            raise ValueError('Attributes "fields" and "lazy" cannot be used together.')
+        return movie_page_descriptor.MovieDetailsBuilder.check_fields(fields) if fields is not None else None
+
+    @staticmethod
+    def _remove_fragment(url: str) -> str:
+        return urlunsplit(tuple(urlsplit(url))[:-1] + ("",))
+
+    def _extract_url_content(  # pylint: disable = R0911
+            self, url: str, response: Union[str, Response], fields: Optional[Iterable[str]] = None, lazy: bool = False
+    ):
+        url_type = determine_url_type(url)
+        if url_type == URLsType.main:
+            return MainPageBuilder(response).extract_content()
+        if url_type == URLsType.movie:
+            builder = movie_page_descriptor.MovieDetailsBuilder(response)
+            movie = builder.extract_lazy_content() if lazy else builder.extract_content(fields)
+            fragment = urlsplit(url).fragment  # t:1-s:1-e:5
+            if fragment != "" and (fields is None or "player" in fields):
+                translate, season, episode = [int(i.split(":")[1]) for i in fragment.split("-")]
+                movie.player.set_params(season_id=season, episode_id=episode, translate=translate)
+            return movie
+        if url_type == URLsType.collections:
+            return MovieCollectionBuilder(response).extract_content()
+        if url_type == URLsType.qa_info:
+            return questions_asked.QuestionsBuilder(response).extract_content()
+        if url_type == URLsType.qa:
+            return questions_asked.QuestionsBannerBuilder(response).extract_content()
+        if url_type == URLsType.franchises_info:
+            return franchise.FranchiseBuilder(response).extract_content()
+        if url_type == URLsType.franchises:
+            return franchise.FranchiseBannerBuilder(response).extract_content()
+        if url_type == URLsType.person_info:
+            return person.PersonBuilder(response).extract_content()
+        if url_type == URLsType.poster:
+            return movie_posters.PosterBuilder(response).extract_content()
+        raise ValueError(f"Unknown URL type: {url}")
+
+    def _extract_content(self, page: html_representation.HTMLDocument):
         if self.current_page == 1 and str(self._query) == "":
-            return MainPageBuilder(super().get()).extract_content()
-        return movie_posters.PosterBuilder(super().get()).extract_content()
+            return MainPageBuilder(page).extract_content()
+        return movie_posters.PosterBuilder(page).extract_content()
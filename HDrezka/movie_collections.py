@@ -8,11 +8,13 @@ from .connector import NetworkClient
 from .core_navigation import Query, PageIterator, BaseSiteNavigation
 from .exceptions import EmptyPage
 from .filters import Filters
-from .html_representation import PageRepresentation
+from .html_representation import PageRepresentation, HTMLDocument
 from .movie_posters import Poster, PosterBuilder
 
 
 class CollectionIterator(BaseSiteNavigation[List[Poster]]):
+    _subtrees = PosterBuilder.subtrees
+
     def __init__(self, collection_url: str):
         super().__init__()
         self.collection_url = collection_url
@@ -22,8 +24,8 @@ class CollectionIterator(BaseSiteNavigation[List[Poster]]):
         self._query.filter(pattern)
         return self
 
-    def get(self) -> List[Poster]:
-        return PosterBuilder(super().get()).extract_content()
+    def _extract_content(self, page: HTMLDocument) -> List[Poster]:
+        return PosterBuilder(page).extract_content()
 
     def __str__(self):
         return f"{self.collection_url.rstrip('/')}/{PageIterator.__str__(self)}{self._query}"
@@ -37,7 +39,11 @@ class CollectionBriefInfo:
 
     def get(self, custom_filter: Optional[Union[Filters, str]] = None) -> List[Poster]:
         filter_param = Query().filter(custom_filter)
-        return PosterBuilder(NetworkClient().get(f"{self.url}{filter_param}").text).extract_content()
+        connector = NetworkClient()
+        url = f"{self.url}{filter_param}"
+        response = connector.get_page(url)
+        with connector.measure("parse", url):
+            return PosterBuilder(response).extract_content()
 
     def __iter__(self) -> Iterator[List[Poster]]:
         return CollectionIterator(self.url)
@@ -56,7 +62,11 @@ class MovieCollection:
 
     def get(self, custom_filter: Optional[Union[Filters, str]] = None) -> List[Poster]:
         filter_param = Query().filter(custom_filter)
-        return PosterBuilder(NetworkClient().get(f"{self.url}{filter_param}").text).extract_content()
+        connector = NetworkClient()
+        url = f"{self.url}{filter_param}"
+        response = connector.get_page(url)
+        with connector.measure("parse", url):
+            return PosterBuilder(response).extract_content()
 
     def __iter__(self) -> Iterator[List[Poster]]:
         return CollectionIterator(self.url)
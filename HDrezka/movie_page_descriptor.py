@@ -3,8 +3,9 @@ from __future__ import annotations
 import base64
 import datetime
 import re
+import dataclasses
 from dataclasses import dataclass, field
-from typing import List, Optional, Union, TYPE_CHECKING
+from typing import List, Optional, Union, Iterable, Tuple, TYPE_CHECKING
 from urllib.parse import unquote
 
 from . import franchise
@@ -12,12 +13,20 @@ from . import movie_collections
 from . import movie_posters
 from .comments import CommentsIterator
 from .connector import NetworkClient
-from .html_representation import PageRepresentation
+from .exceptions import EmptyPage
+from .html_representation import (
+    PageRepresentation,
+    ParserBackend,
+    find_element,
+    find_elements,
+    element_text,
+    next_node_text,
+)
 from .person import PersonBriefInfo
 from .player import PlayerBuilder, Serial, Film
 from .questions_asked import QuestionsBannerBuilder
-from .trailer import TrailerBuilder
-from .utility import convert_string_into_datetime
+from .trailer import TrailerBuilder, Trailer
+from .utility import convert_strings_into_datetimes
 
 if TYPE_CHECKING:
     from .movie_posters import Poster
@@ -44,7 +53,10 @@ class TopLists:
     url: str = None  # ссылка на подборку
 
     def get(self) -> List[Poster]:
-        return movie_posters.PosterBuilder(NetworkClient().get(self.url).text).extract_content()
+        connector = NetworkClient()
+        response = connector.get_page(self.url)
+        with connector.measure("parse", self.url):
+            return movie_posters.PosterBuilder(response).extract_content()
 
     def __repr__(self):
         return f"<TopLists({self.title} - {self.place})>"
@@ -74,7 +86,10 @@ class CustomString(str):
         return instance
 
     def get(self) -> List[Poster]:
-        return movie_posters.PosterBuilder(NetworkClient().get(self.url).text).extract_content()
+        connector = NetworkClient()
+        response = connector.get_page(self.url)
+        with connector.measure("parse", self.url):
+            return movie_posters.PosterBuilder(response).extract_content()
 
 
 @dataclass
@@ -120,6 +135,47 @@ class MovieDetails:
         return f"<MovieDetails({self.title})>"
 
 
+class LazyMovieDetails(MovieDetails):
+    """
+    The `MovieDetails` whose fields are extracted from the page on first access and memoised, so the sections
+    that are never used (e.g. the player or the recommendations) are never built.
+
+    The builder and its parsed page are kept until every field has been accessed. Use `dataclasses.asdict`
+    rather than `__dict__` to get all fields, the latter contains only the fields accessed so far.
+    """
+
+    __slots__ = ("_builder",)
+
+    def __init__(self, builder: MovieDetailsBuilder):  # pylint: disable=W0231
+        self._builder: Optional[MovieDetailsBuilder] = builder
+
+    def _load(self, name: str):
+        value = self.__dict__[name] = self._builder.extract_field(name)
+        if all(field_name in self.__dict__ for field_name in self._builder.field_extractors):
+            # Все поля извлечены, страница больше не нужна
+            self._builder = None
+        return value
+
+
+class _LazyField:
+    """
+    The field of `LazyMovieDetails`: a non-data descriptor, so once the value is stored in the instance
+    dictionary it is returned without calling the descriptor.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance: Optional[LazyMovieDetails], owner=None):
+        if instance is None:
+            return self
+        return instance._load(self.name)  # pylint: disable=W0212
+
+
+for _field in dataclasses.fields(MovieDetails):
+    setattr(LazyMovieDetails, _field.name, _LazyField(_field.name))
+
+
 class InfoTableBuilder(PageRepresentation):
     def extract_content(self):
         info = self.page.soup.find("table", class_="b-post__info")
@@ -249,31 +305,217 @@ class InfoTableBuilder(PageRepresentation):
         return result_lst
 
 
-class MovieDetailsBuilder(PageRepresentation):
+class LXMLInfoTableBuilder(InfoTableBuilder, backend=ParserBackend.lxml):
     def extract_content(self):
-        page = MovieDetails()
-        page.id = int(re.search(r"/(\d*)-", self.page.soup.find("meta", property="og:url").get("content")).group(1))
-        page.title = self.page.soup.find("div", class_="b-post__title").text.strip()
-        page.url = self.page.soup.find("meta", property="og:url").get("content").strip()
-        page.original_title = self.extract_original_name()
-        page.status = self.extract_status()
-        page.img_url = self.page.soup.find("div", class_="b-sidecover").a.get("href")
-        page.trailer = self.extract_trailer()
-        page.info_table = InfoTableBuilder(self.page).extract_content()
-        page.description = self.extract_description()
-        page.player = PlayerBuilder(self.page).extract_content()
-        page.comments_count = self.extract_comments_count()
-        page.franchise = franchise.FranchiseBriefInfoBuilder(self.page).extract_content()
-        page.recommendations = self.extract_recommendations()
-        page.schedule_block = self.extract_schedule_block()
-        page.questions_asked = self.extract_questions()
-        page.comment = CommentsIterator(page.id)
+        info = find_element(self.page.tree, "table", "b-post__info")
+
+        table_info = InfoTable()
+        for k in find_elements(info, "tr"):
+            item = find_elements(k, "td")
+            key = element_text(item[0]).strip()
+            if key == "Рейтинги:":
+                table_info.rates = self.extract_rates(item[1])
+            elif key == "Входит в списки:":
+                table_info.on_the_lists = self.extract_lists(item[1])
+            elif key == "Слоган:":
+                table_info.tagline = element_text(item[1]).strip()
+            elif key in ("Год:", "Дата выхода:"):
+                table_info.release = self.extract_date_release(item[1])
+            elif key == "Страна:":
+                table_info.country = self.extract_country(item[1])
+            elif key == "Режиссер:":
+                table_info.producer = self.extract_person(item[1])
+            elif key == "Жанр:":
+                table_info.genre = self.extract_genre(item[1])
+            elif key == "Возраст:":
+                table_info.age_restrictions = element_text(find_element(item[1], "span")).strip()
+            elif key == "Время:":
+                table_info.duration = element_text(item[1]).strip().replace(".", "")
+            elif key == "Из серии:":
+                table_info.collections = self.extract_collections(item[1])
+            elif key == "В качестве:":
+                table_info.quality = element_text(item[1]).strip()
+            elif key == "В переводе:":
+                table_info.translate = [i.strip() for i in re.split(r", | и ", element_text(item[1])) if i.strip()]
+            elif find_element(item[0], "div", "persons-list-holder") is not None:
+                table_info.cast = self.extract_person(item[0])
+            else:
+                raise TypeError(item)  # pragma: NO COVER
+        return table_info
 
+    @staticmethod
+    def extract_date_release(data) -> Union[CustomString, str]:
+        release = element_text(data).strip()
+        url = find_element(data, "a")
+        return CustomString(release, url.get("href")) if url is not None else release
+
+    @staticmethod
+    def extract_country(data) -> List[Union[CustomString]]:
+        return [CustomString(element_text(item).strip(), item.get("href")) for item in find_elements(data, "a")]
+
+    @staticmethod
+    def extract_genre(data) -> List[CustomString]:
+        return [CustomString(element_text(item).strip(), item.get("href")) for item in find_elements(data, "a")]
+
+    @staticmethod
+    def extract_rates(data):
+        result_lst = []
+        for blank in find_elements(data, "span", "b-post__info_rates"):
+            rate = Rating()
+            link = find_element(blank, "a")
+            if link is not None:
+                rate.name = element_text(link).strip()
+                rate.source = unquote(base64.b64decode(link.get("href").split("/")[-2]).decode("utf-8"))
+            else:
+                rate.name = next_node_text(blank).strip()[:-1]
+            rate.rates = float(element_text(find_element(blank, "span")).strip())
+            rate.votes = int(element_text(find_element(blank, "i")).strip()[1:-1].replace(" ", ""))
+            result_lst.append(rate)
+        return result_lst
+
+    @staticmethod
+    def extract_lists(data):
+        # Как и contents в BeautifulSoup: ссылки вперемешку с текстом между ними
+        contents = [data.text] if data.text else []
+        for child in data:
+            contents.append(child)
+            if child.tail:
+                contents.append(child.tail)
+        lists = [i for i in contents if (i if isinstance(i, str) else element_text(i)) != ""]
+        result_lst = []
+        for link, place in zip(lists[::2], lists[1::2]):  # split the list in pairs
+            top = TopLists()
+            top.title = element_text(link).strip()
+            top.place = place.strip()[1:-1]
+            top.url = link.get("href").strip()
+            result_lst.append(top)
+        return result_lst
+
+    @staticmethod
+    def extract_person(data):
+        result_lst = []
+        for item in find_elements(data, "span", "item"):
+            person_obj = find_element(item, "span", "person-name-item")
+            if person_obj is not None:
+                img_url = person_obj.get("data-photo", "null")
+                job = person_obj.get("data-job", "null")
+                link = find_element(person_obj, "a")
+                result_lst.append(
+                    PersonBriefInfo(
+                        id=int(person_obj.get("data-id").strip()),
+                        film_id=int(person_obj.get("data-pid").strip()),
+                        name=element_text(find_element(link, "span")).strip(),
+                        url=link.get("href").strip(),
+                        img_url=img_url.strip() if img_url != "null" else None,
+                        job=job.strip() if job != "null" else None,
+                    )
+                )
+            else:
+                text = element_text(item)
+                if text == "и другие":
+                    continue
+                result_lst.append(PersonBriefInfo(name=text.replace(",", "").strip()))
+        return result_lst
+
+    @staticmethod
+    def extract_collections(data):
+        result_lst = []
+        for c in find_elements(data, "a"):
+            collection = movie_collections.CollectionBriefInfo()
+            collection.id = int(re.search(r"/(\d+)-", c.get("href")).group(1))
+            collection.title = element_text(c).strip()
+            collection.url = c.get("href").strip()
+            result_lst.append(collection)
+        return result_lst
+
+
+class MovieDetailsBuilder(PageRepresentation):  # pylint: disable=R0904
+    # Всё, что нужно построителю и вложенным в него построителям, находится в основной колонке страницы,
+    # скрипты оставлены для инициализации плеера в облегчённом режиме
+    subtrees = (("meta", {"property": "og:url"}), ("div", {"class": "b-content__main"}), ("script", {}))
+    lean = True
+
+    # Поля MovieDetails и методы, которыми они извлекаются
+    field_extractors = {
+        "id": "extract_id",
+        "title": "extract_title",
+        "url": "extract_url",
+        "original_title": "extract_original_name",
+        "status": "extract_status",
+        "img_url": "extract_image",
+        "trailer": "extract_trailer",
+        "info_table": "extract_info_table",
+        "description": "extract_description",
+        "player": "extract_player",
+        "comments_count": "extract_comments_count",
+        "franchise": "extract_franchise",
+        "recommendations": "extract_recommendations",
+        "schedule_block": "extract_schedule_block",
+        "questions_asked": "extract_questions",
+        "comment": "extract_comment",
+    }
+
+    def extract_content(self, fields: Optional[Iterable[str]] = None) -> MovieDetails:
+        """
+        :param fields: The names of the fields of `MovieDetails` to extract, the other fields are left None.
+            All fields are extracted if None.
+        """
+        return MovieDetails(**{name: self.extract_field(name) for name in self.check_fields(fields)})
+
+    def extract_lazy_content(self) -> LazyMovieDetails:
+        """
+        :return: The details whose fields are extracted on first access.
+        """
+        return LazyMovieDetails(self)
+
+    def extract_field(self, name: str):
+        """
+        :param name: The name of a field of `MovieDetails`.
+        :return: The value of the field extracted from the page.
+        """
+        return getattr(self, self.field_extractors[name])()
+
+    @classmethod
+    def check_fields(cls, fields: Optional[Iterable[str]]) -> Tuple[str, ...]:
+        """
+        :return: The names of the fields to extract.
+        :raises ValueError: If there is no such field in `MovieDetails`.
+        """
+        if fields is None:
+            return tuple(cls.field_extractors)
+        fields = (fields,) if isinstance(fields, str) else tuple(fields)
+        unknown = [name for name in fields if name not in cls.field_extractors]
+        if unknown:
+            raise ValueError(f"Unknown fields of MovieDetails: {', '.join(unknown)}")
+        return fields
+
+    def extract_id(self) -> int:
+        return int(re.search(r"/(\d*)-", self.extract_url()).group(1))
+
+    def extract_info_table(self) -> InfoTable:
+        info_table = InfoTableBuilder(self.page).extract_content()
         rezka_rates = self.extract_rates()
         if rezka_rates:
-            page.info_table.rates.append(rezka_rates)
+            info_table.rates.append(rezka_rates)
+        return info_table
+
+    def extract_player(self) -> Union[Serial, Film, Trailer, None]:
+        return PlayerBuilder(self.page).extract_content()
 
-        return page
+    def extract_franchise(self) -> Optional[FranchiseBriefInfo]:
+        return franchise.FranchiseBriefInfoBuilder(self.page).extract_content()
+
+    def extract_comment(self) -> CommentsIterator:
+        return CommentsIterator(self.extract_id())
+
+    def extract_url(self) -> str:
+        return self.page.soup.find("meta", property="og:url").get("content").strip()
+
+    def extract_title(self) -> str:
+        return self.page.soup.find("div", class_="b-post__title").text.strip()
+
+    def extract_image(self) -> str:
+        return self.page.soup.find("div", class_="b-sidecover").a.get("href")
 
     def extract_original_name(self) -> Optional[str]:
         original_name = self.page.soup.find("div", class_="b-post__origtitle")
@@ -315,7 +557,9 @@ class MovieDetailsBuilder(PageRepresentation):
 
     def extract_recommendations(self) -> List[Poster]:
         recommendations = self.page.soup.find("div", class_="b-sidelist")
-        return movie_posters.PosterBuilder(str(recommendations)).extract_content()
+        if recommendations is None:
+            raise EmptyPage("No Posters were found on the page")
+        return movie_posters.PosterBuilder(recommendations).extract_content()
 
     def extract_comments_count(self) -> Optional[int]:
         comments_count = self.page.soup.find("button", id="comments-list-button").em
@@ -326,6 +570,7 @@ class MovieDetailsBuilder(PageRepresentation):
     def extract_schedule_block(self) -> Optional[List[EpisodeOverview]]:
         lst_seasons = self.page.soup.find_all("div", class_="b-post__schedule_list")
         result_lst = []
+        release_dates = []
         for s in lst_seasons:
             for e in s.find_all("tr"):
                 try:
@@ -339,19 +584,114 @@ class MovieDetailsBuilder(PageRepresentation):
                     )
                     episode.original_title = original_title if original_title else localize_title
                     episode.localize_title = localize_title if original_title else None
-                    episode.release_date = convert_string_into_datetime(e.find(class_="td-4").text.strip()) or None
+                    release_date = e.find(class_="td-4").text.strip()
                     status = e.find(class_="td-5").text.strip()
                     episode.exists_episode = status if status not in ("&check;", "") else status == "&check;"
                     result_lst.append(episode)
+                    release_dates.append(release_date)
                 except AttributeError:
                     continue
-        return result_lst
+        return self._set_release_dates(result_lst, release_dates)
+
+    @staticmethod
+    def _set_release_dates(episodes: List[EpisodeOverview], release_dates: List[str]) -> List[EpisodeOverview]:
+        # Даты выхода всех серий разбираются одним пакетом
+        for episode, release_date in zip(episodes, convert_strings_into_datetimes(release_dates)):
+            episode.release_date = release_date or None
+        return episodes
 
     def extract_questions(self) -> List[QuestionBanner]:
         faq_block = self.page.soup.find("div", class_="b-post__qa_list_block")
         if faq_block is None:
             return []
-        return QuestionsBannerBuilder(str(faq_block)).extract_content()
+        return QuestionsBannerBuilder(faq_block).extract_content()
 
     def __repr__(self):
         return f"<{MovieDetailsBuilder.__name__}>"
+
+
+class LXMLMovieDetailsBuilder(MovieDetailsBuilder, backend=ParserBackend.lxml):
+    def extract_url(self) -> str:
+        return find_element(self.page.tree, "meta", property="og:url").get("content").strip()
+
+    def extract_title(self) -> str:
+        return element_text(find_element(self.page.tree, "div", "b-post__title")).strip()
+
+    def extract_image(self) -> str:
+        return find_element(find_element(self.page.tree, "div", "b-sidecover"), "a").get("href")
+
+    def extract_original_name(self) -> Optional[str]:
+        original_name = find_element(self.page.tree, "div", "b-post__origtitle")
+        return element_text(original_name).strip() if original_name is not None else None
+
+    def extract_status(self) -> Optional[str]:
+        status = find_element(self.page.tree, "div", "b-post__infolast")
+        return element_text(status).strip() if status is not None else None
+
+    def extract_trailer(self) -> Optional[TrailerBuilder]:
+        trailer = find_element(self.page.tree, "a", "b-sidelinks__link")
+        trailer_id = trailer.get("data-id") if trailer is not None else None
+        if isinstance(trailer_id, str) and trailer_id.isdigit():
+            return TrailerBuilder(film_id=int(trailer_id))
+        return None
+
+    def extract_description(self) -> Optional[str]:
+        description = find_element(self.page.tree, "div", "b-post__description_text")
+        return element_text(description).strip() if description is not None else None
+
+    def extract_rates(self) -> Optional[Rating]:
+        rates = find_element(self.page.tree, "span", "num")
+        votes = find_element(self.page.tree, "span", "votes")
+        votes = find_element(votes, "span") if votes is not None else None
+        if rates is None or votes is None:
+            return None
+        return Rating(
+            name="HDrezka",
+            rates=float(element_text(rates).strip()),
+            votes=int(element_text(votes).strip()),
+            source=self.extract_url(),
+        )
+
+    def extract_recommendations(self) -> List[Poster]:
+        recommendations = find_element(self.page.tree, "div", "b-sidelist")
+        if recommendations is None:
+            raise EmptyPage("No Posters were found on the page")
+        return movie_posters.PosterBuilder(recommendations).extract_content()
+
+    def extract_comments_count(self) -> Optional[int]:
+        comments_count = find_element(find_element(self.page.tree, "button", id="comments-list-button"), "em")
+        return int(element_text(comments_count).strip()) if comments_count is not None else None
+
+    def extract_schedule_block(self) -> Optional[List[EpisodeOverview]]:
+        result_lst = []
+        release_dates = []
+        for s in find_elements(self.page.tree, "div", "b-post__schedule_list"):
+            for e in find_elements(s, "tr"):
+                cells = {name: find_element(e, class_=name) for name in ("td-1", "td-2", "td-4", "td-5")}
+                if any(cell is None for cell in cells.values()):
+                    continue
+                original_title = find_element(cells["td-2"], "span")
+                localize_title = find_element(cells["td-2"], "b")
+                if original_title is None or localize_title is None:
+                    continue
+                original_title = element_text(original_title).strip() or None
+                localize_title = element_text(localize_title).strip() or None
+                current_episode = element_text(cells["td-1"]).strip()
+
+                episode = EpisodeOverview()
+                episode.season, episode.episode = map(
+                    int, re.search(r"(?:(\d+) сезон)?\s?(?:(\d+) серия)?", current_episode).groups()
+                )
+                episode.original_title = original_title if original_title else localize_title
+                episode.localize_title = localize_title if original_title else None
+                status = element_text(cells["td-5"]).strip()
+                episode.exists_episode = status if status not in ("&check;", "") else status == "&check;"
+                result_lst.append(episode)
+                release_dates.append(element_text(cells["td-4"]).strip())
+        return self._set_release_dates(result_lst, release_dates)
+
+    def extract_questions(self) -> List[QuestionBanner]:
+        faq_block = find_element(self.page.tree, "div", "b-post__qa_list_block")
+        if faq_block is None:
+            return []
+        return QuestionsBannerBuilder(faq_block).extract_content()
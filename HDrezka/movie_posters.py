@@ -5,13 +5,21 @@ from dataclasses import dataclass
 from typing import Union, Optional, List, TYPE_CHECKING
 
 from bs4.element import NavigableString, PageElement
+from lxml import etree
 
 from . import movie_page_descriptor
 from . import person
 from .connector import NetworkClient
 from .exceptions import EmptyPage
 from .filters import convert_genres
-from .html_representation import PageRepresentation
+from .html_representation import (
+    PageRepresentation,
+    ParserBackend,
+    find_element,
+    find_elements,
+    element_text,
+    next_node_text,
+)
 from .person import PersonBriefInfo
 from .trailer import TrailerBuilder
 
@@ -37,7 +45,16 @@ class Poster:
     url: str = None  # Ссылка на страницу фильма
 
     def get(self):
-        return movie_page_descriptor.MovieDetailsBuilder(NetworkClient().get(self.url).text).extract_content()
+        connector = NetworkClient()
+        response = connector.get_page(self.url)
+        with connector.measure("parse", self.url):
+            return movie_page_descriptor.MovieDetailsBuilder(response).extract_content()
+
+    async def aget(self):
+        connector = NetworkClient()
+        response = await connector.aget(self.url)
+        with connector.measure("parse", self.url):
+            return movie_page_descriptor.MovieDetailsBuilder(response.text).extract_content()
 
     def quick_content(self):
         connector = NetworkClient()
@@ -45,6 +62,12 @@ class Poster:
         extended_info = connector.post(url, data={"id": self.id, "is_touch": "1"}).text
         return PosterExtendedInfoBuilder(extended_info).extract_content()
 
+    async def aquick_content(self):
+        connector = NetworkClient()
+        url = f"{connector.url}/engine/ajax/quick_content.php"
+        response = await connector.apost(url, data={"id": self.id, "is_touch": "1"})
+        return PosterExtendedInfoBuilder(response.text).extract_content()
+
     def __repr__(self):
         return f'Poster("{self.title}")'
 
@@ -63,7 +86,10 @@ class PosterExtendedInfo:
     url: str = None
 
     def get(self) -> MovieDetails:
-        return movie_page_descriptor.MovieDetailsBuilder(NetworkClient().get(self.url).text).extract_content()
+        connector = NetworkClient()
+        response = connector.get_page(self.url)
+        with connector.measure("parse", self.url):
+            return movie_page_descriptor.MovieDetailsBuilder(response).extract_content()
 
     def __repr__(self):
         return f'PosterExtendedInfo("{self.title}")'
@@ -152,6 +178,8 @@ class PosterExtendedInfoBuilder(PageRepresentation):
 
 
 class PosterBuilder(PageRepresentation):
+    subtrees = (("div", {"class": "b-content__inline_item"}), ("div", {"class": "b-navigation"}))
+
     def extract_content(self):
         page_info = []
         for item in self.page.soup.find_all("div", class_="b-content__inline_item"):
@@ -193,7 +221,10 @@ class PosterBuilder(PageRepresentation):
 
     @staticmethod
     def extract_misc(item):
-        raw_data = item.find("div", class_="b-content__inline_item-link").find("div").text
+        return PosterBuilder.parse_misc(item.find("div", class_="b-content__inline_item-link").find("div").text)
+
+    @staticmethod
+    def parse_misc(raw_data: str):
         parsed_info = re.match(r"(\d{4}\s?-\s?[.\d]*|\d{4}),?\s?([^,]*),?\s?([^,]*)", raw_data)
         if not parsed_info:
             return (None,) * 3
@@ -201,3 +232,49 @@ class PosterBuilder(PageRepresentation):
         if convert_genres(misc[1]):
             return misc[0:1] + misc[:0:-1]
         return misc
+
+
+class LXMLPosterBuilder(PosterBuilder, backend=ParserBackend.lxml):
+    def extract_content(self):
+        page_info = []
+        for item in find_elements(self.page.tree, "div", "b-content__inline_item"):
+            link = find_element(item, "div", "b-content__inline_item-link")
+            poster = Poster()
+            poster.id = int(item.get("data-id"))
+            poster.title = element_text(find_element(link, "a"))
+            poster.entity = next_node_text(find_element(item, "i", "entity")).strip() or None
+            poster.rates = self.extract_rates(item)
+            poster.status = self.extract_info(item)
+            poster.year, poster.country, poster.genre = self.parse_misc(element_text(find_element(link, "div")))
+            poster.trailer = self.extract_trailer(item)
+            poster.img_url = find_element(item, "img").get("src")
+            poster.url = item.get("data-url")
+
+            page_info.append(poster)
+        if not page_info:
+            raise EmptyPage("No Posters were found on the page")
+        return page_info
+
+    @staticmethod
+    def extract_rates(item):
+        rates = find_element(item, "i", "b-category-bestrating")
+        if rates is None:
+            return rates
+        text = element_text(rates)
+        return float(text[1:-1]) if text != "(—)" else None
+
+    @staticmethod
+    def extract_info(item):
+        info = find_element(item, "span", "info")
+        if info is None:
+            return None
+        parts = [info.text or ""]
+        for child in info:
+            parts.append(" " if child.tag == "br" else etree.tostring(child, encoding="unicode", with_tail=False))
+            parts.append(child.tail or "")
+        return "".join(parts).replace(",", "")
+
+    @staticmethod
+    def extract_trailer(item) -> Union[TrailerBuilder, None]:
+        trailer = find_element(item, "i", "trailer")
+        return TrailerBuilder(int(trailer.get("data-id"))) if trailer is not None else None
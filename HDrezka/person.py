@@ -8,7 +8,7 @@ from typing import Dict, Optional, List, TYPE_CHECKING, Union
 from . import movie_posters
 from .connector import NetworkClient
 from .exceptions import ServiceUnavailable, PageNotFound
-from .html_representation import PageRepresentation
+from .html_representation import PageRepresentation, ParserBackend, find_element, find_elements, element_text
 from .utility import convert_string_into_datetime
 
 if TYPE_CHECKING:
@@ -27,7 +27,10 @@ class PersonBriefInfo:
     def get(self) -> Person:
         if self.url is None:
             raise PageNotFound("No correct URL was found for the request")
-        return PersonBuilder(NetworkClient().get(self.url).text).extract_content()
+        connector = NetworkClient()
+        response = connector.get_page(self.url)
+        with connector.measure("parse", self.url):
+            return PersonBuilder(response).extract_content()
 
     def quick_content(self) -> PersonExtendedInfo:
         if self.id is None:
@@ -65,7 +68,10 @@ class PersonExtendedInfo:
     def get(self):
         if self.url is None:
             raise PageNotFound("No correct URL was found for the request")
-        return PersonBuilder(NetworkClient(self.url).text).extract_content()
+        connector = NetworkClient()
+        response = connector.get_page(self.url)
+        with connector.measure("parse", self.url):
+            return PersonBuilder(response).extract_content()
 
     def __repr__(self):
         return f"<PersonExtendedInfo({self.name})>"
@@ -119,15 +125,18 @@ class Person:
 
 
 class PersonBuilder(PageRepresentation):
+    subtrees = (
+        ("meta", {"property": "og:url"}),
+        ("div", {"class": "b-post__title"}),
+        ("div", {"class": "b-post__infotable"}),
+        ("div", {"class": "b-person__career"}),
+    )
+
     def extract_content(self) -> Person:
         info_table = self.extract_infotable()
+        url = self.extract_url()
         return Person(
-            id=int(
-                re.search(
-                    r"/(\d*)-",
-                    self.page.soup.find("meta", property="og:url").get("content"),
-                ).group(1)
-            ),
+            id=int(re.search(r"/(\d*)-", url).group(1)),
             name=self.extract_localize_name(),
             original_name=self.extract_original_name(),
             height=info_table.get("person_height"),
@@ -141,9 +150,12 @@ class PersonBuilder(PageRepresentation):
             img_url=self.extract_image(),
             gallery=info_table.get("gallery"),
             stats=self.extract_stats(),
-            url=self.page.soup.find("meta", property="og:url").get("content"),
+            url=url,
         )
 
+    def extract_url(self):
+        return self.page.soup.find("meta", property="og:url").get("content")
+
     def extract_localize_name(self):
         title_obj = self.page.soup.find("div", class_="b-post__title")
         return title_obj.find("span", itemprop="name").text.strip()
@@ -198,3 +210,61 @@ class PersonBuilder(PageRepresentation):
         age = re.search(r"\((.*?)\)", data.text)
         birthday = data.find("time").text
         return convert_string_into_datetime(birthday), age[1].strip() if age else None
+
+
+class LXMLPersonBuilder(PersonBuilder, backend=ParserBackend.lxml):
+    def extract_url(self):
+        return find_element(self.page.tree, "meta", property="og:url").get("content")
+
+    def extract_localize_name(self):
+        title_obj = find_element(self.page.tree, "div", "b-post__title")
+        return element_text(find_element(title_obj, "span", itemprop="name")).strip()
+
+    def extract_original_name(self):
+        title_obj = find_element(self.page.tree, "div", "b-post__title")
+        original_name = find_element(title_obj, "span", itemprop="alternativeHeadline")
+        return element_text(original_name).strip() if original_name is not None else None
+
+    def extract_image(self):
+        infotable = find_element(self.page.tree, "div", "b-post__infotable clearfix")
+        infotable_left = find_element(infotable, class_="b-post__infotable_left")
+        return find_element(infotable_left, "img").get("src")
+
+    def extract_stats(self):
+        result = {}
+        for item in find_elements(self.page.tree, "div", "b-person__career"):
+            key = element_text(find_element(item, "h2")).strip().lower()
+            result[key] = movie_posters.PosterBuilder(item).extract_content()
+        return result
+
+    def extract_infotable(self):
+        infotable_right = find_element(self.page.tree, "div", "b-post__infotable_right_inner")
+        info = find_element(infotable_right, "table", "b-post__info")
+
+        result = {}
+        for k in find_elements(info, "tr"):
+            item = find_elements(k, "td")
+            key = element_text(item[0]).strip()
+            if key == "Карьера:":
+                result["careers"] = [element_text(i).strip() for i in find_elements(item[1], "a")]
+            elif key == "Дата рождения:":
+                result["birthday"], result["age"] = self.extract_date_and_age(item[1])
+            elif key == "Место рождения:":
+                result["birthplace"] = element_text(item[1]).strip()
+            elif key == "Дата смерти:":
+                result["death_day"], result["age_full"] = self.extract_date_and_age(item[1])
+            elif key == "Место смерти:":
+                result["death_place"] = element_text(item[1]).strip()
+            elif key == "Рост:":
+                result["person_height"] = element_text(item[1]).strip()
+            elif find_element(item[0], "div", "b-person__gallery_holder") is not None:
+                result["gallery"] = [i.get("href") for i in find_elements(item[0], "a")]
+            else:
+                raise TypeError(item)  # pragma: NO COVER
+        return result
+
+    @staticmethod
+    def extract_date_and_age(data):
+        age = re.search(r"\((.*?)\)", element_text(data))
+        birthday = element_text(find_element(data, "time"))
+        return convert_string_into_datetime(birthday), age[1].strip() if age else None
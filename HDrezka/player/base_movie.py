@@ -15,11 +15,7 @@ from .construct_types import QueryData, Subtitle, Translator, Quality, Actions
 
 class BaseMovie(Generic[QueryData], ABC):
     _metadata: QueryData
-
-    def __new__(cls, *args, **kwargs):
-        if not hasattr(cls, "_connector"):
-            cls._connector = NetworkClient()
-        return super().__new__(cls)
+    _client: Optional[NetworkClient] = None
 
     def __init__(
             self,
@@ -35,6 +31,14 @@ class BaseMovie(Generic[QueryData], ABC):
         self._subtitle_list = subtitle_list
         self.translate_list = translate_list
 
+    @property
+    def _connector(self) -> NetworkClient:
+        return self._client if self._client is not None else NetworkClient()
+
+    def use_client(self, client: Optional[NetworkClient]):
+        self._client = client
+        return self
+
     def get_current_translate(self):
         return [t for t in self.translate_list if t.id == self._metadata.translator_id][0]
 
@@ -175,15 +179,45 @@ class BaseMovie(Generic[QueryData], ABC):
         finally:
             self._flag_update_block = False
 
-    @abstractmethod
     def _update_state(self):
+        if not self._is_state_changed():
+            return None
+        response = self._get()
+        self._apply_state(response)
+        return response
+
+    async def _aupdate_state(self):
+        if not self._is_state_changed():
+            return None
+        response = await self._aget()
+        self._apply_state(response)
+        return response
+
+    async def aupdate(self):
+        self._metadata_hash = None
+        await self._aupdate_state()
+        return self
+
+    def _is_state_changed(self) -> bool:
         new_hash = zlib.adler32(str(dict(self._metadata)).encode("utf-8"))
         if self._metadata_hash == new_hash or self._flag_update_block:
-            return None
+            return False
         self._metadata_hash = new_hash
-        return self._get()
+        return True
+
+    @abstractmethod
+    def _apply_state(self, response: Dict):
+        ...
 
     def _get(self):
+        query_url, params, data = self._make_query()
+        return self._process_response(self._connector.post(url=query_url, params=params, data=data))
+
+    async def _aget(self):
+        query_url, params, data = self._make_query()
+        return self._process_response(await self._connector.apost(url=query_url, params=params, data=data))
+
+    def _make_query(self):
         data = dict(self._metadata)
 
         if self._metadata.action == Actions.get_episodes:
@@ -192,10 +226,14 @@ class BaseMovie(Generic[QueryData], ABC):
 
         params = {"t": int(time.time() * 1000)}
         query_url = f"{self._connector.url}/ajax/get_cdn_series/"
-        response = self._connector.post(url=query_url, params=params, data=data)
+        return query_url, params, data
 
+    @staticmethod
+    def _process_response(response):
         if 200 < response.status_code >= 300:
-            raise LoadingError(f"Status code = {response.status_code}, {response.reason}")
+            # `requests` and `httpx` responses name the status message differently
+            reason = getattr(response, "reason", None) or getattr(response, "reason_phrase", None)
+            raise LoadingError(f"Status code = {response.status_code}, {reason}")
 
         json_response = response.json()
         if not json_response["success"]:
@@ -27,13 +27,9 @@ class Film(BaseMovie[MovieQueryData]):
         self._metadata.is_director = translate.is_director
         return super()._update_translate(translate)
 
-    def _update_state(self):
-        response = super()._update_state()
-        if not response:
-            return None
+    def _apply_state(self, response: Dict):
         self._url_dict = movie_player_builder.PlayerBuilder.decode_video_urls(response["url"])
         self._subtitle_list = movie_player_builder.PlayerBuilder.make_subtitles_list(response)
-        return response
 
 
 class Serial(BaseMovie[SerialQueryData]):
@@ -315,10 +311,7 @@ class Serial(BaseMovie[SerialQueryData]):
             self.set_params(season_id=old_season, episode_id=old_episode)
         return self
 
-    def _update_state(self):
-        response = super()._update_state()
-        if not response:
-            return None
+    def _apply_state(self, response: Dict):
         self._url_dict = movie_player_builder.PlayerBuilder.decode_video_urls(response["url"])
         self._subtitle_list = movie_player_builder.PlayerBuilder.make_subtitles_list(response)
 
@@ -329,4 +322,3 @@ class Serial(BaseMovie[SerialQueryData]):
             self._metadata.season = self.seasons_tabs[0].id
             self._metadata.episode = self.seasons_tabs[0].episodes[0].id
             self._metadata_hash = zlib.adler32(str(dict(self._metadata)).encode("utf-8"))
-        return response
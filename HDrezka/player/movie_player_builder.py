@@ -1,13 +1,23 @@
 from __future__ import annotations
 
-import base64
+import binascii
 import json
+import os
 import re
-from typing import Union, List, Dict, Tuple, TYPE_CHECKING
+from typing import Union, List, Dict, Optional, Tuple, Iterable, TYPE_CHECKING
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+from lxml import etree
 
-from HDrezka.html_representation import PageRepresentation
+from HDrezka.html_representation import (
+    HTMLDocument,
+    PageRepresentation,
+    ParserBackend,
+    find_element,
+    find_elements,
+    element_text,
+    next_node_text,
+)
 from HDrezka.trailer import Trailer
 from . import entities
 from .construct_types import (
@@ -31,9 +41,16 @@ TRASH_LIST = (
     "//_//IyMjI14hISMjIUBA",
     "//_//JCQjISFAIyFAIyM=",
 )
+TRASH_REGEX = re.compile("|".join(map(re.escape, TRASH_LIST)))
+# Все мусорные вставки начинаются с общего префикса, по нему быстро проверяется, остался ли мусор в строке
+TRASH_PREFIX = os.path.commonprefix(TRASH_LIST)
+QUALITY_REGEX = re.compile(r"\[.*?]")
+URL_SEPARATOR_REGEX = re.compile(r"\sor\s")
 
 
 class PlayerBuilder(PageRepresentation):
+    lean = True
+
     def extract_content(self) -> Union[Serial, Film, Trailer, None]:
         movie_type, *movie_params = self.extract_init_params()
 
@@ -43,7 +60,7 @@ class PlayerBuilder(PageRepresentation):
         if movie_type == "initCDNSeriesEvents":
             # movie_params -> movie_id, translator_id, season_id, episode_id, url, web_host, is_logged, player_info
             return self.extract_series(movie_params)  # Сериал
-        if movie_type is None and self.page.soup.find("iframe", src=re.compile("youtube")):
+        if movie_type is None and self.has_trailer():
             return self.extract_trailer()  # Трейлер
         if movie_type is None:
             return None  # Movie unavailable: "Мы работаем над восстановлением. Часть данных уже доступна для просмотра"
@@ -58,9 +75,14 @@ class PlayerBuilder(PageRepresentation):
             r"sof\.tv\.(.*?)\((\d+), (\d+), (\d+), (\d+), (\d+|false"
             r"|true), '(.*?)', (false|true), ({\".*?\":.*?})\);"
         )
-        match = re.search(regex, self.page.html)
+        # В облегчённом режиме текст страницы не хранится, но скрипты плеера уже извлечены при разборе
+        source = self.page.html if self.page.scripts is None else "\n".join(self.page.scripts)
+        match = re.search(regex, source)
         return match.groups() if match else (None,)
 
+    def has_trailer(self) -> bool:
+        return self.page.soup.find("iframe", src=re.compile("youtube")) is not None
+
     def extract_favs(self) -> str:
         return self.page.soup.find("input", id="ctrl_favs").attrs.get("value")
 
@@ -126,22 +148,7 @@ class PlayerBuilder(PageRepresentation):
         )
 
     def extract_translators(self, metadata: QueryData = None) -> List[Translator]:
-        voice_overs = []
-        for item in self.page.soup.find_all("li", class_="b-translator__item"):
-            original_title_tag = item.find(string=True, recursive=False)
-            original_title = original_title_tag.strip() if original_title_tag and original_title_tag.strip() else None
-            voice_overs.append(
-                Translator(
-                    id=int(item["data-translator_id"]),
-                    title=item.text.strip() or UNKNOWN_TRANSLATE,
-                    original_title=original_title if original_title else UNKNOWN_TRANSLATE,
-                    flag_url=item.img["src"].strip() if item.img else None,
-                    premium=any(i == "b-prem_translator" for i in item["class"]),
-                    is_camrip=item.attrs.get("data-camrip") == "1" if "data-camrip" in item.attrs else None,
-                    is_abs=item.attrs.get("data-ads") == "1" if "data-ads" in item.attrs else None,
-                    is_director=item.attrs.get("data-director") == "1" if "data-director" in item.attrs else None,
-                )
-            )
+        voice_overs = self.extract_voice_overs()
 
         # В случае если у фильма/сериала только одна озвучка,
         # она не будет отображаться и её надо извлечь другим способом
@@ -153,8 +160,8 @@ class PlayerBuilder(PageRepresentation):
             if metadata.id in (376, 111):
                 title = "HDrezka Studio"
             else:
-                translator = self.page.soup.find("h2", string="В переводе")
-                title = translator.find_next().text.strip() if translator else UNKNOWN_TRANSLATE
+                title = self.extract_translator_title()
+                title = title if title is not None else UNKNOWN_TRANSLATE
             original_title = title.replace("(режиссёрская версия)", "").strip() if is_director else title
 
             voice_overs.append(
@@ -172,20 +179,32 @@ class PlayerBuilder(PageRepresentation):
             )
         return voice_overs
 
-    def extract_rg_stats(self, translate_list: List[Translator]) -> Dict[str, float]:
-        popularity_dict = {}
-        rg_stats_obj = self.page.soup.find(class_="b-rgstats__help")
-        if not rg_stats_obj or "title" not in rg_stats_obj.attrs:
-            return popularity_dict
-        soup = BeautifulSoup(rg_stats_obj["title"], "lxml")
-        for item in soup.select("li.b-rgstats__list_item"):
-            title = item.find("div", class_="title").get_text(strip=True)
-            image = item.find("img")
-            image_url = f"https://static.hdrezka.ac{image['src'].strip()}" if image else None
-            popularity = float(
-                item.find("div", class_="count").text.replace("%", "").replace(",", ".").replace(" ", "")
+    def extract_voice_overs(self) -> List[Translator]:
+        voice_overs = []
+        for item in self.page.soup.find_all("li", class_="b-translator__item"):
+            original_title_tag = item.find(string=True, recursive=False)
+            original_title = original_title_tag.strip() if original_title_tag and original_title_tag.strip() else None
+            voice_overs.append(
+                Translator(
+                    id=int(item["data-translator_id"]),
+                    title=item.text.strip() or UNKNOWN_TRANSLATE,
+                    original_title=original_title if original_title else UNKNOWN_TRANSLATE,
+                    flag_url=item.img["src"].strip() if item.img else None,
+                    premium=any(i == "b-prem_translator" for i in item["class"]),
+                    is_camrip=item.attrs.get("data-camrip") == "1" if "data-camrip" in item.attrs else None,
+                    is_abs=item.attrs.get("data-ads") == "1" if "data-ads" in item.attrs else None,
+                    is_director=item.attrs.get("data-director") == "1" if "data-director" in item.attrs else None,
+                )
             )
+        return voice_overs
 
+    def extract_translator_title(self) -> Optional[str]:
+        translator = self.page.soup.find("h2", string="В переводе")
+        return translator.find_next().text.strip() if translator else None
+
+    def extract_rg_stats(self, translate_list: List[Translator]) -> Dict[str, float]:
+        popularity_dict = {}
+        for title, image_url, popularity in self.extract_rg_items():
             matched = [t for t in translate_list if t.original_title == title]
             if len(matched) > 1 and image_url:
                 matched = [t for t in matched if t.flag_url == image_url]
@@ -193,24 +212,56 @@ class PlayerBuilder(PageRepresentation):
                 popularity_dict[matched[0].full_title] = popularity
         return popularity_dict
 
+    def extract_rg_items(self) -> List[Tuple[str, Optional[str], float]]:
+        """
+        :return: The title, the flag URL and the popularity of every voice-over in the statistics of the page.
+        """
+        rg_stats_obj = self.page.soup.find(class_="b-rgstats__help")
+        if not rg_stats_obj or "title" not in rg_stats_obj.attrs:
+            return []
+        items = []
+        soup = BeautifulSoup(rg_stats_obj["title"], "lxml")
+        for item in soup.select("li.b-rgstats__list_item"):
+            image = item.find("img")
+            items.append((
+                item.find("div", class_="title").get_text(strip=True),
+                f"https://static.hdrezka.ac{image['src'].strip()}" if image else None,
+                self.parse_popularity(item.find("div", class_="count").text),
+            ))
+        return items
+
+    @staticmethod
+    def parse_popularity(count: str) -> float:
+        return float(count.replace("%", "").replace(",", ".").replace(" ", ""))
+
     @staticmethod
     def decode_video_urls(encoded_string: Union[str, False]) -> Dict[str, List[str]]:
         if encoded_string is False:
             return {}
 
-        # Удаляем мусор из закодированной строки
-        while any(substring in encoded_string for substring in TRASH_LIST):
-            encoded_string = re.sub("|".join(map(re.escape, TRASH_LIST)), "", encoded_string)
+        # Удаляем мусор из закодированной строки. Обычно хватает одного прохода, повторный нужен,
+        # только если после удаления вставок из оставшихся частей сложилась новая
+        encoded_string, count = TRASH_REGEX.subn("", encoded_string)
+        while count and TRASH_PREFIX in encoded_string:
+            encoded_string, count = TRASH_REGEX.subn("", encoded_string)
 
-        decoded_string = base64.b64decode(encoded_string.replace("#h", "", 1)).decode("utf-8")
+        decoded_string = binascii.a2b_base64(encoded_string.replace("#h", "", 1)).decode("utf-8")
         urls_container = {}
         for line in decoded_string.split(","):
-            quality_name = re.search(r"\[.*?]", line)[0]
-            quality_urls = line[len(quality_name):]
-            filtered_urls = [url for url in re.split(r"\sor\s", quality_urls) if re.match(r"https?://.*\.mp4$", url)]
-            urls_container[quality_name[1:-1]] = filtered_urls
+            quality_name = QUALITY_REGEX.search(line)[0]
+            urls_container[quality_name[1:-1]] = [
+                url for url in URL_SEPARATOR_REGEX.split(line[len(quality_name):]) if PlayerBuilder._is_mp4_url(url)
+            ]
         return urls_container
 
+    @staticmethod
+    def _is_mp4_url(url: str) -> bool:
+        # То же, что re.match(r"https?://.*\.mp4$", url), но без регулярного выражения:
+        # "$" допускает один перевод строки в конце, а "." не совпадает с переводом строки
+        if url.endswith("\n"):
+            url = url[:-1]
+        return url.startswith(("http://", "https://")) and url.endswith(".mp4") and "\n" not in url
+
     @staticmethod
     def make_subtitles_list(subtitle_data: Dict[str, Union[False, str, Dict[str, str]]]) -> List[Subtitle]:
         if not subtitle_data["subtitle"]:
@@ -227,12 +278,14 @@ class PlayerBuilder(PageRepresentation):
         ]
 
     def extract_seasons_tabs(self):
-        seasons = "".join(map(str, self.page.soup.find_all("li", class_="b-simple_season__item")))
-        episodes = "".join(map(str, self.page.soup.find_all("ul", class_="b-simple_episodes__list")))
+        seasons = self.page.soup.find_all("li", class_="b-simple_season__item")
+        episodes = self.page.soup.find_all("ul", class_="b-simple_episodes__list")
         return self.create_seasons_tabs_from_data(seasons, episodes)
 
     @staticmethod
-    def create_seasons_tabs_from_data(seasons: str, episodes: str) -> List[Season]:
+    def create_seasons_tabs_from_data(
+            seasons: Union[str, Iterable[Tag]], episodes: Union[str, Iterable[Tag]]
+    ) -> List[Season]:
         seasons_list = PlayerBuilder.make_seasons_list(seasons)
         episodes_lists = PlayerBuilder.make_episodes_lists(episodes)
         for season in seasons_list:
@@ -240,18 +293,23 @@ class PlayerBuilder(PageRepresentation):
         return seasons_list
 
     @staticmethod
-    def make_seasons_list(seasons_string: str) -> List[Season]:
-        soup = BeautifulSoup(seasons_string, "lxml")
-        seasons_list = []
-        for s in soup.find_all(class_="b-simple_season__item"):
-            seasons_list.append(Season(id=int(s["data-tab_id"]), title=s.next.get_text(strip=True)))
-        return seasons_list
+    def make_seasons_list(seasons: Union[str, Iterable[Tag]]) -> List[Season]:
+        """
+        :param seasons: The HTML code of the seasons from the server response or the already parsed seasons.
+        """
+        if isinstance(seasons, str):
+            seasons = BeautifulSoup(seasons, "lxml").find_all(class_="b-simple_season__item")
+        return [Season(id=int(s["data-tab_id"]), title=s.next.get_text(strip=True)) for s in seasons]
 
     @staticmethod
-    def make_episodes_lists(episodes_string: str) -> Dict[int, List[Episode]]:
-        soup = BeautifulSoup(episodes_string, "lxml")
+    def make_episodes_lists(episodes: Union[str, Iterable[Tag]]) -> Dict[int, List[Episode]]:
+        """
+        :param episodes: The HTML code of the episodes lists from the server response or the already parsed lists.
+        """
+        if isinstance(episodes, str):
+            episodes = BeautifulSoup(episodes, "lxml").find_all("ul", class_="b-simple_episodes__list")
         episodes_lists = {}
-        for episodes_list in soup.find_all("ul", class_="b-simple_episodes__list"):
+        for episodes_list in episodes:
             for e in episodes_list.find_all("li", class_="b-simple_episode__item"):
                 season_id = int(e["data-season_id"])
                 if season_id not in episodes_lists:
@@ -266,3 +324,102 @@ class PlayerBuilder(PageRepresentation):
 
     def __repr__(self):
         return f"<{self.__class__.__name__}>"
+
+
+class LXMLPlayerBuilder(PlayerBuilder, backend=ParserBackend.lxml):
+    _youtube_iframe = etree.XPath('descendant::iframe[contains(@src, "youtube")][1]')
+    _next_link = etree.XPath("(descendant::a | following::a)[1]")
+    _next_element = etree.XPath("following::*[1]")
+    _first_string = etree.XPath("text()[1]")
+
+    def has_trailer(self) -> bool:
+        return bool(self._youtube_iframe(self.page.tree))
+
+    def extract_favs(self) -> str:
+        return find_element(self.page.tree, "input", id="ctrl_favs").get("value")
+
+    def extract_trailer(self) -> Trailer:
+        regexp_year = re.compile("Год|Дата выхода")
+
+        site_url = find_element(self.page.tree, "meta", property="og:url").get("content")
+        trailer_id = int(re.search(r"/(\d*)-", site_url).group(1))
+        title = element_text(find_element(self.page.tree, "div", "b-post__title"), strip=True)
+        original_title = find_element(self.page.tree, "div", "b-post__origtitle")
+        year_element = self.find_by_string("h2", regexp_year)
+        if year_element is None:
+            year_element = self.find_by_string("td", regexp_year)
+        year = element_text(self._next_link(year_element)[0], strip=True)
+        description = find_element(self.page.tree, "div", "b-post__description_text")
+        trailer_url = self._youtube_iframe(self.page.tree)[0].get("src")
+
+        return Trailer(
+            id=trailer_id,
+            title=title,
+            original_title=element_text(original_title, strip=True) if original_title is not None else None,
+            release_year=int(re.search(r"\d{4}", year).group(0)),
+            description=element_text(description, strip=True) if description is not None else None,
+            trailer_url=trailer_url,
+            url=site_url,
+        )
+
+    def find_by_string(self, tag: str, pattern: re.Pattern) -> Optional[etree.ElementBase]:
+        """
+        :return: The first element whose only child is a string matching the pattern, as `find(tag, string=pattern)`.
+        """
+        for element in find_elements(self.page.tree, tag):
+            if len(element) == 0 and element.text is not None and pattern.search(element.text):
+                return element
+        return None
+
+    def extract_voice_overs(self) -> List[Translator]:
+        voice_overs = []
+        for item in find_elements(self.page.tree, "li", "b-translator__item"):
+            original_title_tag = self._first_string(item)
+            original_title = original_title_tag[0].strip() if original_title_tag else None
+            image = find_element(item, "img")
+            voice_overs.append(
+                Translator(
+                    id=int(item.get("data-translator_id")),
+                    title=element_text(item).strip() or UNKNOWN_TRANSLATE,
+                    original_title=original_title if original_title else UNKNOWN_TRANSLATE,
+                    flag_url=image.get("src").strip() if image is not None else None,
+                    premium="b-prem_translator" in item.get("class", "").split(),
+                    is_camrip=item.get("data-camrip") == "1" if "data-camrip" in item.attrib else None,
+                    is_abs=item.get("data-ads") == "1" if "data-ads" in item.attrib else None,
+                    is_director=item.get("data-director") == "1" if "data-director" in item.attrib else None,
+                )
+            )
+        return voice_overs
+
+    def extract_translator_title(self) -> Optional[str]:
+        translator = self.find_by_string("h2", re.compile("^В переводе$"))
+        return element_text(self._next_element(translator)[0]).strip() if translator is not None else None
+
+    def extract_rg_items(self) -> List[Tuple[str, Optional[str], float]]:
+        rg_stats_obj = find_element(self.page.tree, class_="b-rgstats__help")
+        if rg_stats_obj is None or rg_stats_obj.get("title") is None:
+            return []
+        items = []
+        tree = HTMLDocument(rg_stats_obj.get("title"), backend=ParserBackend.lxml).tree
+        for item in find_elements(tree, "li", "b-rgstats__list_item"):
+            image = find_element(item, "img")
+            items.append((
+                element_text(find_element(item, "div", "title"), strip=True),
+                f"https://static.hdrezka.ac{image.get('src').strip()}" if image is not None else None,
+                self.parse_popularity(element_text(find_element(item, "div", "count"))),
+            ))
+        return items
+
+    def extract_seasons_tabs(self) -> List[Season]:
+        episodes_lists = {}
+        for episodes_list in find_elements(self.page.tree, "ul", "b-simple_episodes__list"):
+            for e in find_elements(episodes_list, "li", "b-simple_episode__item"):
+                episodes_lists.setdefault(int(e.get("data-season_id")), []).append(
+                    Episode(id=int(e.get("data-episode_id")), title=next_node_text(e, strip=True))
+                )
+        seasons_list = []
+        for s in find_elements(self.page.tree, "li", "b-simple_season__item"):
+            season = Season(id=int(s.get("data-tab_id")), title=next_node_text(s, strip=True))
+            season.episodes = episodes_lists[season.id]
+            seasons_list.append(season)
+        return seasons_list
@@ -8,7 +8,7 @@ from . import movie_posters
 from .comments import CommentsIterator
 from .connector import NetworkClient
 from .exceptions import EmptyPage, PageNotFound
-from .html_representation import PageRepresentation
+from .html_representation import PageRepresentation, ParserBackend, find_element, find_elements, element_text
 
 if TYPE_CHECKING:
     from .movie_posters import Poster
@@ -29,7 +29,10 @@ class Question:
     def get(self):
         if self.url is None:
             raise PageNotFound("No correct URL was found for the request")
-        return movie_posters.PosterBuilder(NetworkClient().get(self.url).text).extract_content()
+        connector = NetworkClient()
+        response = connector.get_page(self.url)
+        with connector.measure("parse", self.url):
+            return movie_posters.PosterBuilder(response).extract_content()
 
     def __repr__(self):
         return f"<Question({self.title})>"
@@ -52,7 +55,9 @@ class QuestionsBuilder(PageRepresentation):
 
     def extract_recommendations(self) -> List["Poster"]:
         recommendations = self.page.soup.find("div", class_="b-sidelist")
-        return movie_posters.PosterBuilder(str(recommendations)).extract_content()
+        if recommendations is None:
+            raise EmptyPage("No Posters were found on the page")
+        return movie_posters.PosterBuilder(recommendations).extract_content()
 
     def extract_image(self):
         image = self.page.soup.find("div", class_="b-qa__entity_text clearfix").find("img")
@@ -86,7 +91,10 @@ class QuestionBanner:
     url: str = None
 
     def get(self):
-        return QuestionsBuilder(NetworkClient().get(self.url).text).extract_content()
+        connector = NetworkClient()
+        response = connector.get_page(self.url)
+        with connector.measure("parse", self.url):
+            return QuestionsBuilder(response).extract_content()
 
     def __repr__(self):
         return f"<QuestionBriefInfo({self.title})>"
@@ -106,3 +114,19 @@ class QuestionsBannerBuilder(PageRepresentation):
         if not result_list:
             raise EmptyPage("No frequently asked questions found on the page")
         return result_list
+
+
+class LXMLQuestionsBannerBuilder(QuestionsBannerBuilder, backend=ParserBackend.lxml):
+    def extract_content(self) -> List[QuestionBanner]:
+        result_list = []
+        for item in find_elements(self.page.tree, "li", "b-post__qa_list_item"):
+            question = QuestionBanner()
+            question.url = find_element(item, "a").get("href").strip()
+            question.id = int(re.search(r"(\d+)\.html$", question.url).group(1))
+            question.title = element_text(find_element(item, "div", "title")).strip()
+            question.img_url = find_element(find_element(item, "div", "cycle"), "img").get("src").strip()
+            result_list.append(question)
+
+        if not result_list:
+            raise EmptyPage("No frequently asked questions found on the page")
+        return result_list
@@ -14,6 +14,7 @@ from .filters import (
     GenreSeries,
 )
 from .franchise import FranchiseBanner, FranchiseBannerBuilder
+from .html_representation import HTMLDocument
 from .movie_collections import MovieCollectionBuilder, MovieCollection
 from .movie_posters import PosterBuilder, Poster
 from .questions_asked import QuestionsBannerBuilder, QuestionBanner
@@ -26,6 +27,8 @@ class BaseMovieCategory(BaseSiteNavigation[List[Poster]], ABC):
     This class represents a base movie category for site navigation and search.
     """
 
+    _subtrees = PosterBuilder.subtrees
+
     def __init__(self):
         super().__init__()
         self._genre = Genre()
@@ -44,8 +47,8 @@ class BaseMovieCategory(BaseSiteNavigation[List[Poster]], ABC):
     def find_best(self):
         ...
 
-    def get(self) -> List[Poster]:
-        return PosterBuilder(super().get()).extract_content()
+    def _extract_content(self, page: HTMLDocument) -> List[Poster]:
+        return PosterBuilder(page).extract_content()
 
     def __str__(self):
         name = f"{self._name}/" if self._name else ""
@@ -54,6 +57,7 @@ class BaseMovieCategory(BaseSiteNavigation[List[Poster]], ABC):
 
 class Best(BaseSiteNavigation[List[Poster]]):
     _name = "best"
+    _subtrees = PosterBuilder.subtrees
 
     def __init__(self, name: str):
         super().__init__()
@@ -71,8 +75,8 @@ class Best(BaseSiteNavigation[List[Poster]]):
         self._year.year = year
         return self
 
-    def get(self) -> List[Poster]:
-        return PosterBuilder(super().get()).extract_content()
+    def _extract_content(self, page: HTMLDocument) -> List[Poster]:
+        return PosterBuilder(page).extract_content()
 
     def __str__(self):
         page = PageIterator.__str__(self)
@@ -91,7 +95,7 @@ class Films(BaseMovieCategory):
         genre: Optional[Union[GenreFilm, str]] = None,
         year: Optional[int] = None,
     ):
-        return Best(self._name).select(genre=genre, year=year)
+        return Best(self._name).use_client(self._client).select(genre=genre, year=year)
 
 
 class Cartoons(BaseMovieCategory):
@@ -106,7 +110,7 @@ class Cartoons(BaseMovieCategory):
         genre: Optional[Union[GenreCartoons, str]] = None,
         year: Optional[int] = None,
     ):
-        return Best(self._name).select(genre=genre, year=year)
+        return Best(self._name).use_client(self._client).select(genre=genre, year=year)
 
 
 class Series(BaseMovieCategory):
@@ -121,7 +125,7 @@ class Series(BaseMovieCategory):
         genre: Optional[Union[GenreSeries, str]] = None,
         year: Optional[int] = None,
     ):
-        return Best(self._name).select(genre=genre, year=year)
+        return Best(self._name).use_client(self._client).select(genre=genre, year=year)
 
 
 class Animation(BaseMovieCategory):
@@ -136,11 +140,12 @@ class Animation(BaseMovieCategory):
         genre: Optional[Union[GenreAnimation, str]] = None,
         year: Optional[int] = None,
     ):
-        return Best(self._name).select(genre=genre, year=year)
+        return Best(self._name).use_client(self._client).select(genre=genre, year=year)
 
 
 class New(BaseSiteNavigation[List[Poster]]):
     _name = "new"
+    _subtrees = PosterBuilder.subtrees
 
     def __init__(self):
         super().__init__()
@@ -154,8 +159,8 @@ class New(BaseSiteNavigation[List[Poster]]):
         self._query.show_only(pattern)
         return self
 
-    def get(self) -> List[Poster]:
-        return PosterBuilder(super().get()).extract_content()
+    def _extract_content(self, page: HTMLDocument) -> List[Poster]:
+        return PosterBuilder(page).extract_content()
 
     def __str__(self):
         return f"{super().__str__()}{self._query}"
@@ -163,20 +168,22 @@ class New(BaseSiteNavigation[List[Poster]]):
 
 class Announce(BaseSiteNavigation[List[Poster]]):
     _name = "announce"
+    _subtrees = PosterBuilder.subtrees
 
-    def get(self) -> List[Poster]:
-        return PosterBuilder(super().get()).extract_content()
+    def _extract_content(self, page: HTMLDocument) -> List[Poster]:
+        return PosterBuilder(page).extract_content()
 
 
 class Collections(BaseSiteNavigation[List[MovieCollection]]):
     _name = "collections"
 
-    def get(self) -> List[MovieCollection]:
-        return MovieCollectionBuilder(super().get()).extract_content()
+    def _extract_content(self, page: HTMLDocument) -> List[MovieCollection]:
+        return MovieCollectionBuilder(page).extract_content()
 
 
 class Search(BaseSiteNavigation[List[Poster]]):
     _name = "search"
+    _subtrees = PosterBuilder.subtrees
 
     def __init__(self):
         super().__init__()
@@ -189,8 +196,8 @@ class Search(BaseSiteNavigation[List[Poster]]):
         self._search_text = f"?do=search&subaction=search&q={process_text}"
         return self
 
-    def get(self) -> List[Poster]:
-        return PosterBuilder(super().get()).extract_content()
+    def _extract_content(self, page: HTMLDocument) -> List[Poster]:
+        return PosterBuilder(page).extract_content()
 
     def __str__(self):
         page = f"&page={self.current_page}" if self.current_page > 1 else ""
@@ -201,12 +208,12 @@ class Search(BaseSiteNavigation[List[Poster]]):
 class QuestionsAsked(BaseSiteNavigation[List[QuestionBanner]]):
     _name = "qa"
 
-    def get(self) -> List[QuestionBanner]:
-        return QuestionsBannerBuilder(super().get()).extract_content()
+    def _extract_content(self, page: HTMLDocument) -> List[QuestionBanner]:
+        return QuestionsBannerBuilder(page).extract_content()
 
 
 class Franchises(BaseSiteNavigation[List[FranchiseBanner]]):
     _name = "franchises"
 
-    def get(self) -> List[FranchiseBanner]:
-        return FranchiseBannerBuilder(super().get()).extract_content()
+    def _extract_content(self, page: HTMLDocument) -> List[FranchiseBanner]:
+        return FranchiseBannerBuilder(page).extract_content()
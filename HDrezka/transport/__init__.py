@@ -0,0 +1,29 @@
+from . import cache
+from . import circuit_breaker
+from . import endpoints
+from . import metrics
+from . import mirrors
+from . import proxies
+from . import rate_limit
+from . import replay
+from . import retry
+from . import routing
+from . import single_flight
+from .cache import ResponseCache, CachedResponse, CacheBackend, MemoryCache, SQLiteCache, CacheStatistics
+from .circuit_breaker import CircuitBreaker, CircuitState, Circuit
+from .endpoints import EndpointType, determine_endpoint_type, make_request_key
+from .metrics import (
+    Instrumentation,
+    RequestRecord,
+    PhaseTracer,
+    PrometheusExporter,
+    SpanExporter,
+    JSONLinesExporter,
+)
+from .mirrors import MirrorPool, MirrorState
+from .proxies import ProxyPool, ProxyState
+from .rate_limit import TokenBucket, EndpointLimit, RequestGovernor, GovernorStatistics, InFlightSlot
+from .replay import ReplayArchive, ReplayEntry, ThrottledStream
+from .retry import RetryPolicy, RetryStatistics
+from .routing import EndpointRouter, Route
+from .single_flight import SingleFlight, SingleFlightStatistics
@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional, TypeVar, Union
+from urllib.parse import urlsplit
+
+from .endpoints import VOLATILE_PARAMS, EndpointType, determine_endpoint_type, make_request_key
+from .retry import IDEMPOTENT_POST_PATHS
+from ..utility import URLsType, determine_url_type
+
+ResponseType = TypeVar("ResponseType")
+
+DEFAULT_TTL: Dict[Union[URLsType, EndpointType], float] = {
+    URLsType.main: 300,
+    URLsType.poster: 300,
+    URLsType.movie: 3600,
+    URLsType.collections: 3600,
+    URLsType.qa: 3600,
+    URLsType.qa_info: 3600,
+    URLsType.franchises: 3600,
+    URLsType.franchises_info: 86400,
+    URLsType.person_info: 86400,
+    EndpointType.comments: 300,
+    EndpointType.ajax: 3600,
+    EndpointType.static: 86400,
+}
+# Заголовки, которые описывают тело в том виде, в котором оно передавалось по сети, а не декодированное содержимое
+TRANSFER_HEADERS = frozenset(("content-encoding", "content-length", "transfer-encoding", "connection"))
+# Эндпоинты, ответы которых меняются при каждом запросе (ссылки на видеопоток подписаны и быстро истекают)
+BYPASS_PATHS = ("/ajax/get_cdn_series/",)
+
+
+@dataclass
+class CachedResponse:
+    """
+    A response stored in the cache.
+
+    Attributes:
+        url: The URL of the response.
+        status_code: The status code of the response.
+        headers: The headers of the response.
+        content: The body of the response.
+        encoding: The encoding of the body, if it is known.
+        stored_at: The time the response was received, in seconds since the epoch.
+        expires_at: The time after which the response has to be revalidated, in seconds since the epoch.
+    """
+
+    url: str
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    content: bytes = b""
+    encoding: Optional[str] = None
+    stored_at: float = 0.0
+    expires_at: float = 0.0
+
+    @classmethod
+    def from_response(cls, response: Any, ttl: float) -> CachedResponse:
+        now = time.time()
+        return cls(
+            url=str(response.url),
+            status_code=response.status_code,
+            headers={k: v for k, v in response.headers.items() if k.lower() not in TRANSFER_HEADERS},
+            content=response.content,
+            encoding=response.encoding,
+            stored_at=now,
+            expires_at=now + ttl,
+        )
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def get_validators(self) -> Dict[str, str]:
+        """
+        :return: The conditional request headers built from the ETag and Last-Modified headers of the response.
+        """
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        validators = {}
+        if "etag" in headers:
+            validators["If-None-Match"] = headers["etag"]
+        if "last-modified" in headers:
+            validators["If-Modified-Since"] = headers["last-modified"]
+        return validators
+
+
+class CacheBackend(ABC):
+    """
+    Abstract storage of cached responses.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Abstract implementation of reading an entry
+        """
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedResponse):
+        """
+        Abstract implementation of writing an entry
+        """
+
+    @abstractmethod
+    def delete(self, key: str):
+        """
+        Abstract implementation of deleting an entry
+        """
+
+    @abstractmethod
+    def clear(self):
+        """
+        Abstract implementation of deleting all entries
+        """
+
+
+class MemoryCache(CacheBackend):
+    """
+    A thread-safe in-memory LRU storage.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize a new instance of the class.
+
+        :param maxsize: The maximum number of stored responses, the least recently used ones are evicted first.
+        """
+        if maxsize < 1:
+            raise ValueError(f'Attribute "maxsize" must be greater than 0, received "{maxsize}".')
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    A storage in an SQLite database, which keeps the responses between runs.
+    """
+
+    def __init__(self, path: str = "hdrezka_cache.sqlite"):
+        """
+        Initialize a new instance of the class.
+
+        :param path: The path to the database file, ":memory:" creates a temporary database.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, url TEXT, status_code INTEGER, headers TEXT, content BLOB, "
+                "encoding TEXT, stored_at REAL, expires_at REAL)"
+            )
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url, status_code, headers, content, encoding, stored_at, expires_at "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        url, status_code, headers, content, encoding, stored_at, expires_at = row
+        return CachedResponse(url, status_code, json.loads(headers), content, encoding, stored_at, expires_at)
+
+    def set(self, key: str, entry: CachedResponse):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.url,
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    entry.content,
+                    entry.encoding,
+                    entry.stored_at,
+                    entry.expires_at,
+                ),
+            )
+
+    def delete(self, key: str):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def purge(self, older_than: float = 0):
+        """
+        Deletes the expired responses.
+
+        :param older_than: How many seconds ago the responses must have expired.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses WHERE expires_at < ?", (time.time() - older_than,))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class CacheStatistics:
+    """
+    Thread-safe counters of a `ResponseCache`.
+
+    Attributes:
+        hits: The number of requests served from the cache without a network round-trip.
+        misses: The number of cacheable requests sent to the network.
+        revalidated: The number of stale responses confirmed by the server with "304 Not Modified".
+        stores: The number of responses written to the cache.
+        bypassed: The number of requests that were not cacheable.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stores = 0
+        self.bypassed = 0
+
+    def record(self, **increments: int):
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "stores": self.stores,
+                "bypassed": self.bypassed,
+            }
+
+    def __repr__(self):
+        return f"<CacheStatistics(hits={self.hits}, misses={self.misses})>"
+
+
+class ResponseCache:
+    """
+    A response cache with per-URL-type lifetimes and conditional revalidation.
+
+    Successful responses to GET requests and to POST requests of the read-only AJAX endpoints are stored
+    under a key made of the method, the URL, the query parameters and the body. The lifetime of a response
+    depends on the type of the URL: `URLsType` of `determine_url_type` for the pages of the site and
+    `EndpointType` for AJAX endpoints and static files; types without a lifetime, streamed requests and
+    `bypass_paths` are never cached. When a stored response expires and has an ETag or Last-Modified header,
+    the request is sent with If-None-Match/If-Modified-Since and a "304 Not Modified" answer refreshes it.
+
+    Usage::
+
+        >>> from HDrezka.connector import NetworkClient
+        >>> from HDrezka.transport import ResponseCache, SQLiteCache
+        >>> from HDrezka.utility import URLsType
+        >>>
+        >>> NetworkClient().cache = ResponseCache(SQLiteCache("rezka.sqlite"), ttl={URLsType.movie: 86400})
+    """
+
+    def __init__(
+            self,
+            backend: Optional[CacheBackend] = None,
+            ttl: Optional[Mapping[Union[URLsType, EndpointType], float]] = None,
+            bypass_paths: Iterable[str] = BYPASS_PATHS,
+            cacheable_post_paths: Iterable[str] = IDEMPOTENT_POST_PATHS,
+    ):
+        """
+        Initialize a new instance of the class.
+
+        :param backend: The storage of the responses, `MemoryCache` by default.
+        :param ttl: The lifetime in seconds for URL and endpoint types, merged with `DEFAULT_TTL`.
+        :param bypass_paths: The URL paths which are never cached.
+        :param cacheable_post_paths: The URL paths for which POST requests are cached.
+        """
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.bypass_paths = tuple(bypass_paths)
+        self.cacheable_post_paths = frozenset(cacheable_post_paths) - frozenset(self.bypass_paths)
+        self.statistics = CacheStatistics()
+
+    @staticmethod
+    def make_key(method: str, url: Union[str, bytes], kwargs: Mapping[str, Any]) -> str:
+        """
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of the request, "params", "data" and "json" are taken into account
+            except the cache-busting `VOLATILE_PARAMS`.
+        :return: The cache key of the request.
+        """
+        return make_request_key(method, url, kwargs, ignored_params=VOLATILE_PARAMS)
+
+    def get_ttl(self, url: Union[str, bytes]) -> float:
+        """
+        :param url: The URL of the request.
+        :return: The lifetime of the response in seconds, 0 means that the response is not cached.
+        """
+        url = url.decode("utf-8") if isinstance(url, bytes) else url
+        endpoint_type = determine_endpoint_type(url)
+        if endpoint_type is EndpointType.page:
+            return self.ttl.get(determine_url_type(url), 0)
+        return self.ttl.get(endpoint_type, 0)
+
+    def is_cacheable(self, method: str, url: Union[str, bytes], kwargs: Mapping[str, Any]) -> bool:
+        url = url.decode("utf-8") if isinstance(url, bytes) else url
+        path = urlsplit(url).path
+        method = method.upper()
+        if kwargs.get("stream") or path.startswith(self.bypass_paths):
+            return False
+        if method != "GET" and not (method == "POST" and path in self.cacheable_post_paths):
+            return False
+        return self.get_ttl(url) > 0
+
+    def _lookup(self, method: str, url: Union[str, bytes], kwargs: Dict[str, Any], get_headers: Callable):
+        key = self.make_key(method, url, kwargs)
+        entry = self.backend.get(key)
+        if entry is not None and entry.is_fresh():
+            self.statistics.record(hits=1)
+            return key, entry, kwargs
+        self.statistics.record(misses=1)
+        validators = entry.get_validators() if entry is not None else {}
+        if validators:
+            headers = kwargs.get("headers")
+            headers = get_headers(url) if headers is None else headers.copy()
+            headers.update(validators)
+            kwargs = {**kwargs, "headers": headers}
+        return key, (entry if validators else None), kwargs
+
+    def _store(self, key: str, url: Union[str, bytes], entry: Optional[CachedResponse], response: Any):
+        if response.status_code == 304 and entry is not None:
+            entry.expires_at = time.time() + self.get_ttl(url)
+            self.backend.set(key, entry)
+            self.statistics.record(revalidated=1)
+            return entry
+        if response.status_code == 200:
+            self.backend.set(key, CachedResponse.from_response(response, self.get_ttl(url)))
+            self.statistics.record(stores=1)
+        return None
+
+    def execute(  # pylint: disable=R0913
+            self,
+            method: str,
+            url: Union[str, bytes],
+            kwargs: Dict[str, Any],
+            send: Callable[[Dict[str, Any]], ResponseType],
+            build: Callable[[CachedResponse], ResponseType],
+            get_headers: Callable[[Union[str, bytes]], Any],
+    ) -> ResponseType:
+        """
+        Returns the cached response or sends the request and stores its response.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of the request.
+        :param send: A function that sends the request with the given keyword arguments.
+        :param build: A function that converts a cached response into a response object of the connector.
+        :param get_headers: A function that returns the default headers for the URL.
+        :return: The cached response or the response of the server.
+        """
+        if not self.is_cacheable(method, url, kwargs):
+            self.statistics.record(bypassed=1)
+            return send(kwargs)
+        key, entry, kwargs = self._lookup(method, url, kwargs, get_headers)
+        if entry is not None and entry.is_fresh():
+            return build(entry)
+        response = send(kwargs)
+        entry = self._store(key, url, entry, response)
+        if entry is not None:
+            response.close()
+            return build(entry)
+        return response
+
+    async def aexecute(  # pylint: disable=R0913
+            self,
+            method: str,
+            url: Union[str, bytes],
+            kwargs: Dict[str, Any],
+            send: Callable[[Dict[str, Any]], Awaitable[ResponseType]],
+            build: Callable[[CachedResponse], ResponseType],
+            get_headers: Callable[[Union[str, bytes]], Any],
+    ) -> ResponseType:
+        """
+        The asynchronous version of `execute`, `send` must return an awaitable.
+        """
+        if not self.is_cacheable(method, url, kwargs):
+            self.statistics.record(bypassed=1)
+            return await send(kwargs)
+        key, entry, kwargs = self._lookup(method, url, kwargs, get_headers)
+        if entry is not None and entry.is_fresh():
+            return build(entry)
+        response = await send(kwargs)
+        entry = self._store(key, url, entry, response)
+        return build(entry) if entry is not None else response
+
+    def __repr__(self):
+        return f"<ResponseCache(backend={type(self.backend).__name__})>"
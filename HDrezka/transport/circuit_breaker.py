@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple, Type, TypeVar, Union
+from urllib.parse import urlsplit
+
+from .retry import RETRY_EXCEPTIONS
+from ..exceptions import CircuitOpenError
+
+ResponseType = TypeVar("ResponseType")
+
+FAILURE_STATUS_CODES = (500, 502, 503, 504, 520, 521, 522, 524)
+
+
+class CircuitState(Enum):
+    """Enumeration class to represent the states of a circuit.
+
+    Attributes:
+        closed: Requests are sent, consecutive failures are counted.
+        open: Requests fail immediately with `CircuitOpenError` until the recovery timeout expires.
+        half_open: A limited number of probe requests is sent to find out whether the endpoint has recovered.
+    """
+
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+@dataclass
+class Circuit:
+    """
+    The state of the circuit of a single host and path.
+
+    Attributes:
+        state: The current state of the circuit.
+        failures: The number of consecutive failed requests.
+        successes: The number of successful probes in the half-open state.
+        probes: The number of probes currently in flight.
+        opened_at: The `time.monotonic()` moment the circuit was opened.
+        rejected: The number of requests rejected while the circuit was open.
+    """
+
+    state: CircuitState = CircuitState.closed
+    failures: int = 0
+    successes: int = 0
+    probes: int = 0
+    opened_at: float = 0.0
+    rejected: int = 0
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an endpoint of the site is down instead of waiting for the timeout of every request.
+
+    Every host and path has its own circuit. After `failure_threshold` consecutive failures (one of `exceptions`
+    or a status from `status_codes`) the circuit opens and requests to it raise `CircuitOpenError`
+    without touching the network. When `recovery_timeout` seconds have passed, the circuit becomes half-open
+    and lets `half_open_max_calls` probe requests through: `success_threshold` successful probes close it,
+    a failed probe opens it again. `CircuitOpenError` is not repeated by `RetryPolicy`.
+
+    Usage::
+
+        >>> from HDrezka.connector import NetworkClient
+        >>> from HDrezka.transport import CircuitBreaker
+        >>>
+        >>> NetworkClient().circuit_breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=20)
+    """
+
+    def __init__(  # pylint: disable=R0913
+            self,
+            *,
+            failure_threshold: int = 5,
+            recovery_timeout: float = 30,
+            half_open_max_calls: int = 1,
+            success_threshold: int = 1,
+            status_codes: Iterable[int] = FAILURE_STATUS_CODES,
+            exceptions: Tuple[Type[BaseException], ...] = RETRY_EXCEPTIONS,
+    ):
+        """
+        Initialize a new instance of the class.
+
+        :param failure_threshold: The number of consecutive failures that opens the circuit.
+        :param recovery_timeout: The number of seconds the circuit stays open before probing.
+        :param half_open_max_calls: The maximum number of probe requests in flight in the half-open state.
+        :param success_threshold: The number of successful probes that closes the circuit.
+        :param status_codes: The status codes which are considered a failure of the endpoint.
+        :param exceptions: The transport exceptions which are considered a failure of the endpoint.
+        """
+        if failure_threshold < 1:
+            raise ValueError(f'Attribute "failure_threshold" must be greater than 0, received "{failure_threshold}".')
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.status_codes = frozenset(status_codes)
+        self.exceptions = exceptions
+        self._circuits: Dict[Tuple[str, str], Circuit] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(url: Union[str, bytes]) -> Tuple[str, str]:
+        """
+        :param url: The URL of the request.
+        :return: The host and the path the circuit of the request belongs to.
+        """
+        url_split = urlsplit(url.decode("utf-8") if isinstance(url, bytes) else url)
+        return url_split.netloc, url_split.path or "/"
+
+    def get_state(self, url: Union[str, bytes]) -> CircuitState:
+        """
+        :param url: The URL of the request.
+        :return: The state of the circuit of the URL, an open circuit whose timeout has expired is half-open.
+        """
+        with self._lock:
+            circuit = self._circuits.get(self.get_key(url))
+            if circuit is None:
+                return CircuitState.closed
+            if circuit.state is CircuitState.open and time.monotonic() - circuit.opened_at >= self.recovery_timeout:
+                return CircuitState.half_open
+            return circuit.state
+
+    def before_request(self, url: Union[str, bytes]):
+        """
+        Checks whether the request may be sent.
+
+        :param url: The URL of the request.
+        :raises CircuitOpenError: If the circuit of the URL is open or all probes are already in flight.
+        """
+        key = self.get_key(url)
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.state is CircuitState.closed:
+                return
+            remaining = self.recovery_timeout - (time.monotonic() - circuit.opened_at)
+            if circuit.state is CircuitState.open and remaining <= 0:
+                circuit.state = CircuitState.half_open
+                circuit.successes = 0
+                circuit.probes = 0
+            if circuit.state is CircuitState.half_open and circuit.probes < self.half_open_max_calls:
+                circuit.probes += 1
+                return
+            circuit.rejected += 1
+        raise CircuitOpenError(f'The circuit of "{key[0]}{key[1]}" is open, retry in {max(remaining, 0):.1f} s.')
+
+    def record(self, url: Union[str, bytes], failed: Optional[bool]):
+        """
+        Counts the result of a request that was allowed by `before_request`.
+
+        :param url: The URL of the request.
+        :param failed: Whether the endpoint failed to answer the request,
+            None if the request was interrupted for a reason unrelated to the endpoint.
+        """
+        key = self.get_key(url)
+        with self._lock:
+            circuit = self._circuits.setdefault(key, Circuit())
+            if circuit.state is CircuitState.half_open:
+                circuit.probes = max(0, circuit.probes - 1)
+            if failed is None:
+                return
+            if failed:
+                circuit.failures += 1
+                if circuit.state is CircuitState.half_open or circuit.failures >= self.failure_threshold:
+                    circuit.state = CircuitState.open
+                    circuit.opened_at = time.monotonic()
+                return
+            circuit.failures = 0
+            if circuit.state is CircuitState.half_open:
+                circuit.successes += 1
+                if circuit.successes >= self.success_threshold:
+                    circuit.state = CircuitState.closed
+            # Исправные цепи не хранятся, иначе словарь рос бы с каждой новой страницей
+            if circuit.state is CircuitState.closed and not circuit.rejected:
+                del self._circuits[key]
+
+    def _is_failure(self, response: Any) -> bool:
+        return response.status_code in self.status_codes
+
+    def execute(self, url: Union[str, bytes], send: Callable[[], ResponseType]) -> ResponseType:
+        """
+        Sends the request if its circuit is not open and records the result.
+
+        :param url: The URL of the request.
+        :param send: A function that sends the request and returns the response.
+        :return: The response of the request.
+        """
+        self.before_request(url)
+        try:
+            response = send()
+        except self.exceptions:
+            self.record(url, True)
+            raise
+        except BaseException:
+            self.record(url, None)
+            raise
+        self.record(url, self._is_failure(response))
+        return response
+
+    async def aexecute(self, url: Union[str, bytes], send: Callable[[], Awaitable[ResponseType]]) -> ResponseType:
+        """
+        The asynchronous version of `execute`, `send` must return an awaitable.
+
+        :param url: The URL of the request.
+        :param send: A function that sends the request and returns an awaitable response.
+        :return: The response of the request.
+        """
+        self.before_request(url)
+        try:
+            response = await send()
+        except self.exceptions:
+            self.record(url, True)
+            raise
+        except BaseException:
+            self.record(url, None)
+            raise
+        self.record(url, self._is_failure(response))
+        return response
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        :return: The state of every circuit that has been used.
+        """
+        with self._lock:
+            return {
+                f"{host}{path}": {"state": c.state.value, "failures": c.failures, "rejected": c.rejected}
+                for (host, path), c in self._circuits.items()
+            }
+
+    def reset(self):
+        """
+        Closes all circuits.
+        """
+        with self._lock:
+            self._circuits.clear()
+
+    def __repr__(self):
+        return f"<CircuitBreaker(failure_threshold={self.failure_threshold}, recovery_timeout={self.recovery_timeout})>"
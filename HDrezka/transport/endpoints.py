@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+from enum import Enum
+from typing import Any, Iterable, Mapping, Optional, Union
+from urllib.parse import urlencode, urlsplit
+
+
+class EndpointType(Enum):
+    """Enumeration class to represent the classes of traffic sent by the library.
+
+    Attributes:
+        page: HTML pages of the site.
+        cdn_series: The "/ajax/get_cdn_series/" endpoint used by the player.
+        comments: The "/ajax/get_comments/" endpoint.
+        ajax: Any other AJAX endpoint of the site.
+        static: Images, styles and scripts.
+        media: Video streams and subtitles served by the CDN hosts.
+    """
+
+    page = "page"
+    cdn_series = "cdn_series"
+    comments = "comments"
+    ajax = "ajax"
+    static = "static"
+    media = "media"
+
+
+STATIC_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".ico", ".css", ".js", ".woff", ".woff2")
+MEDIA_EXTENSIONS = (".mp4", ".m3u8", ".ts", ".vtt", ".srt")
+# Параметры строки запроса, которые сайт использует против кеширования (метка времени "t" в AJAX-запросах)
+VOLATILE_PARAMS = frozenset(("t",))
+
+
+def determine_endpoint_type(url: Union[str, bytes], domain: Optional[str] = None) -> EndpointType:
+    """Determines the class of traffic the URL belongs to.
+
+    :param url:
+        The URL of the request.
+    :param domain:
+        The domain of the site. Requests to other hosts that are neither static files
+        nor AJAX endpoints are considered to be CDN media requests.
+    :return:
+        The endpoint type of the URL.
+    """
+    if isinstance(url, bytes):
+        url = url.decode("utf-8")
+    url_split = urlsplit(url)
+    path = url_split.path.lower()
+    if path.startswith(("/ajax/", "/engine/ajax/")):
+        if path.startswith("/ajax/get_cdn_series/"):
+            return EndpointType.cdn_series
+        if path.startswith("/ajax/get_comments/"):
+            return EndpointType.comments
+        return EndpointType.ajax
+    if path.endswith(STATIC_EXTENSIONS):
+        return EndpointType.static
+    if path.endswith(MEDIA_EXTENSIONS) or (domain is not None and url_split.netloc not in ("", domain)):
+        return EndpointType.media
+    return EndpointType.page
+
+
+def make_request_key(
+        method: str,
+        url: Union[str, bytes],
+        kwargs: Mapping[str, Any],
+        fields: Iterable[str] = ("params", "data", "json"),
+        ignored_params: Iterable[str] = (),
+) -> str:
+    """Builds a key that identifies the request by its method, URL and the given keyword arguments.
+
+    :param method:
+        The HTTP method of the request.
+    :param url:
+        The URL of the request.
+    :param kwargs:
+        The keyword arguments of the request.
+    :param fields:
+        The names of the keyword arguments that make requests different, mappings are compared regardless of order.
+    :param ignored_params:
+        The names of the query parameters left out of the key, such as the cache-busting `VOLATILE_PARAMS`.
+    :return:
+        The hex digest of the request.
+    """
+    url = url.decode("utf-8") if isinstance(url, bytes) else url
+    parts = [method.upper(), url]
+    ignored_params = frozenset(ignored_params)
+    for name in fields:
+        value = kwargs.get(name)
+        if name == "params" and ignored_params and isinstance(value, Mapping):
+            value = {k: v for k, v in value.items() if k not in ignored_params}
+        if isinstance(value, Mapping):
+            value = urlencode(sorted((str(k), str(v)) for k, v in value.items()))
+        parts.append(repr(value))
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
@@ -0,0 +1,554 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import warnings
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from urllib.parse import urlsplit
+
+from .endpoints import EndpointType, determine_endpoint_type
+
+ResponseType = TypeVar("ResponseType")
+RequestHook = Callable[["RequestRecord", Dict[str, Any]], None]
+ResponseHook = Callable[["RequestRecord"], None]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+@dataclass
+class RequestRecord:
+    """
+    The measurements of a single request.
+
+    Attributes:
+        method: The HTTP method of the request.
+        url: The URL the request was sent to.
+        host: The host the request was sent to.
+        endpoint: The `EndpointType` value of the request.
+        kind: "request" for requests of the connector, "download" for whole file downloads, "parse" for parsing.
+        status_code: The status code of the response, None if no response was received.
+        error: The name of the exception raised instead of the response.
+        start_time: The UNIX time the request was started at.
+        duration: The duration of the request in seconds.
+        timings: The phases of the request in seconds: "connect", "tls", "ttfb" (from the start of the request
+            to the response headers) and "transfer" (from the headers to the end of the body). Phases that
+            could not be measured by the connector are missing. There is no separate DNS phase: both `urllib3`
+            and `httpcore` resolve the host inside the TCP connect call, so its time is part of "connect".
+        bytes_sent: The size of the request body.
+        bytes_received: The size of the response body, None if it is unknown.
+        http_version: The HTTP version of the response, if the connector reports it.
+    """
+
+    method: str
+    url: str
+    host: str = ""
+    endpoint: str = EndpointType.page.value
+    kind: str = "request"
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    start_time: float = 0.0
+    duration: float = 0.0
+    timings: Dict[str, float] = field(default_factory=dict)
+    bytes_sent: int = 0
+    bytes_received: Optional[int] = None
+    http_version: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class PhaseTracer:
+    """
+    Collects the moments of the connection phases reported by the "trace" extension of `httpx`.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.events: Dict[str, float] = {}
+
+    def __call__(self, event_name: str, info: Dict[str, Any]):
+        self.events.setdefault(event_name, time.perf_counter())
+
+    async def atrace(self, event_name: str, info: Dict[str, Any]):
+        self(event_name, info)
+
+    def _get_phase(self, name: str) -> Optional[float]:
+        started = self.events.get(f"connection.{name}.started")
+        completed = self.events.get(f"connection.{name}.complete")
+        return completed - started if started is not None and completed is not None else None
+
+    def get_timings(self) -> Dict[str, float]:
+        """
+        :return: The durations of the phases that took place.
+        """
+        timings = {}
+        for phase, name in (("connect", "connect_tcp"), ("tls", "start_tls")):
+            duration = self._get_phase(name)
+            if duration is not None:
+                timings[phase] = duration
+        for prefix in ("http11", "http2"):
+            headers = self.events.get(f"{prefix}.receive_response_headers.complete")
+            if headers is not None:
+                timings["ttfb"] = headers - self.start
+        return timings
+
+
+def _get_request_size(response: Any) -> int:
+    request = getattr(response, "request", None)
+    if request is None:
+        return 0
+    body = getattr(request, "body", None)
+    if body is None and hasattr(request, "extensions"):
+        try:
+            body = request.content
+        except Exception:  # pylint: disable=W0703
+            body = None
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    return len(body) if isinstance(body, (bytes, bytearray)) else 0
+
+
+def _get_response_size(response: Any) -> Optional[int]:
+    content = getattr(response, "_content", None)
+    if isinstance(content, bytes):
+        return len(content)
+    length = response.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+def _get_elapsed(response: Any) -> Optional[float]:
+    try:
+        elapsed = response.elapsed
+    except (AttributeError, RuntimeError):
+        return None
+    return elapsed.total_seconds() if elapsed else None
+
+
+class Instrumentation:
+    """
+    Request and response hooks of the connector.
+
+    Before every attempt `request_hooks` are called with the record and the keyword arguments of the request,
+    which they may modify. After the attempt `hooks` are called with the completed `RequestRecord`: the timing
+    breakdown, the transferred bytes, the status code and the endpoint label. The connectors built on `httpx`
+    report the connect, TLS and time-to-first-byte phases, the `requests` based connectors report only
+    the time to first byte; DNS resolution is included in "connect". The parsing of the pages is recorded
+    by `measure` as "parse" records. The exporters (`PrometheusExporter`, `SpanExporter`, `JSONLinesExporter`)
+    are hooks themselves. An exception raised by a hook of either kind is turned into a warning.
+
+    Usage::
+
+        >>> from HDrezka.connector import NetworkClient
+        >>> from HDrezka.transport import Instrumentation, PrometheusExporter, JSONLinesExporter
+        >>>
+        >>> prometheus = PrometheusExporter()
+        >>> NetworkClient().instrumentation = Instrumentation([prometheus, JSONLinesExporter("requests.log")])
+        >>> ...
+        >>> print(prometheus.render())
+    """
+
+    def __init__(self, hooks: Iterable[ResponseHook] = (), request_hooks: Iterable[RequestHook] = ()):
+        """
+        Initialize a new instance of the class.
+
+        :param hooks: The functions called with every completed `RequestRecord`.
+        :param request_hooks: The functions called with the record and the keyword arguments before every request.
+        """
+        self.hooks: List[ResponseHook] = list(hooks)
+        self.request_hooks: List[RequestHook] = list(request_hooks)
+
+    def emit(self, record: RequestRecord):
+        """
+        Passes the completed record to every hook.
+
+        :param record: The measurements of the request.
+        """
+        for hook in self.hooks:
+            try:
+                hook(record)
+            except Exception as exc:  # pylint: disable=W0703
+                self._warn(hook, exc)
+
+    @staticmethod
+    def _warn(hook: Callable, exc: Exception):
+        warnings.warn(f"The instrumentation hook {hook!r} failed: {exc!r}")
+
+    def start(
+            self,
+            method: str,
+            url: Union[str, bytes],
+            kwargs: Dict[str, Any],
+            endpoint: Optional[EndpointType] = None,
+            kind: str = "request",
+    ) -> RequestRecord:
+        """
+        Creates the record of a new request and calls `request_hooks`.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of the request.
+        :param endpoint: The endpoint type of the request, determined from the URL if None.
+        :param kind: The kind of the record.
+        :return: The record of the request.
+        """
+        url = url.decode("utf-8") if isinstance(url, bytes) else str(url)
+        record = RequestRecord(
+            method=method.upper(),
+            url=url,
+            host=urlsplit(url).netloc,
+            endpoint=(endpoint or determine_endpoint_type(url)).value,
+            kind=kind,
+            start_time=time.time(),
+        )
+        for hook in self.request_hooks:
+            try:
+                hook(record, kwargs)
+            except Exception as exc:  # pylint: disable=W0703
+                self._warn(hook, exc)
+        return record
+
+    def finish(  # pylint: disable=R0913
+            self,
+            record: RequestRecord,
+            response: Any = None,
+            error: Optional[BaseException] = None,
+            tracer: Optional[PhaseTracer] = None,
+            start: Optional[float] = None,
+    ):
+        """
+        Completes the record with the result of the request and emits it.
+
+        :param record: The record returned by `start`.
+        :param response: The response of the request.
+        :param error: The exception raised instead of the response.
+        :param tracer: The tracer of the connection phases.
+        :param start: The `time.perf_counter()` moment the request was sent.
+        """
+        end = time.perf_counter()
+        record.duration = end - (start if start is not None else end)
+        if tracer is not None:
+            record.timings.update(tracer.get_timings())
+        if error is not None:
+            record.error = type(error).__name__
+        if response is not None:
+            record.status_code = response.status_code
+            record.bytes_sent = _get_request_size(response)
+            record.bytes_received = _get_response_size(response)
+            http_version = getattr(response, "http_version", None)
+            record.http_version = http_version if isinstance(http_version, str) else None
+            if "ttfb" not in record.timings:
+                elapsed = _get_elapsed(response)
+                if elapsed is not None:
+                    record.timings["ttfb"] = min(elapsed, record.duration)
+            if "ttfb" in record.timings and isinstance(getattr(response, "_content", None), bytes):
+                record.timings["transfer"] = max(record.duration - record.timings["ttfb"], 0.0)
+        self.emit(record)
+
+    def execute(
+            self,
+            method: str,
+            url: Union[str, bytes],
+            kwargs: Dict[str, Any],
+            send: Callable[[Dict[str, Any]], ResponseType],
+            *,
+            endpoint: Optional[EndpointType] = None,
+            trace: Optional[Callable[[Dict[str, Any], PhaseTracer], Dict[str, Any]]] = None,
+    ) -> ResponseType:
+        """
+        Sends the request with `send` and records it.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of the request.
+        :param send: A function that sends the request with the given keyword arguments and returns the response.
+        :param endpoint: The endpoint type of the request, determined from the URL if None.
+        :param trace: A function that adds the tracer of the connection phases to the keyword arguments.
+        :return: The response of the request.
+        """
+        kwargs = dict(kwargs)
+        record = self.start(method, url, kwargs, endpoint)
+        tracer = PhaseTracer()
+        if trace is not None:
+            kwargs = trace(kwargs, tracer)
+        try:
+            response = send(kwargs)
+        except BaseException as exc:
+            self.finish(record, error=exc, tracer=tracer, start=tracer.start)
+            raise
+        self.finish(record, response, tracer=tracer, start=tracer.start)
+        return response
+
+    async def aexecute(
+            self,
+            method: str,
+            url: Union[str, bytes],
+            kwargs: Dict[str, Any],
+            send: Callable[[Dict[str, Any]], Awaitable[ResponseType]],
+            *,
+            endpoint: Optional[EndpointType] = None,
+            trace: Optional[Callable[[Dict[str, Any], PhaseTracer], Dict[str, Any]]] = None,
+    ) -> ResponseType:
+        """
+        The asynchronous version of `execute`, `send` must return an awaitable.
+        """
+        kwargs = dict(kwargs)
+        record = self.start(method, url, kwargs, endpoint)
+        tracer = PhaseTracer()
+        if trace is not None:
+            kwargs = trace(kwargs, tracer)
+        try:
+            response = await send(kwargs)
+        except BaseException as exc:
+            self.finish(record, error=exc, tracer=tracer, start=tracer.start)
+            raise
+        self.finish(record, response, tracer=tracer, start=tracer.start)
+        return response
+
+    @contextmanager
+    def measure(
+            self, kind: str, url: Union[str, bytes] = "", method: str = "GET", **timings: float
+    ) -> Iterator[RequestRecord]:
+        """
+        Records the work done in the `with` block, e.g. parsing of a page or downloading of a file.
+        The block may fill in `bytes_received` and other fields of the yielded record.
+
+        :param kind: The kind of the record, e.g. "parse" or "download".
+        :param url: The URL the work belongs to.
+        :param method: The HTTP method the work belongs to.
+        :param timings: The phases that have already been measured.
+        :return: A context manager that yields the record.
+        """
+        record = self.start(method, url, {}, kind=kind)
+        record.timings.update(timings)
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as exc:
+            self.finish(record, error=exc, start=start)
+            raise
+        self.finish(record, start=start)
+
+
+class PrometheusExporter:
+    """
+    Aggregates the records into counters and histograms rendered in the Prometheus text format.
+    """
+
+    def __init__(self, prefix: str = "hdrezka", buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Initialize a new instance of the class.
+
+        :param prefix: The prefix of the metric names.
+        :param buckets: The upper bounds of the buckets of the duration histogram in seconds.
+        """
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, ...], int] = {}
+        self._bytes: Dict[Tuple[str, ...], int] = {}
+        self._durations: Dict[Tuple[str, ...], List[float]] = {}
+        self._phases: Dict[Tuple[str, ...], List[float]] = {}
+
+    def __call__(self, record: RequestRecord):
+        status = str(record.status_code) if record.status_code is not None else record.error or "none"
+        labels = (record.kind, record.endpoint, record.method, status)
+        with self._lock:
+            self._requests[labels] = self._requests.get(labels, 0) + 1
+            for direction, size in (("sent", record.bytes_sent), ("received", record.bytes_received)):
+                key = (record.kind, record.endpoint, direction)
+                self._bytes[key] = self._bytes.get(key, 0) + (size or 0)
+            histogram = self._durations.setdefault((record.kind, record.endpoint), [0] * len(self.buckets) + [0, 0])
+            for number, bound in enumerate(self.buckets):
+                if record.duration <= bound:
+                    histogram[number] += 1
+            histogram[-2] += 1
+            histogram[-1] += record.duration
+            for phase, duration in record.timings.items():
+                summary = self._phases.setdefault((record.kind, record.endpoint, phase), [0, 0.0])
+                summary[0] += 1
+                summary[1] += duration
+
+    @staticmethod
+    def _format_labels(**labels: str) -> str:
+        values = ",".join(f'{name}="{value}"' for name, value in labels.items())
+        return f"{{{values}}}"
+
+    def render(self) -> str:
+        """
+        :return: The metrics in the Prometheus text exposition format.
+        """
+        name = self.prefix
+        lines = [f"# HELP {name}_requests_total The number of requests.", f"# TYPE {name}_requests_total counter"]
+        with self._lock:
+            for (kind, endpoint, method, status), count in sorted(self._requests.items()):
+                labels = self._format_labels(kind=kind, endpoint=endpoint, method=method, status=status)
+                lines.append(f"{name}_requests_total{labels} {count}")
+
+            lines += [f"# HELP {name}_bytes_total The number of transferred body bytes.",
+                      f"# TYPE {name}_bytes_total counter"]
+            for (kind, endpoint, direction), size in sorted(self._bytes.items()):
+                labels = self._format_labels(kind=kind, endpoint=endpoint, direction=direction)
+                lines.append(f"{name}_bytes_total{labels} {size}")
+
+            lines += [f"# HELP {name}_request_duration_seconds The duration of requests.",
+                      f"# TYPE {name}_request_duration_seconds histogram"]
+            for (kind, endpoint), histogram in sorted(self._durations.items()):
+                for bound, count in zip(self.buckets, histogram):
+                    labels = self._format_labels(kind=kind, endpoint=endpoint, le=f"{bound:g}")
+                    lines.append(f"{name}_request_duration_seconds_bucket{labels} {count}")
+                labels = self._format_labels(kind=kind, endpoint=endpoint, le="+Inf")
+                lines.append(f"{name}_request_duration_seconds_bucket{labels} {histogram[-2]}")
+                labels = self._format_labels(kind=kind, endpoint=endpoint)
+                lines.append(f"{name}_request_duration_seconds_sum{labels} {histogram[-1]:.6f}")
+                lines.append(f"{name}_request_duration_seconds_count{labels} {histogram[-2]}")
+
+            lines += [f"# HELP {name}_request_phase_seconds The duration of the phases of requests.",
+                      f"# TYPE {name}_request_phase_seconds summary"]
+            for (kind, endpoint, phase), (count, total) in sorted(self._phases.items()):
+                labels = self._format_labels(kind=kind, endpoint=endpoint, phase=phase)
+                lines.append(f"{name}_request_phase_seconds_sum{labels} {total:.6f}")
+                lines.append(f"{name}_request_phase_seconds_count{labels} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class SpanExporter:
+    """
+    Converts the records into spans in the OpenTelemetry format.
+
+    The spans of the requests made inside a `trace()` block share its trace id and are children of its span.
+    Finished spans are kept in `spans` (the last `max_spans`) and passed to `export` if it is given.
+    """
+
+    _current: contextvars.ContextVar = contextvars.ContextVar("hdrezka_trace", default=None)
+
+    def __init__(self, export: Optional[Callable[[Dict[str, Any]], None]] = None, max_spans: int = 1000):
+        """
+        Initialize a new instance of the class.
+
+        :param export: A function called with every finished span, e.g. to send it to a collector.
+        :param max_spans: The number of the last spans kept in `spans`.
+        """
+        self.export = export
+        self.spans: Deque[Dict[str, Any]] = deque(maxlen=max_spans)
+
+    @staticmethod
+    def _new_id(size: int) -> str:
+        return os.urandom(size).hex()
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Opens a parent span, e.g. around the enrichment of one movie.
+
+        :param name: The name of the span.
+        :param attributes: The attributes of the span.
+        :return: A context manager that yields the span.
+        """
+        parent = self._current.get()
+        span = self._make_span(name, time.time(), parent, attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span["status"] = {"code": "ERROR", "message": type(exc).__name__}
+            raise
+        finally:
+            self._current.reset(token)
+            span["end_time_unix_nano"] = int(time.time() * 1e9)
+            self._finish(span)
+
+    def _make_span(
+            self, name: str, start_time: float, parent: Optional[Dict[str, Any]], attributes: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return {
+            "name": name,
+            "trace_id": parent["trace_id"] if parent else self._new_id(16),
+            "span_id": self._new_id(8),
+            "parent_span_id": parent["span_id"] if parent else None,
+            "kind": "CLIENT",
+            "start_time_unix_nano": int(start_time * 1e9),
+            "end_time_unix_nano": None,
+            "attributes": dict(attributes),
+            "events": [],
+            "status": {"code": "OK"},
+        }
+
+    def _finish(self, span: Dict[str, Any]):
+        self.spans.append(span)
+        if self.export is not None:
+            self.export(span)
+
+    def __call__(self, record: RequestRecord):
+        name = f"HTTP {record.method}" if record.kind == "request" else record.kind
+        span = self._make_span(name, record.start_time, self._current.get(), {
+            "http.request.method": record.method,
+            "url.full": record.url,
+            "server.address": record.host,
+            "http.response.status_code": record.status_code,
+            "http.request.body.size": record.bytes_sent,
+            "http.response.body.size": record.bytes_received,
+            "network.protocol.version": record.http_version,
+            "hdrezka.endpoint": record.endpoint,
+            "hdrezka.kind": record.kind,
+        })
+        span["end_time_unix_nano"] = int((record.start_time + record.duration) * 1e9)
+        offset = 0.0
+        for phase in ("connect", "tls", "ttfb", "transfer"):
+            if phase in record.timings:
+                # Фазы соединения идут друг за другом, ttfb отсчитывается от начала запроса
+                moment = record.timings[phase] if phase == "ttfb" else offset + record.timings[phase]
+                offset = moment
+                span["events"].append({
+                    "name": phase,
+                    "time_unix_nano": int((record.start_time + moment) * 1e9),
+                    "attributes": {"duration": record.timings[phase]},
+                })
+        if record.error is not None or (record.status_code or 0) >= 500:
+            span["status"] = {"code": "ERROR", "message": record.error or str(record.status_code)}
+        self._finish(span)
+
+
+class JSONLinesExporter:
+    """
+    Writes every record as a line of JSON to a stream or a file.
+    """
+
+    def __init__(self, stream: Union[TextIO, str, None] = None):
+        """
+        Initialize a new instance of the class.
+
+        :param stream: A text stream or the path of a file opened for appending, `sys.stderr` by default.
+        """
+        self._path = stream if isinstance(stream, str) else None
+        self.stream = stream if stream is not None and self._path is None else sys.stderr
+        self._lock = threading.Lock()
+
+    def __call__(self, record: RequestRecord):
+        line = json.dumps(record.as_dict(), ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._path is not None:
+                with open(self._path, "a", encoding="utf-8") as file:
+                    file.write(line)
+            else:
+                self.stream.write(line)
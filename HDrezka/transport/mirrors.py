@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple, Type, TypeVar, Union
+from urllib.parse import urlsplit
+
+from .retry import IDEMPOTENT_METHODS, IDEMPOTENT_POST_PATHS, RETRY_EXCEPTIONS
+from ..exceptions import CircuitOpenError
+
+ResponseType = TypeVar("ResponseType")
+# Цепи CircuitBreaker ведутся по хосту, поэтому открытая цепь одного зеркала не мешает остальным
+MIRROR_EXCEPTIONS: Tuple[Type[BaseException], ...] = RETRY_EXCEPTIONS + (CircuitOpenError,)
+
+
+@dataclass
+class MirrorState:
+    """
+    The health of a single mirror.
+
+    Attributes:
+        domain: The domain of the mirror.
+        latency: The smoothed response time in seconds, None until the first successful request.
+        failures: The number of consecutive failed requests.
+        available_at: The `time.monotonic()` moment before which the mirror is not used.
+    """
+
+    domain: str
+    latency: Optional[float] = None
+    failures: int = 0
+    available_at: float = 0.0
+
+    def is_healthy(self, now: float) -> bool:
+        return self.available_at <= now
+
+
+class MirrorPool:
+    """
+    A pool of mirrors of the site that routes requests to the fastest healthy mirror.
+
+    Requests to any domain of the pool are sent to the active mirror: the healthy mirror with the lowest
+    smoothed latency. If the mirror raises one of `exceptions` (including `CircuitOpenError` of its circuit)
+    or answers with a 5xx status, it is put aside for `cooldown` seconds (doubling with every consecutive
+    failure up to `max_cooldown`) and an idempotent request is immediately repeated on the next mirror.
+    Since the request URL is rewritten, the absolute URLs returned by builders (`Poster.url`,
+    `PersonBriefInfo.url`, ...) keep working after a failover; use `rewrite_url` to convert them explicitly.
+    Requests to other hosts (CDN, static files) are not touched.
+
+    Usage::
+
+        >>> from HDrezka.connector import NetworkClient
+        >>> from HDrezka.transport import MirrorPool
+        >>>
+        >>> client = NetworkClient()
+        >>> client.mirror_pool = MirrorPool(["rezka.ag", "hdrezka.ag", "hdrezka.me"])
+        >>> client.mirror_pool.check_health(client.adapter)
+        >>> print(client.mirror_pool.active)
+    """
+
+    def __init__(  # pylint: disable=R0913
+            self,
+            mirrors: Iterable[str],
+            *,
+            cooldown: float = 30,
+            max_cooldown: float = 600,
+            max_failovers: int = 2,
+            smoothing: float = 0.3,
+            health_path: str = "/",
+            health_timeout: float = 5,
+            exceptions: Tuple[Type[BaseException], ...] = MIRROR_EXCEPTIONS,
+    ):
+        """
+        Initialize a new instance of the class.
+
+        :param mirrors: The domains of the mirrors in order of preference.
+        :param cooldown: The number of seconds a failed mirror is not used.
+        :param max_cooldown: The upper limit of the cooldown after many consecutive failures.
+        :param max_failovers: How many other mirrors a failed request may be repeated on.
+        :param smoothing: The weight of the latest response time in the smoothed latency.
+        :param health_path: The path requested by `check_health`.
+        :param health_timeout: The timeout of a health check request.
+        :param exceptions: The transport exceptions which are considered a failure of the mirror.
+        """
+        self._mirrors = [MirrorState(domain) for domain in dict.fromkeys(mirrors)]
+        if not self._mirrors:
+            raise ValueError('Attribute "mirrors" must contain at least one domain.')
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_failovers = max_failovers
+        self.smoothing = smoothing
+        self.health_path = health_path
+        self.health_timeout = health_timeout
+        self.exceptions = exceptions
+        self.failovers = 0
+        self._lock = threading.Lock()
+
+    @property
+    def mirrors(self) -> List[MirrorState]:
+        with self._lock:
+            return list(self._mirrors)
+
+    @property
+    def active(self) -> str:
+        """
+        :return: The domain of the mirror to which requests are currently sent.
+        """
+        return self.get_candidates()[0].domain
+
+    def __contains__(self, domain: str) -> bool:
+        return any(mirror.domain == domain for mirror in self._mirrors)
+
+    def get_candidates(self) -> List[MirrorState]:
+        """
+        :return: The healthy mirrors from the fastest to the slowest followed by the mirrors
+            that are cooling down, from the one that will be available first.
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [m for m in self._mirrors if m.is_healthy(now)]
+            unhealthy = [m for m in self._mirrors if not m.is_healthy(now)]
+        # Зеркала без замеров сохраняют порядок, заданный пользователем, и идут после измеренных
+        healthy.sort(key=lambda m: (m.latency is None, m.latency or 0))
+        unhealthy.sort(key=lambda m: m.available_at)
+        return healthy + unhealthy
+
+    def rewrite_url(self, url: Union[str, bytes]) -> str:
+        """
+        Replaces the domain of the URL with the active mirror if the URL belongs to the pool.
+
+        :param url: An absolute URL.
+        :return: The URL pointing to the active mirror or the original URL.
+        """
+        return self._replace_domain(url, self.active)
+
+    def _replace_domain(self, url: Union[str, bytes], domain: str) -> str:
+        url = url.decode("utf-8") if isinstance(url, bytes) else url
+        url_split = urlsplit(url)
+        if url_split.netloc not in self:
+            return url
+        return url_split._replace(netloc=domain).geturl()
+
+    def report_success(self, domain: str, latency: float):
+        with self._lock:
+            for mirror in self._mirrors:
+                if mirror.domain == domain:
+                    mirror.failures = 0
+                    mirror.available_at = 0.0
+                    if mirror.latency is None:
+                        mirror.latency = latency
+                    else:
+                        mirror.latency += self.smoothing * (latency - mirror.latency)
+
+    def report_failure(self, domain: str):
+        with self._lock:
+            for mirror in self._mirrors:
+                if mirror.domain == domain:
+                    mirror.failures += 1
+                    cooldown = min(self.max_cooldown, self.cooldown * 2 ** (mirror.failures - 1))
+                    mirror.available_at = time.monotonic() + cooldown
+
+    @staticmethod
+    def is_idempotent(method: str, url: str) -> bool:
+        method = method.upper()
+        return method in IDEMPOTENT_METHODS or (method == "POST" and urlsplit(url).path in IDEMPOTENT_POST_PATHS)
+
+    def _get_routes(self, method: str, url: Union[str, bytes]) -> List[Tuple[Optional[str], str]]:
+        url = url.decode("utf-8") if isinstance(url, bytes) else url
+        if urlsplit(url).netloc not in self:
+            return [(None, url)]
+        candidates = self.get_candidates()
+        if not self.is_idempotent(method, url):
+            candidates = candidates[:1]
+        return [(m.domain, self._replace_domain(url, m.domain)) for m in candidates[:self.max_failovers + 1]]
+
+    def _is_failure(self, domain: Optional[str], response: Any, start_time: float) -> bool:
+        if domain is None:
+            return False
+        if response.status_code >= 500:
+            self.report_failure(domain)
+            return True
+        self.report_success(domain, time.monotonic() - start_time)
+        return False
+
+    def execute(self, method: str, url: Union[str, bytes], send: Callable[[str], ResponseType]) -> ResponseType:
+        """
+        Sends the request to the active mirror and fails over to the next ones if it is unavailable.
+        If every mirror fails, the last response is returned or the last exception is raised.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param send: A function that sends the request to the given URL and returns the response.
+        :return: The response of the mirror which served the request.
+        """
+        routes = self._get_routes(method, url)
+        for number, (domain, mirror_url) in enumerate(routes, 1):
+            start_time = time.monotonic()
+            try:
+                response = send(mirror_url)
+            except self.exceptions:
+                if domain is None:
+                    raise
+                self.report_failure(domain)
+                if number == len(routes):
+                    raise
+            else:
+                if not self._is_failure(domain, response, start_time) or number == len(routes):
+                    return response
+                response.close()
+            with self._lock:
+                self.failovers += 1
+        raise AssertionError("unreachable")  # pragma: NO COVER
+
+    async def aexecute(
+            self, method: str, url: Union[str, bytes], send: Callable[[str], Awaitable[ResponseType]]
+    ) -> ResponseType:
+        """
+        The asynchronous version of `execute`, `send` must return an awaitable.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param send: A function that sends the request to the given URL and returns an awaitable response.
+        :return: The response of the mirror which served the request.
+        """
+        routes = self._get_routes(method, url)
+        for number, (domain, mirror_url) in enumerate(routes, 1):
+            start_time = time.monotonic()
+            try:
+                response = await send(mirror_url)
+            except self.exceptions:
+                if domain is None:
+                    raise
+                self.report_failure(domain)
+                if number == len(routes):
+                    raise
+            else:
+                if not self._is_failure(domain, response, start_time) or number == len(routes):
+                    return response
+            with self._lock:
+                self.failovers += 1
+        raise AssertionError("unreachable")  # pragma: NO COVER
+
+    def _check_result(self, domain: str, start_time: float, response: Any = None):
+        if response is None or response.status_code >= 500:
+            self.report_failure(domain)
+        else:
+            self.report_success(domain, time.monotonic() - start_time)
+
+    def check_health(self, connector: Any):
+        """
+        Requests `health_path` on every mirror and updates their latency and health.
+
+        :param connector: The connector used to send the health check requests.
+        """
+        for mirror in self.mirrors:
+            start_time = time.monotonic()
+            url = f"{getattr(connector, 'scheme', 'https')}://{mirror.domain}{self.health_path}"
+            try:
+                response = connector._perform("GET", url, timeout=self.health_timeout)  # pylint: disable=W0212
+            except self.exceptions:
+                response = None
+            self._check_result(mirror.domain, start_time, response)
+
+    async def acheck_health(self, connector: Any):
+        """
+        The asynchronous version of `check_health`, all mirrors are checked concurrently.
+
+        :param connector: The asynchronous connector used to send the health check requests.
+        """
+
+        async def check(domain: str):
+            start_time = time.monotonic()
+            url = f"{getattr(connector, 'scheme', 'https')}://{domain}{self.health_path}"
+            try:
+                response = await connector._perform("GET", url, timeout=self.health_timeout)  # pylint: disable=W0212
+            except self.exceptions:
+                response = None
+            self._check_result(domain, start_time, response)
+
+        await asyncio.gather(*(check(mirror.domain) for mirror in self.mirrors))
+
+    def __repr__(self):
+        return f"<MirrorPool(active={self.active!r}, mirrors={len(self._mirrors)})>"
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .endpoints import EndpointType, determine_endpoint_type
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket.
+
+    The bucket holds at most `capacity` tokens and is refilled with `rate` tokens per second.
+    Instead of blocking, `reserve` takes a token in advance and returns how long the caller has to wait
+    before using it, so the same bucket serves both threads (`time.sleep`) and coroutines (`asyncio.sleep`).
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        Initialize a new instance of the class.
+
+        :param rate: The number of tokens added per second.
+        :param capacity: The maximum number of tokens, i.e. the allowed burst of requests.
+        """
+        if rate <= 0:
+            raise ValueError(f'Attribute "rate" must be greater than 0, received "{rate}".')
+        if capacity < 1:
+            raise ValueError(f'Attribute "capacity" must be greater than or equal to 1, received "{capacity}".')
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._timestamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Takes the tokens from the bucket, the balance may become negative.
+
+        :param tokens: The number of tokens to take.
+        :return: The number of seconds to wait before the tokens may be used.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._timestamp) * self.rate)
+            self._timestamp = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+
+@dataclass
+class EndpointLimit:
+    """
+    The limits applied to one class of requests on one host.
+
+    Attributes:
+        rate: The maximum number of requests per second, None means no limit.
+        burst: The number of requests that may be sent at once before the rate applies.
+        max_in_flight: The maximum number of simultaneous requests, None means no limit.
+    """
+
+    rate: Optional[float] = None
+    burst: int = 1
+    max_in_flight: Optional[int] = None
+
+
+class InFlightSlot:
+    """
+    A slot of a request in flight, taken by `RequestGovernor.acquire`.
+
+    The slot is released at the end of the `with` block, unless it is passed to a streamed response
+    with `hold_until_closed`: then the slot is held while the body is being read and is released
+    when the response is closed or garbage collected.
+    """
+
+    def __init__(self, semaphore: Any = None):
+        self._semaphore = semaphore
+        self._lock = threading.Lock()
+        self.held = False
+
+    def hold_until_closed(self, response: Any) -> Any:
+        """
+        Keeps the slot until the response is closed.
+
+        :param response: A response with a `close` method whose body has not been read yet.
+        :return: The same response.
+        """
+        if self._semaphore is None:
+            return response
+        self.held = True
+        close = response.close
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                self.release()
+
+        response.close = close_and_release
+        weakref.finalize(response, self.release)
+        return response
+
+    def release(self):
+        """
+        Frees the slot, repeated calls do nothing.
+        """
+        with self._lock:
+            semaphore, self._semaphore = self._semaphore, None
+        if semaphore is not None:
+            semaphore.release()
+
+
+class GovernorStatistics:
+    """
+    Thread-safe counters of a `RequestGovernor`.
+
+    Attributes:
+        requests: The number of requests that passed the governor.
+        throttled: The number of requests that had to wait for the rate limit.
+        time_throttled: Seconds spent waiting for the rate limit.
+        time_queued: Seconds spent waiting for a free in-flight slot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.time_throttled = 0.0
+        self.time_queued = 0.0
+
+    def record(self, delay: float, queued: float):
+        with self._lock:
+            self.requests += 1
+            self.throttled += delay > 0
+            self.time_throttled += delay
+            self.time_queued += queued
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "time_throttled": self.time_throttled,
+                "time_queued": self.time_queued,
+            }
+
+    def __repr__(self):
+        return f"<GovernorStatistics(requests={self.requests}, throttled={self.throttled})>"
+
+
+class RequestGovernor:
+    """
+    Client-side rate limiter and concurrency governor.
+
+    Requests are grouped by host and `EndpointType`, every group gets its own token bucket and its own limit
+    of requests in flight according to `limits`. Threads are limited with `threading.BoundedSemaphore`,
+    coroutines with an `asyncio.Semaphore` of the running event loop, therefore threads and every event loop
+    have separate in-flight limits while the request rate is shared by all of them.
+
+    Usage::
+
+        >>> from HDrezka.connector import NetworkClient
+        >>> from HDrezka.transport import RequestGovernor, EndpointLimit, EndpointType
+        >>>
+        >>> NetworkClient().governor = RequestGovernor({
+        >>>     EndpointType.page: EndpointLimit(rate=5, burst=5, max_in_flight=8),
+        >>>     EndpointType.cdn_series: EndpointLimit(rate=2, max_in_flight=2),
+        >>>     EndpointType.media: EndpointLimit(max_in_flight=4),
+        >>> })
+    """
+
+    def __init__(
+            self,
+            limits: Optional[Dict[EndpointType, EndpointLimit]] = None,
+            default: Optional[EndpointLimit] = None,
+    ):
+        """
+        Initialize a new instance of the class.
+
+        :param limits: The limits for each endpoint type.
+        :param default: The limit for the endpoint types missing from `limits`, no limit if None.
+        """
+        self.limits = dict(limits or {})
+        self.default = default or EndpointLimit()
+        self.statistics = GovernorStatistics()
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, EndpointType], TokenBucket] = {}
+        self._semaphores: Dict[Tuple[str, EndpointType], threading.BoundedSemaphore] = {}
+        # Семафоры asyncio привязаны к циклу событий и удаляются вместе с ним
+        self._async_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def get_limit(self, endpoint_type: EndpointType) -> EndpointLimit:
+        return self.limits.get(endpoint_type, self.default)
+
+    def _get_group(
+            self, url: Union[str, bytes], domain: Optional[str]
+    ) -> Tuple[Tuple[str, EndpointType], EndpointLimit]:
+        url = url.decode("utf-8") if isinstance(url, bytes) else url
+        endpoint_type = determine_endpoint_type(url, domain)
+        return (urlsplit(url).netloc, endpoint_type), self.get_limit(endpoint_type)
+
+    def _reserve(self, key: Tuple[str, EndpointType], limit: EndpointLimit) -> float:
+        if limit.rate is None:
+            return 0.0
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(limit.rate, limit.burst)
+        return bucket.reserve()
+
+    def _get_semaphore(self, key: Tuple[str, EndpointType], limit: EndpointLimit):
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                semaphore = self._semaphores[key] = threading.BoundedSemaphore(limit.max_in_flight)
+        return semaphore
+
+    def _get_async_semaphore(self, key: Tuple[str, EndpointType], limit: EndpointLimit):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._async_semaphores.get(loop)
+            if semaphores is None:
+                semaphores = self._async_semaphores[loop] = {}
+            semaphore = semaphores.get(key)
+            if semaphore is None:
+                semaphore = semaphores[key] = asyncio.Semaphore(limit.max_in_flight)
+        return semaphore
+
+    @contextmanager
+    def acquire(self, url: Union[str, bytes], domain: Optional[str] = None) -> Iterator[InFlightSlot]:
+        """
+        Waits until the request is allowed by the rate limit and a slot is free,
+        the slot is held until the end of the `with` block or, for a streamed response, until it is closed
+        (see `InFlightSlot.hold_until_closed`).
+
+        :param url: The URL of the request.
+        :param domain: The domain of the site, used to determine the endpoint type.
+        """
+        key, limit = self._get_group(url, domain)
+        start_time = time.monotonic()
+        semaphore = self._get_semaphore(key, limit) if limit.max_in_flight is not None else None
+        if semaphore is not None:
+            semaphore.acquire()  # pylint: disable=R1732
+        queued = time.monotonic() - start_time
+        slot = InFlightSlot(semaphore)
+        try:
+            delay = self._reserve(key, limit)
+            self.statistics.record(delay, queued)
+            if delay > 0:
+                time.sleep(delay)
+            yield slot
+        finally:
+            if not slot.held:
+                slot.release()
+
+    @asynccontextmanager
+    async def aacquire(
+            self, url: Union[str, bytes], domain: Optional[str] = None
+    ) -> AsyncIterator[InFlightSlot]:
+        """
+        The asynchronous version of `acquire`.
+
+        :param url: The URL of the request.
+        :param domain: The domain of the site, used to determine the endpoint type.
+        """
+        key, limit = self._get_group(url, domain)
+        start_time = time.monotonic()
+        semaphore = self._get_async_semaphore(key, limit) if limit.max_in_flight is not None else None
+        if semaphore is not None:
+            await semaphore.acquire()
+        queued = time.monotonic() - start_time
+        slot = InFlightSlot(semaphore)
+        try:
+            delay = self._reserve(key, limit)
+            self.statistics.record(delay, queued)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield slot
+        finally:
+            if not slot.held:
+                slot.release()
+
+    def __repr__(self):
+        return f"<RequestGovernor({len(self.limits)} limits)>"
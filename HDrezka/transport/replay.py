@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import threading
+import time
+import zipfile
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+from .cache import TRANSFER_HEADERS
+from .endpoints import VOLATILE_PARAMS, make_request_key
+from ..exceptions import ReplayMissError
+
+
+@dataclass
+class ReplayEntry:
+    """
+    A recorded exchange.
+
+    Attributes:
+        method: The HTTP method of the request.
+        url: The URL of the request.
+        key: The key of the request built by `make_request_key`.
+        status_code: The status code of the response.
+        headers: The headers of the response.
+        body: The SHA-1 digest of the body, bodies are stored once per archive.
+    """
+
+    method: str
+    url: str
+    key: str
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: str = ""
+
+
+class ThrottledStream(io.BytesIO):
+    """
+    A readable body which delivers no more than `bandwidth` bytes per second.
+    """
+
+    def __init__(self, content: bytes, bandwidth: Optional[float] = None):
+        super().__init__(content)
+        self.bandwidth = bandwidth
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        chunk = super().read(size)
+        if self.bandwidth and chunk:
+            time.sleep(len(chunk) / self.bandwidth)
+        return chunk
+
+
+class ReplayArchive:
+    """
+    A collection of recorded requests and responses stored in a compact ZIP archive.
+
+    The archive contains "index.json" with the recorded exchanges in order and one deflated file per distinct body.
+    When the same request was recorded several times, the responses are replayed in the recorded order
+    and the last one is repeated afterwards.
+
+    Usage::
+
+        >>> from HDrezka.transport import ReplayArchive
+        >>>
+        >>> archive = ReplayArchive.load("rezka_traffic.zip")
+        >>> print(len(archive), archive.size)
+    """
+
+    def __init__(self):
+        self.entries: List[ReplayEntry] = []
+        self.bodies: Dict[str, bytes] = {}
+        self._index: Dict[str, List[ReplayEntry]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """
+        :return: The total size of the distinct bodies in bytes.
+        """
+        return sum(len(body) for body in self.bodies.values())
+
+    @staticmethod
+    def make_key(method: str, url: Union[str, bytes], kwargs: Mapping[str, Any]) -> str:
+        """
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of the request, the cache-busting `VOLATILE_PARAMS` are ignored.
+        :return: The key of the request in the archive.
+        """
+        return make_request_key(method, url, kwargs, ignored_params=VOLATILE_PARAMS)
+
+    def add_entry(self, entry: ReplayEntry, content: bytes):
+        with self._lock:
+            self.bodies.setdefault(entry.body, content)
+            self.entries.append(entry)
+            self._index.setdefault(entry.key, []).append(entry)
+
+    def record(self, method: str, url: Union[str, bytes], kwargs: Mapping[str, Any], response: Any) -> ReplayEntry:
+        """
+        Adds the response to the archive, the body of the response is read completely.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of the request.
+        :param response: The response of the server.
+        :return: The recorded entry.
+        """
+        content = response.content
+        entry = ReplayEntry(
+            method=method.upper(),
+            url=url.decode("utf-8") if isinstance(url, bytes) else str(url),
+            key=self.make_key(method, url, kwargs),
+            status_code=response.status_code,
+            headers={k: v for k, v in response.headers.items() if k.lower() not in TRANSFER_HEADERS},
+            body=hashlib.sha1(content).hexdigest(),
+        )
+        self.add_entry(entry, content)
+        return entry
+
+    def find(self, method: str, url: Union[str, bytes], kwargs: Mapping[str, Any]) -> ReplayEntry:
+        """
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of the request.
+        :raise ReplayMissError: If the request was not recorded.
+        :return: The next recorded entry of the request.
+        """
+        key = self.make_key(method, url, kwargs)
+        with self._lock:
+            entries = self._index.get(key)
+            if not entries:
+                raise ReplayMissError(f"The request {method.upper()} {url!r} is missing from the archive.")
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            return entries[min(cursor, len(entries) - 1)]
+
+    def rewind(self):
+        """
+        Starts replaying every request from its first recorded response.
+        """
+        with self._lock:
+            self._cursors.clear()
+
+    def save(self, path: Union[str, Any]):
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("index.json", json.dumps([asdict(entry) for entry in self.entries], ensure_ascii=False))
+            for digest, content in self.bodies.items():
+                archive.writestr(f"bodies/{digest}", content)
+
+    @classmethod
+    def load(cls, path: Union[str, Any]) -> ReplayArchive:
+        instance = cls()
+        with zipfile.ZipFile(path, "r") as archive:
+            for item in json.loads(archive.read("index.json").decode("utf-8")):
+                entry = ReplayEntry(**item)
+                content = instance.bodies.get(entry.body)
+                instance.add_entry(entry, content if content is not None else archive.read(f"bodies/{entry.body}"))
+        return instance
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"<ReplayArchive({len(self.entries)} entries)>"
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Iterable, Optional, Tuple, Type, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # pragma: NO COVER
+    httpx = None
+
+ResponseType = TypeVar("ResponseType")
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504, 520, 521, 522, 524)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+# AJAX endpoints of the site that only read data, so repeating the POST request is safe
+IDEMPOTENT_POST_PATHS = (
+    "/ajax/get_cdn_series/",
+    "/ajax/get_comments/",
+    "/ajax/person_info/",
+    "/engine/ajax/quick_content.php",
+    "/engine/ajax/gettrailervideo.php",
+)
+RETRY_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+if httpx is not None:
+    RETRY_EXCEPTIONS += (httpx.TransportError,)
+
+
+class RetryStatistics:
+    """
+    Thread-safe counters describing the work done by a `RetryPolicy`.
+
+    Attributes:
+        requests: The number of requests that went through the policy.
+        attempts: The total number of attempts, including the first one of every request.
+        retries: The number of repeated attempts.
+        failures: The number of requests that were still failing after the last attempt.
+        statuses: A counter of the status codes that caused a retry.
+        exceptions: A counter of the exception names that caused a retry.
+        time_in_failed_attempts: Seconds spent waiting for attempts that were retried afterwards.
+        time_in_backoff: Seconds spent sleeping between attempts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.statuses: Counter = Counter()
+        self.exceptions: Counter = Counter()
+        self.time_in_failed_attempts = 0.0
+        self.time_in_backoff = 0.0
+
+    @property
+    def time_retrying(self) -> float:
+        """
+        :return: The total number of seconds lost because of failed attempts and backoff.
+        """
+        return self.time_in_failed_attempts + self.time_in_backoff
+
+    def record(self, **increments: Any):
+        """
+        Atomically increases the given counters.
+
+        :param increments: Counter names mapped to the values to be added.
+        """
+        with self._lock:
+            for name, value in increments.items():
+                if name in ("statuses", "exceptions"):
+                    getattr(self, name)[value] += 1
+                else:
+                    setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "failures": self.failures,
+                "statuses": dict(self.statuses),
+                "exceptions": dict(self.exceptions),
+                "time_in_failed_attempts": self.time_in_failed_attempts,
+                "time_in_backoff": self.time_in_backoff,
+            }
+
+    def __repr__(self):
+        return f"<RetryStatistics(requests={self.requests}, retries={self.retries}, failures={self.failures})>"
+
+
+class RetryPolicy:
+    """
+    Describes when and how a failed request is repeated.
+
+    A request is repeated if the server answered with one of `status_codes` or if the transport raised one of
+    `exceptions`. Before every new attempt the policy sleeps for an exponentially growing delay
+    (`backoff_factor * 2 ** (attempt - 1)`, limited by `max_backoff`) with full jitter, unless the server sent
+    a `Retry-After` header. Only idempotent requests are repeated: GET, HEAD and OPTIONS requests and POST
+    requests to the read-only AJAX endpoints listed in `idempotent_post_paths`.
+
+    Usage::
+
+        >>> from HDrezka.connector import NetworkClient
+        >>> from HDrezka.transport import RetryPolicy
+        >>>
+        >>> NetworkClient().retry_policy = RetryPolicy(max_attempts=5, backoff_factor=1)
+        >>> ...
+        >>> print(NetworkClient().retry_policy.statistics.time_retrying)
+    """
+
+    def __init__(  # pylint: disable=R0913
+            self,
+            *,
+            max_attempts: int = 3,
+            status_codes: Iterable[int] = RETRY_STATUS_CODES,
+            backoff_factor: float = 0.5,
+            max_backoff: float = 30,
+            jitter: bool = True,
+            respect_retry_after: bool = True,
+            idempotent_methods: Iterable[str] = IDEMPOTENT_METHODS,
+            idempotent_post_paths: Iterable[str] = IDEMPOTENT_POST_PATHS,
+            exceptions: Tuple[Type[BaseException], ...] = RETRY_EXCEPTIONS,
+    ):
+        """
+        Initialize a new instance of the class.
+
+        :param max_attempts: The maximum number of attempts per request, including the first one.
+        :param status_codes: The status codes after which the request is repeated.
+        :param backoff_factor: The delay in seconds before the second attempt, it doubles with each attempt.
+        :param max_backoff: The upper limit of a single delay in seconds, also applied to `Retry-After`.
+        :param jitter: Whether to randomize the delay between zero and the computed value.
+        :param respect_retry_after: Whether to wait as long as the `Retry-After` header asks.
+        :param idempotent_methods: The HTTP methods that are always safe to repeat.
+        :param idempotent_post_paths: The URL paths for which POST requests are safe to repeat.
+        :param exceptions: The transport exceptions after which the request is repeated.
+        """
+        if max_attempts < 1:
+            raise ValueError(f'Attribute "max_attempts" must be greater than 0, received "{max_attempts}".')
+        self.max_attempts = max_attempts
+        self.status_codes = frozenset(status_codes)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+        self.idempotent_methods = frozenset(m.upper() for m in idempotent_methods)
+        self.idempotent_post_paths = frozenset(idempotent_post_paths)
+        self.exceptions = exceptions
+        self.statistics = RetryStatistics()
+
+    def is_idempotent(self, method: str, url: str) -> bool:
+        """
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :return: True if the request can be safely repeated.
+        """
+        method = method.upper()
+        if method in self.idempotent_methods:
+            return True
+        return method == "POST" and urlsplit(str(url)).path in self.idempotent_post_paths
+
+    def get_backoff(self, attempt: int) -> float:
+        """
+        :param attempt: The number of the attempt that has just failed, starting from 1.
+        :return: The delay in seconds before the next attempt.
+        """
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def get_retry_after(self, response: Any) -> Optional[float]:
+        """
+        Parses the `Retry-After` header, which may contain either a number of seconds or an HTTP date.
+
+        :param response: The response of the failed attempt.
+        :return: The delay in seconds requested by the server or None if there is no valid header.
+        """
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return min(float(value), self.max_backoff)
+        try:
+            retry_date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return min(max(retry_date.timestamp() - time.time(), 0.0), self.max_backoff)
+
+    def get_delay(self, attempt: int, response: Any = None) -> float:
+        """
+        :param attempt: The number of the attempt that has just failed, starting from 1.
+        :param response: The response of the failed attempt, if there is one.
+        :return: The delay in seconds before the next attempt.
+        """
+        retry_after = self.get_retry_after(response) if self.respect_retry_after else None
+        return retry_after if retry_after is not None else self.get_backoff(attempt)
+
+    def _is_final(self, response: Any, attempt: int, max_attempts: int) -> bool:
+        retryable = response.status_code in self.status_codes
+        if retryable and attempt >= max_attempts:
+            self.statistics.record(failures=1)
+        elif retryable:
+            self.statistics.record(statuses=response.status_code)
+        return not retryable or attempt >= max_attempts
+
+    def _check_exception(self, exc: BaseException, attempt: int, max_attempts: int):
+        if attempt >= max_attempts:
+            self.statistics.record(failures=1)
+            raise exc
+        self.statistics.record(exceptions=type(exc).__name__)
+
+    def _complete_attempt(self, attempt: int, response: Any, start_time: float) -> float:
+        delay = self.get_delay(attempt, response)
+        self.statistics.record(retries=1, time_in_failed_attempts=time.monotonic() - start_time, time_in_backoff=delay)
+        return delay
+
+    def execute(self, method: str, url: str, send: Callable[[], ResponseType]) -> ResponseType:
+        """
+        Calls `send` until it returns a successful response or the attempts are over.
+        If the last attempt still has a retryable status code, its response is returned.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param send: A function that performs a single attempt and returns the response.
+        :return: The response of the last attempt.
+        """
+        max_attempts = self.max_attempts if self.is_idempotent(method, url) else 1
+        self.statistics.record(requests=1)
+        for attempt in range(1, max_attempts + 1):
+            self.statistics.record(attempts=1)
+            start_time = time.monotonic()
+            response = None
+            try:
+                response = send()
+            except self.exceptions as exc:
+                self._check_exception(exc, attempt, max_attempts)
+            else:
+                if self._is_final(response, attempt, max_attempts):
+                    return response
+                response.close()
+            time.sleep(self._complete_attempt(attempt, response, start_time))
+        raise AssertionError("unreachable")  # pragma: NO COVER
+
+    async def aexecute(self, method: str, url: str, send: Callable[[], Awaitable[ResponseType]]) -> ResponseType:
+        """
+        The asynchronous version of `execute`, `send` must return an awaitable.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param send: A function that performs a single attempt and returns an awaitable response.
+        :return: The response of the last attempt.
+        """
+        max_attempts = self.max_attempts if self.is_idempotent(method, url) else 1
+        self.statistics.record(requests=1)
+        for attempt in range(1, max_attempts + 1):
+            self.statistics.record(attempts=1)
+            start_time = time.monotonic()
+            response = None
+            try:
+                response = await send()
+            except self.exceptions as exc:
+                self._check_exception(exc, attempt, max_attempts)
+            else:
+                if self._is_final(response, attempt, max_attempts):
+                    return response
+            await asyncio.sleep(self._complete_attempt(attempt, response, start_time))
+        raise AssertionError("unreachable")  # pragma: NO COVER
+
+    def __repr__(self):
+        return f"<RetryPolicy(max_attempts={self.max_attempts})>"
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .endpoints import EndpointType, determine_endpoint_type
+
+# Типы, которые при отсутствии собственного правила направляются по правилу общего типа
+FALLBACK_TYPES = {
+    EndpointType.cdn_series: EndpointType.ajax,
+    EndpointType.comments: EndpointType.ajax,
+}
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    The path requests of one endpoint type are sent by.
+
+    Attributes:
+        base_url: The scheme, host and optional path prefix the requests are sent to,
+            e.g. "http://127.0.0.1:8080" or "https://edge.example/rezka". None sends requests directly.
+        preserve_host: Whether the Host, Origin and Referer headers keep pointing to the original host,
+            which is what a reverse proxy needs to select the upstream.
+    """
+
+    base_url: Optional[str] = None
+    preserve_host: bool = True
+
+    def rewrite(self, url: str) -> str:
+        """
+        Moves the URL to `base_url` keeping its path, query and fragment.
+
+        :param url: An absolute URL.
+        :return: The URL of the route or the original URL if the route is direct.
+        """
+        if self.base_url is None:
+            return url
+        base = urlsplit(self.base_url)
+        url_split = urlsplit(url)
+        path = base.path.rstrip("/") + url_split.path
+        return url_split._replace(scheme=base.scheme, netloc=base.netloc, path=path).geturl()
+
+
+class EndpointRouter:
+    """
+    Routes every class of traffic (HTML pages, AJAX endpoints, static files, CDN video) by its own path.
+
+    The endpoint type of a request is determined by `determine_endpoint_type`, the "cdn_series" and "comments"
+    types fall back to the "ajax" rule. Types without a rule are sent directly. The rewriting happens right
+    before the request is sent, after the mirror pool has chosen a mirror and the governor has classified
+    the request, so the other policies see the original URL.
+
+    Usage::
+
+        >>> from HDrezka.connector import NetworkClient
+        >>> from HDrezka.transport import EndpointRouter, EndpointType, Route
+        >>>
+        >>> NetworkClient().router = EndpointRouter({
+        >>>     EndpointType.page: Route("http://127.0.0.1:3128"),
+        >>>     EndpointType.ajax: "http://127.0.0.1:3128",
+        >>> })
+    """
+
+    def __init__(self, routes: Optional[Mapping[EndpointType, Union[Route, str, None]]] = None):
+        """
+        Initialize a new instance of the class.
+
+        :param routes: The route of each endpoint type, a string is the `base_url` of a `Route`.
+        """
+        self.routes: Dict[EndpointType, Route] = {}
+        for endpoint_type, route in (routes or {}).items():
+            self.set_route(endpoint_type, route)
+        self.statistics: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def set_route(self, endpoint_type: EndpointType, route: Union[Route, str, None]):
+        """
+        Sets the route of the endpoint type.
+
+        :param endpoint_type: The endpoint type.
+        :param route: The route, its base URL or None to send requests of the type directly.
+        """
+        if not isinstance(route, Route):
+            route = Route(route)
+        if route.base_url is not None and not urlsplit(route.base_url).netloc:
+            raise ValueError(f'Attribute "base_url" must be an absolute URL, got "{route.base_url}".')
+        self.routes[EndpointType(endpoint_type)] = route
+
+    def get_route(self, url: Union[str, bytes], domain: Optional[str] = None) -> Route:
+        """
+        :param url: The URL of the request.
+        :param domain: The domain of the site.
+        :return: The route of the request.
+        """
+        endpoint_type = determine_endpoint_type(url, domain)
+        route = self.routes.get(endpoint_type)
+        if route is None and endpoint_type in FALLBACK_TYPES:
+            route = self.routes.get(FALLBACK_TYPES[endpoint_type])
+        return route or Route()
+
+    def resolve(self, url: Union[str, bytes], domain: Optional[str] = None) -> Tuple[str, Route]:
+        """
+        Determines where the request has to be sent.
+
+        :param url: The URL of the request.
+        :param domain: The domain of the site.
+        :return: The URL to send the request to and its route.
+        """
+        url = url.decode("utf-8") if isinstance(url, bytes) else url
+        route = self.get_route(url, domain)
+        routed_url = route.rewrite(url)
+        with self._lock:
+            self.statistics[route.base_url or "direct"] += 1
+        return routed_url, route
+
+    def prepare(self, url: Union[str, bytes], kwargs: Dict[str, Any], connector: Any) -> Tuple[str, Dict[str, Any]]:
+        """
+        Rewrites the request for its route.
+
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of the request.
+        :param connector: The connector sending the request, it provides the domain and the default headers.
+        :return: The URL and the keyword arguments to send the request with.
+        """
+        url = url.decode("utf-8") if isinstance(url, bytes) else url
+        routed_url, route = self.resolve(url, connector.get_site_domain(url))
+        if routed_url != url and route.preserve_host and kwargs.get("headers") is None:
+            kwargs = {**kwargs, "headers": connector.get_headers(url)}
+        return routed_url, kwargs
+
+    def __repr__(self):
+        routes = ", ".join(f"{t.name}={r.base_url!r}" for t, r in self.routes.items())
+        return f"<EndpointRouter({routes})>"
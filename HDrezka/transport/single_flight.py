@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional, TypeVar, Union
+from urllib.parse import urlsplit
+
+from .endpoints import make_request_key
+from .retry import IDEMPOTENT_METHODS, IDEMPOTENT_POST_PATHS
+
+ResponseType = TypeVar("ResponseType")
+
+
+class _Call:
+    """
+    A request in flight which the other threads are waiting for.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.exception: Optional[BaseException] = None
+
+
+class SingleFlightStatistics:
+    """
+    Thread-safe counters of a `SingleFlight`.
+
+    Attributes:
+        requests: The number of requests that could be coalesced.
+        sent: The number of requests that were actually sent.
+        deduplicated: The number of requests that received the response of another identical request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.sent = 0
+        self.deduplicated = 0
+
+    def record(self, **increments: int):
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self):
+        with self._lock:
+            return {"requests": self.requests, "sent": self.sent, "deduplicated": self.deduplicated}
+
+    def __repr__(self):
+        return f"<SingleFlightStatistics(requests={self.requests}, deduplicated={self.deduplicated})>"
+
+
+class SingleFlight:
+    """
+    Coalesces identical requests that are in flight at the same time.
+
+    The first request becomes the leader and is sent to the network, identical requests made before it
+    completes wait for it and receive the same response object (or the same exception). Requests are identical
+    if they have the same method, URL, query parameters, body and headers. Only GET requests and POST requests
+    of the read-only AJAX endpoints are coalesced, streamed requests are always sent separately.
+    Threads and coroutines are coalesced separately, coroutines only within one event loop.
+
+    Usage::
+
+        >>> from HDrezka.connector import NetworkClient
+        >>> from HDrezka.transport import SingleFlight
+        >>>
+        >>> NetworkClient().single_flight = SingleFlight()
+        >>> ...
+        >>> print(NetworkClient().single_flight.statistics.deduplicated)
+    """
+
+    def __init__(
+            self,
+            methods: Iterable[str] = IDEMPOTENT_METHODS,
+            post_paths: Iterable[str] = IDEMPOTENT_POST_PATHS,
+    ):
+        """
+        Initialize a new instance of the class.
+
+        :param methods: The HTTP methods of the requests that are coalesced.
+        :param post_paths: The URL paths for which POST requests are coalesced.
+        """
+        self.methods = frozenset(m.upper() for m in methods)
+        self.post_paths = frozenset(post_paths)
+        self.statistics = SingleFlightStatistics()
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        # Запросы ключуются по самому циклу событий: id() закрытого цикла может достаться новому
+        self._async_calls: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def in_flight(self) -> int:
+        """
+        :return: The number of distinct requests currently in flight.
+        """
+        with self._lock:
+            return len(self._calls) + sum(len(calls) for calls in self._async_calls.values())
+
+    def is_coalescable(self, method: str, url: Union[str, bytes], kwargs: Mapping[str, Any]) -> bool:
+        method = method.upper()
+        if kwargs.get("stream"):
+            return False
+        if method in self.methods:
+            return True
+        url = url.decode("utf-8") if isinstance(url, bytes) else url
+        return method == "POST" and urlsplit(url).path in self.post_paths
+
+    @staticmethod
+    def make_key(method: str, url: Union[str, bytes], kwargs: Mapping[str, Any]) -> str:
+        headers = kwargs.get("headers")
+        kwargs = {**kwargs, "headers": dict(headers) if headers is not None else None}
+        return make_request_key(method, url, kwargs, ("params", "data", "json", "headers"))
+
+    def execute(
+            self, method: str, url: Union[str, bytes], kwargs: Mapping[str, Any], send: Callable[[], ResponseType]
+    ) -> ResponseType:
+        """
+        Sends the request or waits for the identical request in flight.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of the request.
+        :param send: A function that sends the request and returns the response.
+        :return: The response shared by all identical requests.
+        """
+        if not self.is_coalescable(method, url, kwargs):
+            return send()
+        key = self.make_key(method, url, kwargs)
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+        self.statistics.record(requests=1, sent=int(is_leader), deduplicated=int(not is_leader))
+        if not is_leader:
+            call.event.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+        try:
+            call.result = send()
+        except BaseException as exc:
+            call.exception = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    async def aexecute(
+            self,
+            method: str,
+            url: Union[str, bytes],
+            kwargs: Mapping[str, Any],
+            send: Callable[[], Awaitable[ResponseType]],
+    ) -> ResponseType:
+        """
+        The asynchronous version of `execute`, `send` must return an awaitable.
+
+        :param method: The HTTP method of the request.
+        :param url: The URL of the request.
+        :param kwargs: The keyword arguments of the request.
+        :param send: A function that sends the request and returns an awaitable response.
+        :return: The response shared by all identical requests.
+        """
+        if not self.is_coalescable(method, url, kwargs):
+            return await send()
+        loop = asyncio.get_running_loop()
+        key = self.make_key(method, url, kwargs)
+        with self._lock:
+            calls = self._async_calls.get(loop)
+            if calls is None:
+                calls = self._async_calls[loop] = {}
+            future = calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = calls[key] = loop.create_future()
+        self.statistics.record(requests=1, sent=int(is_leader), deduplicated=int(not is_leader))
+        if not is_leader:
+            # shield не даёт отмене одного ожидающего отменить общий запрос
+            return await asyncio.shield(future)
+        try:
+            result = await send()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # Помечаем исключение полученным, если никто больше не ждал этот запрос
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del calls[key]
+        return result
+
+    def __repr__(self):
+        return f"<SingleFlight(in_flight={self.in_flight})>"
@@ -3,7 +3,8 @@ from __future__ import annotations
 import re
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import TYPE_CHECKING, List, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
 from urllib import parse
 
 if TYPE_CHECKING:
@@ -57,9 +58,41 @@ REGEX_QUERY = (
 REGEX_FRAGMENT = r"(?:akter|aktrisa|hudozhnik|kompozitor|montazher|operator|prodyuser|rezhisser|scenarist)"
 REGEX_MOVIE_FRAGMENT = r"t:\d+-s:\d+-e:\d+"
 
+# Все шаблоны пути объединены в одну альтернативу: при fullmatch альтернативы перебираются по порядку,
+# поэтому совпадает та же первая группа, что и при последовательной проверке URL_REGEX_DICT
+URL_PATH_REGEX = re.compile("|".join(f"(?P<{url_type.name}>{pattern})" for url_type, pattern in URL_REGEX_DICT.items()))
+URL_QUERY_REGEX = re.compile(REGEX_QUERY)
+URL_FRAGMENT_REGEX = re.compile(REGEX_FRAGMENT)
+URL_MOVIE_FRAGMENT_REGEX = re.compile(REGEX_MOVIE_FRAGMENT)
+
+REGEX_TIME = re.compile(r"(\d{2}:\d{2})")
+REGEX_DATETIME = re.compile(r"(сегодня|вчера|\d+ [А-я]+ \d{4})?,?\s?(\d{2}:\d{2})")
+REGEX_DATE = re.compile(r"^(\d{1,2})?\s?([А-я]+?)?,?\s?(\d{4})?\s?(года?|-\s\.{3}|-\s\d{4})?$")
+MONTHS = {
+    name: number
+    for number, names in enumerate((
+        (),
+        ("январь", "января"),
+        ("февраль", "февраля"),
+        ("март", "марта"),
+        ("апрель", "апреля"),
+        ("май", "мая"),
+        ("июнь", "июня"),
+        ("июль", "июля"),
+        ("август", "августа"),
+        ("сентябрь", "сентября"),
+        ("октябрь", "октября"),
+        ("ноябрь", "ноября"),
+        ("декабрь", "декабря"),
+    ))
+    for name in names
+}
 
+
+@lru_cache(maxsize=16384)
 def determine_url_type(url: str) -> URLsType:
     """Determines the type of URL passed in using regular expressions.
+    The results are cached, so the URLs met repeatedly are classified once.
 
     :param url:
         The URL to be checked for its type.
@@ -83,24 +116,25 @@ def determine_url_type(url: str) -> URLsType:
     url_split = parse.urlsplit(url)
     if url_split.path == "":
         return URLsType.main
-    if re.fullmatch(REGEX_QUERY, url_split.query):
+    if URL_QUERY_REGEX.fullmatch(url_split.query):
         return URLsType.poster
-    if re.fullmatch(REGEX_FRAGMENT, url_split.fragment):
-        return URLsType.person_info
-    if re.fullmatch(REGEX_MOVIE_FRAGMENT, url_split.fragment):
-        return URLsType.movie
-    for page_type, pattern in URL_REGEX_DICT.items():
-        if re.fullmatch(pattern, url_split.path):
-            return page_type
-    return URLsType.unknown
+    if url_split.fragment:
+        if URL_FRAGMENT_REGEX.fullmatch(url_split.fragment):
+            return URLsType.person_info
+        if URL_MOVIE_FRAGMENT_REGEX.fullmatch(url_split.fragment):
+            return URLsType.movie
+    match = URL_PATH_REGEX.fullmatch(url_split.path)
+    return URLsType[match.lastgroup] if match else URLsType.unknown
 
 
-def extract_datetime(datetime_string: str) -> datetime:
+def extract_datetime(datetime_string: str, today: Optional[datetime] = None) -> datetime:
     """Using regular expressions, extracts a date from a string
     and converts it into a datetime object.
 
     :param datetime_string:
         A string representing a datetime in a specific format.
+    :param today:
+        The midnight of the current day the relative dates are counted from, the current date if None.
     :raise ValueError:
         If the datetime_string is not recognized as datetime string.
     :return:
@@ -114,22 +148,24 @@ def extract_datetime(datetime_string: str) -> datetime:
         >>> print(result)
         2021-07-27 10:30:00
     """
-    match = re.search(r"(сегодня|вчера|\d+ [А-я]+ \d{4})?,?\s?(\d{2}:\d{2})", datetime_string)
+    match = REGEX_DATETIME.search(datetime_string)
 
     if not match:
         raise ValueError(f"No match found for string: {datetime_string}")
 
     date_string, time_string = match.groups()
     hours, minutes = map(int, time_string.strip().split(":"))
-    return extract_date(date_string) + timedelta(hours=hours, minutes=minutes)
+    return extract_date(date_string, today) + timedelta(hours=hours, minutes=minutes)
 
 
-def extract_date(datetime_string: str) -> datetime:
+def extract_date(datetime_string: str, today: Optional[datetime] = None) -> datetime:
     """Using regular expressions, extracts a date from a string
     and converts it into a date object.
 
     :param datetime_string:
         A string representing a datetime in a specific format.
+    :param today:
+        The midnight of the current day the relative dates are counted from, the current date if None.
     :raise ValueError:
         If the datetime_string is not recognized as date string,
         or if it is not possible to correctly determine the month.
@@ -144,12 +180,12 @@ def extract_date(datetime_string: str) -> datetime:
         >>> print(result)
         2021-07-27 00:00:00
     """
-    if datetime_string == "сегодня":
-        return datetime.combine(datetime.now(), datetime.min.time())
-    if datetime_string == "вчера":
-        return datetime.combine(datetime.now(), datetime.min.time()) - timedelta(days=1)
+    if datetime_string in ("сегодня", "вчера"):
+        if today is None:
+            today = datetime.combine(datetime.now(), datetime.min.time())
+        return today if datetime_string == "сегодня" else today - timedelta(days=1)
 
-    match = re.search(r"^(\d{1,2})?\s?([А-я]+?)?,?\s?(\d{4})?\s?(года?|-\s\.{3}|-\s\d{4})?$", datetime_string)
+    match = REGEX_DATE.search(datetime_string)
 
     if not match or all(x is None for x in match.groups()):
         raise ValueError(f"No match found for string: {datetime_string}")
@@ -157,26 +193,10 @@ def extract_date(datetime_string: str) -> datetime:
     day, month, year, _ = match.groups()
 
     year = 1 if year is None else int(year)
-    month_name = (
-        ("",),
-        ("январь", "января"),
-        ("февраль", "февраля"),
-        ("март", "марта"),
-        ("апрель", "апреля"),
-        ("май", "мая"),
-        ("июнь", "июня"),
-        ("июль", "июля"),
-        ("август", "августа"),
-        ("сентябрь", "сентября"),
-        ("октябрь", "октября"),
-        ("ноябрь", "ноября"),
-        ("декабрь", "декабря"),
-    )
     if month is not None:
-        month_num = [month_name.index(m) for m in month_name if month in m]
-        if len(month_num) != 1:
+        if month not in MONTHS:
             raise ValueError(f"Unexpected month name: {month}")
-        month = month_num[0]
+        month = MONTHS[month]
     else:
         month = 1
     day = int(day) if day is not None else 1
@@ -184,12 +204,14 @@ def extract_date(datetime_string: str) -> datetime:
     return datetime(year=year, month=month, day=day)
 
 
-def convert_string_into_datetime(datetime_string: str) -> Optional[datetime]:
+def convert_string_into_datetime(datetime_string: str, today: Optional[datetime] = None) -> Optional[datetime]:
     """Convert a string into a datetime object.
     Automatically determines which method to use `extract_datetime` or `extract_date`.
 
     :param datetime_string:
         A string representing a datetime in a specific format.
+    :param today:
+        The midnight of the current day the relative dates are counted from, the current date if None.
     :raise ValueError:
         If the datetime_string is not recognized as date string,
         or if it is not possible to correctly determine the month.
@@ -206,9 +228,39 @@ def convert_string_into_datetime(datetime_string: str) -> Optional[datetime]:
     """
     if datetime_string is None or datetime_string == "":
         return None
-    if re.search(r"(\d{2}:\d{2})", datetime_string):
-        return extract_datetime(datetime_string)
-    return extract_date(datetime_string)
+    if REGEX_TIME.search(datetime_string):
+        return extract_datetime(datetime_string, today)
+    return extract_date(datetime_string, today)
+
+
+def convert_strings_into_datetimes(datetime_strings: Iterable[Optional[str]]) -> List[Optional[datetime]]:
+    """Convert many strings into datetime objects at once, as `convert_string_into_datetime` does.
+    The relative dates of the whole batch are counted from the same day
+    and every distinct string is converted only once.
+
+    :param datetime_strings:
+        The strings representing a datetime in a specific format.
+    :raise ValueError:
+        If one of the strings is not recognized as date string,
+        or if it is not possible to correctly determine the month.
+    :return:
+        The datetime objects in the order of the strings, None for None and empty strings.
+
+    Usage::
+
+        >>> from HDrezka.utility import convert_strings_into_datetimes
+        >>> result = convert_strings_into_datetimes(["сегодня, 10:30", "12 мая 2023 14:01", ""])
+        >>> print(result)
+        [datetime.datetime(2021, 7, 27, 10, 30), datetime.datetime(2023, 5, 12, 14, 1), None]
+    """
+    today = datetime.combine(datetime.now(), datetime.min.time())
+    converted: Dict[Optional[str], Optional[datetime]] = {}
+    result = []
+    for datetime_string in datetime_strings:
+        if datetime_string not in converted:
+            converted[datetime_string] = convert_string_into_datetime(datetime_string, today)
+        result.append(converted[datetime_string])
+    return result
 
 
 def calculate_count_comments(comments_list: List[Comment]) -> int:
@@ -0,0 +1,67 @@
+"""
+Compares `PlayerBuilder.decode_video_urls` with the implementation it replaced, which checked every trash
+insertion with `in`, rebuilt the alternation for each `re.sub` pass and matched the qualities and the URLs
+with uncompiled patterns.
+
+The streams are encoded as the site sends them, with the trash inserted between parts of the base64 string,
+for films with the usual four qualities and for the larger strings with every quality the site offers.
+The benchmark reports the time per string of both implementations and checks that their results are identical::
+
+    python -m benchmarks.decode_video_urls --streams 20000
+"""
+import argparse
+import base64
+import json
+import re
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from HDrezka.player.movie_player_builder import PlayerBuilder, TRASH_LIST
+from benchmarks.parsers import QUALITIES, encode_streams
+
+
+def legacy_decode_video_urls(encoded_string: Union[str, False]) -> Dict[str, List[str]]:
+    if encoded_string is False:
+        return {}
+
+    while any(substring in encoded_string for substring in TRASH_LIST):
+        encoded_string = re.sub("|".join(map(re.escape, TRASH_LIST)), "", encoded_string)
+
+    decoded_string = base64.b64decode(encoded_string.replace("#h", "", 1)).decode("utf-8")
+    urls_container = {}
+    for line in decoded_string.split(","):
+        quality_name = re.search(r"\[.*?]", line)[0]
+        quality_urls = line[len(quality_name):]
+        filtered_urls = [url for url in re.split(r"\sor\s", quality_urls) if re.match(r"https?://.*\.mp4$", url)]
+        urls_container[quality_name[1:-1]] = filtered_urls
+    return urls_container
+
+
+def measure(decoder: Callable[[str], Dict[str, List[str]]], streams: List[str]) -> Tuple[float, list]:
+    start_time = time.perf_counter()
+    result = [decoder(item) for item in streams]
+    return (time.perf_counter() - start_time) / len(streams) * 1e6, result
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Time of decoding the streams of the player.")
+    parser.add_argument("--streams", type=int, default=20000, help="number of strings of every size")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, qualities in (("film", QUALITIES[:4]), ("all_qualities", QUALITIES)):
+        streams = [encode_streams(movie_id, qualities) for movie_id in range(args.streams)]
+        legacy_time, legacy_result = measure(legacy_decode_video_urls, streams)
+        current_time, current_result = measure(PlayerBuilder.decode_video_urls, streams)
+        results[name] = {
+            "string_length": round(sum(map(len, streams)) / len(streams)),
+            "legacy_us_per_string": round(legacy_time, 2),
+            "current_us_per_string": round(current_time, 2),
+            "speedup": round(legacy_time / current_time, 2),
+            "identical_urls": legacy_result == current_result,
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Measures the memory footprint and the time of building a `MovieDetails` from a movie page in the default
+and the lean modes of `HTMLDocument` and with both parser backends.
+
+Every page of `tests/mock_html/reference_movie_html.json` is given to the builder as the body of a response:
+
+* ``default`` decodes the body into a string (as `response.text` does) and keeps it in `HTMLDocument.html`;
+* ``lean`` decodes the body too, but drops the string after parsing and keeps only the player scripts;
+* ``streamed`` feeds the body chunk by chunk into the incremental parser, as `Connector.stream_pages` does;
+* ``lxml`` and ``lxml-streamed`` are ``default`` and ``streamed`` with `ParserBackend.lxml`.
+
+For every mode the benchmark reports the peak of the memory allocated while the page is parsed and the details
+are built, the memory still held while the builder and its document are alive, and the memory held by
+the `MovieDetails` alone. The trees of `ParserBackend.lxml` are allocated by libxml2 and are not seen by
+tracemalloc, so for those modes only the time and the Python objects are comparable. It also checks that
+all modes produce identical details::
+
+    python -m benchmarks.html_memory --repeat 3
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from HDrezka.html_representation import HTMLDocument, ParserBackend, STREAM_CHUNK_SIZE
+from HDrezka.movie_page_descriptor import MovieDetailsBuilder
+from tests.mock_html.html_construcror import read_reference_file
+
+MODES: Dict[str, Callable[[bytes], HTMLDocument]] = {
+    "default": lambda body: HTMLDocument(body.decode("utf-8")),
+    "lean": lambda body: HTMLDocument(body.decode("utf-8"), lean=True),
+    "streamed": lambda body: HTMLDocument.from_chunks(
+        body[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(body), STREAM_CHUNK_SIZE)
+    ),
+    "lxml": lambda body: HTMLDocument(body.decode("utf-8"), backend=ParserBackend.lxml),
+    "lxml-streamed": lambda body: HTMLDocument.from_chunks(
+        (body[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(body), STREAM_CHUNK_SIZE)), backend=ParserBackend.lxml
+    ),
+}
+
+
+def dump(details: Any) -> str:
+    return json.dumps(details, default=lambda x: x.__dict__ if not isinstance(x, (datetime, date)) else str(x))
+
+
+def measure(make_document: Callable[[bytes], HTMLDocument], body: bytes) -> Dict[str, Any]:
+    """
+    :return: The memory allocated while building the details of one page, in bytes, and the dumped details.
+    """
+    gc.collect()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start_time = time.perf_counter()
+    builder = MovieDetailsBuilder(make_document(body))
+    details = builder.extract_content()
+    elapsed = time.perf_counter() - start_time
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    with_document = current - baseline
+    del builder
+    gc.collect()
+    return {
+        "peak": peak - baseline,
+        "with_document": with_document,
+        "details": tracemalloc.get_traced_memory()[0] - baseline,
+        "seconds": elapsed,
+        "dump": dump(details),
+    }
+
+
+def run(mode: str, pages: List[bytes], repeat: int) -> Dict[str, Any]:
+    totals = {"peak": 0, "with_document": 0, "details": 0, "seconds": 0.0}
+    dumps = []
+    for _ in range(repeat):
+        dumps = []
+        for body in pages:
+            result = measure(MODES[mode], body)
+            dumps.append(result.pop("dump"))
+            for name, value in result.items():
+                totals[name] += value
+    count = len(pages) * repeat
+    return {
+        "peak_kib": round(totals["peak"] / count / 1024, 1),
+        "with_document_kib": round(totals["with_document"] / count / 1024, 1),
+        "details_kib": round(totals["details"] / count / 1024, 1),
+        "ms_per_page": round(totals["seconds"] / count * 1000, 2),
+        "dumps": dumps,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Memory footprint of MovieDetails in the HTMLDocument modes and backends.")
+    parser.add_argument("--repeat", type=int, default=1, help="number of passes over the reference pages")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    args = parser.parse_args(argv)
+
+    pages = [html.encode("utf-8") for html in read_reference_file("reference_movie_html.json").values()]
+    tracemalloc.start()
+    try:
+        results = {mode: run(mode, pages, args.repeat) for mode in args.modes}
+    finally:
+        tracemalloc.stop()
+
+    dumps = [result.pop("dumps") for result in results.values()]
+    print(json.dumps({
+        "pages": len(pages),
+        "mean_page_kib": round(sum(map(len, pages)) / len(pages) / 1024, 1),
+        "identical_details": all(d == dumps[0] for d in dumps),
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
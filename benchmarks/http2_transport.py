@@ -0,0 +1,132 @@
+"""
+Compares the HTTP/2 connector with `RequestConnector` on the AJAX traffic of a serial enrichment.
+
+Every connector runs the same workload (`get_cdn_series`, `quick_content.php` and `person_info` POST requests
+sent from a pool of threads) wrapped in a recording `ReplayConnector`, so the benchmark also checks that the
+connectors received identical responses; `--save` writes the recorded traffic to archives for other benchmarks.
+The benchmark always talks to a live server, a replay would not exercise the transport at all.
+
+By default the requests go to an in-process `MockHDrezkaServer`, which speaks plain HTTP/1.1, so the default
+run compares only the connection handling of the connectors and no multiplexing takes place. HTTP/2 is
+negotiated only over TLS: use `--url` of a mirror that supports it and check "http_versions" in the output::
+
+    python -m benchmarks.http2_transport --movies 20 --workers 8
+    python -m benchmarks.http2_transport --url https://rezka.ag --save traffic
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from HDrezka.connector import Connector, HTTP2Connector, ReplayConnector, RequestConnector, SessionConnector
+from tests.mock_html.server import MockHDrezkaServer
+
+CONNECTORS = {"requests": RequestConnector, "session": SessionConnector, "http2": HTTP2Connector}
+
+
+def build_workload(base_url: str, movies: int, episodes: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    :return: The URL and the form of every request of the enrichment of `movies` serials.
+    """
+    workload = []
+    for movie_id in range(1, movies + 1):
+        workload.append((f"{base_url}/engine/ajax/quick_content.php", {"id": movie_id, "is_touch": 1}))
+        for episode in range(1, episodes + 1):
+            workload.append((
+                f"{base_url}/ajax/get_cdn_series/",
+                {"id": movie_id, "translator_id": 1, "season": 1, "episode": episode, "action": "get_stream"},
+            ))
+        for person in range(3):
+            workload.append((f"{base_url}/ajax/person_info/", {"id": movie_id * 10 + person, "pid": movie_id}))
+    return workload
+
+
+def run(connector: Connector, workload: List[Tuple[str, Dict[str, Any]]], workers: int) -> Dict[str, Any]:
+    recorder = ReplayConnector(connector.domain, record=True, connector=connector)
+    recorder.scheme = connector.scheme
+    latencies: List[float] = []
+    versions: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def send(request: Tuple[str, Dict[str, Any]]):
+        start_time = time.perf_counter()
+        response = recorder.post(request[0], data=request[1])
+        elapsed = time.perf_counter() - start_time
+        with lock:
+            latencies.append(elapsed)
+            version = getattr(response, "http_version", None) or "HTTP/1.1"
+            versions[version] = versions.get(version, 0) + 1
+
+    # Первый запрос создаёт клиент и SSL-контекст, его время не относится к передаче данных
+    recorder.post(workload[0][0], data=workload[0][1])
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(send, workload))
+    elapsed = time.perf_counter() - start_time
+    latencies.sort()
+    return {
+        "requests": len(workload),
+        "seconds": round(elapsed, 4),
+        "requests_per_second": round(len(workload) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2),
+        "http_versions": versions,
+        "archive": recorder.archive,
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]]) -> bool:
+    """
+    :return: True if every connector received the same bodies for the same requests.
+    """
+    digests = [sorted((e.key, e.body) for e in result["archive"].entries) for result in results.values()]
+    return all(d == digests[0] for d in digests)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="HTTP/2 connector vs RequestConnector on AJAX traffic.")
+    parser.add_argument("--url", help="base URL of the site, an in-process mock server by default")
+    parser.add_argument("--movies", type=int, default=10, help="number of serials to enrich")
+    parser.add_argument("--episodes", type=int, default=5, help="number of get_cdn_series calls per serial")
+    parser.add_argument("--workers", type=int, default=8, help="number of threads sending requests")
+    parser.add_argument("--latency", type=float, default=0.005, help="delay of the mock server in seconds")
+    parser.add_argument("--connectors", nargs="+", default=["requests", "http2"], choices=sorted(CONNECTORS))
+    parser.add_argument("--save", help="directory to save the recorded traffic of every connector to")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server = MockHDrezkaServer(latency=args.latency).start()
+        base_url = server.url
+    url_split = urlsplit(base_url)
+    workload = build_workload(base_url.rstrip("/"), args.movies, args.episodes)
+
+    results = {}
+    try:
+        for name in args.connectors:
+            connector = CONNECTORS[name](url_split.netloc)
+            connector.scheme = url_split.scheme
+            results[name] = run(connector, workload, args.workers)
+            if hasattr(connector, "close"):
+                connector.close()
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.save:
+        os.makedirs(args.save, exist_ok=True)
+        for name, result in results.items():
+            result["archive"].save(os.path.join(args.save, f"{name}.zip"))
+    identical = compare(results)
+    for result in results.values():
+        del result["archive"]
+    print(json.dumps({"identical_responses": identical, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
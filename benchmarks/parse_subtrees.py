@@ -0,0 +1,112 @@
+"""
+Measures how much parsing only the subtrees a builder declares in `PageRepresentation.subtrees` saves
+compared with parsing the whole page with BeautifulSoup.
+
+`MovieDetailsBuilder` is run on every page of `tests/mock_html/reference_movie_html.json` and `PosterBuilder`
+on the generated category pages. For every builder the benchmark reports the time of parsing the page
+and of building the content, with and without the strainer, the number of elements in the tree, and
+whether both ways produce identical content::
+
+    python -m benchmarks.parse_subtrees --repeat 5 --chrome 150
+
+The reference pages keep only the main column of the site, while the live pages also contain the header,
+the menus and the footer. ``--chrome`` adds a synthetic menu of about the given size in KiB around
+the content of every page to approximate them.
+"""
+import argparse
+import json
+import re
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from HDrezka.html_representation import HTMLDocument, ParserBackend, PageRepresentation
+from HDrezka.movie_page_descriptor import MovieDetailsBuilder
+from HDrezka.movie_posters import PosterBuilder
+from tests.mock_html.html_construcror import generate_fake_html, read_reference_file
+
+POSTER_PAGES = ("films", "series", "cartoons", "animation", "best", "new", "announce")
+MENU_ITEM = '<li class="b-topnav__item"><a class="b-topnav__item-link" href="/films/{n}/">Раздел {n}</a>' \
+            '<div class="b-topnav__sub"><ul class="left">{links}</ul></div></li>'
+MENU_LINK = '<li><a href="/films/{n}/{m}/" title="Жанр {m}">Жанр {m}</a></li>'
+
+
+def add_site_chrome(html: str, kib: int) -> str:
+    """
+    :return: The page with a header menu and a footer of about `kib` KiB in total.
+    """
+    items = []
+    size = 0
+    while size < kib * 1024:
+        links = "".join(MENU_LINK.format(n=len(items), m=m) for m in range(20))
+        items.append(MENU_ITEM.format(n=len(items), links=links))
+        size += len(items[-1].encode("utf-8"))
+    header = f'<div class="b-topnav__wrapper"><ul class="b-topnav">{"".join(items[::2])}</ul></div>'
+    footer = f'<div class="b-footer"><ul class="b-footer__menu">{"".join(items[1::2])}</ul></div>'
+    html = re.sub(r"(<body[^>]*>)", lambda m: m.group(1) + header, html, count=1)
+    return html.replace("</body>", f"{footer}</body>", 1)
+
+
+def dump(content: Any) -> str:
+    return json.dumps(content, default=lambda x: x.__dict__ if not isinstance(x, (datetime, date)) else str(x))
+
+
+def measure(builder: Type[PageRepresentation], html: str, strained: bool) -> Tuple[float, float, int, str]:
+    """
+    :return: The seconds spent on parsing and on building the content, the number of elements and the content.
+    """
+    start_time = time.perf_counter()
+    page = HTMLDocument(html, backend=ParserBackend.beautifulsoup, subtrees=builder.subtrees if strained else None)
+    parsed_time = time.perf_counter()
+    content = builder(page).extract_content()
+    built_time = time.perf_counter()
+    return parsed_time - start_time, built_time - parsed_time, len(page.soup.find_all(True)), dump(content)
+
+
+def run(builder: Type[PageRepresentation], pages: List[str], repeat: int) -> Dict[str, Any]:
+    results = {}
+    dumps = {}
+    for mode in ("full", "strained"):
+        parse_seconds = build_seconds = 0.0
+        elements = 0
+        dumps[mode] = []
+        for _ in range(repeat):
+            dumps[mode] = []
+            for html in pages:
+                parse_time, build_time, count, content = measure(builder, html, mode == "strained")
+                parse_seconds += parse_time
+                build_seconds += build_time
+                elements += count
+                dumps[mode].append(content)
+        count = len(pages) * repeat
+        results[mode] = {
+            "parse_ms_per_page": round(parse_seconds / count * 1000, 2),
+            "build_ms_per_page": round(build_seconds / count * 1000, 2),
+            "elements_per_page": round(elements / count),
+        }
+    results["parse_time_reduction"] = round(
+        1 - results["strained"]["parse_ms_per_page"] / results["full"]["parse_ms_per_page"], 3
+    )
+    results["identical_content"] = dumps["full"] == dumps["strained"]
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Parse time of the whole page and of the builder's subtrees.")
+    parser.add_argument("--repeat", type=int, default=1, help="number of passes over the pages")
+    parser.add_argument("--chrome", type=int, default=0, help="size of the synthetic menus in KiB")
+    args = parser.parse_args(argv)
+
+    movie_pages = list(read_reference_file("reference_movie_html.json").values())
+    poster_pages = [generate_fake_html(name)[1] for name in POSTER_PAGES]
+    if args.chrome:
+        movie_pages = [add_site_chrome(html, args.chrome) for html in movie_pages]
+        poster_pages = [add_site_chrome(html, args.chrome) for html in poster_pages]
+    print(json.dumps({
+        MovieDetailsBuilder.__name__: {"pages": len(movie_pages), **run(MovieDetailsBuilder, movie_pages, args.repeat)},
+        PosterBuilder.__name__: {"pages": len(poster_pages), **run(PosterBuilder, poster_pages, args.repeat)},
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
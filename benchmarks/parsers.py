@@ -0,0 +1,280 @@
+"""
+Micro-benchmarks of the parsers of the package on the fixtures of `tests/mock_html` and on synthetic pages
+scaled up from them:
+
+* ``PosterBuilder`` on the generated category pages and on pages with ``--scale`` times more posters;
+* ``MovieDetailsBuilder`` on every page of `reference_movie_html.json`;
+* ``InfoTableBuilder`` on the pages of `generate_info_table`;
+* ``PlayerBuilder.decode_video_urls`` on the streams of the mock server and on streams with ``--scale`` times
+  more qualities;
+* ``CommentsIterator.extreact_comments`` on a page of comments and on a page with ``--scale`` times more of them;
+* ``determine_url_type`` and ``convert_string_into_datetime`` on the URLs and the dates found in the fixtures,
+  the classifier is timed without its cache;
+* ``determine_url_type`` with its cache on the same URLs met five times each, starting from an empty cache;
+* ``convert_strings_into_datetimes`` on the dates of a dump of comments, where many of them repeat.
+
+Every case is run ``--repeat`` times and the best time is reported per call of the parser, in microseconds.
+With ``--history`` the results are appended to a JSON Lines file together with the current commit and compared
+with the last results recorded for another commit, a case slower than ``--threshold`` times is reported as
+a regression and the exit code is 1::
+
+    python -m benchmarks.parsers --repeat 5 --history benchmarks/history.jsonl
+    python -m benchmarks.parsers --case determine_url_type --case decode_video_urls
+"""
+import argparse
+import base64
+import json
+import os
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import bs4
+
+from HDrezka.comments import CommentsIterator
+from HDrezka.html_representation import HTMLDocument
+from HDrezka.movie_page_descriptor import MovieDetailsBuilder, InfoTableBuilder
+from HDrezka.movie_posters import PosterBuilder
+from HDrezka.player.movie_player_builder import PlayerBuilder, TRASH_LIST
+from HDrezka.utility import determine_url_type, convert_string_into_datetime, convert_strings_into_datetimes
+from tests.mock_html.html_construcror import (
+    NO_AVATAR,
+    convert_datetime_into_string,
+    generate_comment,
+    generate_fake_html,
+    generate_poster_html,
+    read_reference_file,
+)
+from tests.mock_html.page_html_constructor import generate_info_table
+
+# Кейс возвращает функцию для замера и число вызовов парсера за один её запуск
+Case = Callable[[int], Tuple[Callable[[], Any], int]]
+
+POSTER_PAGES = ("films", "series", "cartoons", "animation", "best", "new", "announce")
+QUALITIES = ("360p", "480p", "720p", "1080p", "1080p Ultra", "2K", "4K")
+URLS = (
+    "https://rezka.ag/",
+    "https://rezka.ag/page/1/",
+    "https://rezka.ag/page/3/",
+    "https://rezka.ag/films/",
+    "https://rezka.ag/films/best/2021/page/2/",
+    "https://rezka.ag/series/drama/",
+    "https://rezka.ag/ua/cartoons/best/fantasy/",
+    "https://rezka.ag/country/%D0%A1%D0%A8%D0%90/",
+    "https://rezka.ag/year/2020/",
+    "https://rezka.ag/collections/",
+    "https://rezka.ag/collections/page/4/",
+    "https://rezka.ag/collections/123-pro-drakonov/",
+    "https://rezka.ag/qa/",
+    "https://rezka.ag/qa/films/123-vopros.html",
+    "https://rezka.ag/franchises/",
+    "https://rezka.ag/franchises/12-topor/",
+    "https://rezka.ag/person/123-person-name/",
+    "https://rezka.ag/person/123-person-name/#akter",
+    "https://rezka.ag/films/drama/123-film-2020.html#t:1-s:1-e:5",
+    "https://rezka.ag/?filter=popular&genre=1",
+    "https://rezka.ag/index.php?do=search&subaction=search&q=топор",
+    "https://rezka.ag/unknown/path",
+)
+DATES = (
+    "сегодня, 10:30",
+    "вчера, 23:59",
+    "12 мая 2023 14:01",
+    "1 января 2020",
+    "февраль 2021",
+    "2019 год",
+    "25 декабря 2022 года",
+    "3 марта 2018 - ...",
+)
+
+
+def scale_posters(scale: int) -> Tuple[Callable[[], Any], int]:
+    # generate_poster_html изменяет переданные постеры, поэтому каждая копия генерируется заново
+    pages = [
+        HTMLDocument(generate_poster_html([poster for _ in range(scale) for poster in generate_fake_html(name)[0]]))
+        for name in POSTER_PAGES
+    ]
+    return lambda: [PosterBuilder(page).extract_content() for page in pages], len(pages)
+
+
+def posters(_: int) -> Tuple[Callable[[], Any], int]:
+    pages = [generate_fake_html(name)[1] for name in POSTER_PAGES]
+    return lambda: [PosterBuilder(html).extract_content() for html in pages], len(pages)
+
+
+def movie_details(_: int) -> Tuple[Callable[[], Any], int]:
+    pages = list(read_reference_file("reference_movie_html.json").values())
+    return lambda: [MovieDetailsBuilder(html).extract_content() for html in pages], len(pages)
+
+
+def info_table(_: int) -> Tuple[Callable[[], Any], int]:
+    pages = [HTMLDocument(html) for _, html in generate_info_table()]
+    return lambda: [InfoTableBuilder(page).extract_content() for page in pages], len(pages)
+
+
+def encode_streams(movie_id: int, qualities: Iterable[str]) -> str:
+    """
+    :return: The encoded streams in the form the site sends them in, with the trash inserted several times.
+    """
+    urls = ",".join(f"[{q}]https://stream.voidboost.cc/{movie_id}/{q}.mp4:hls:manifest.m3u8 or "
+                    f"https://stream.voidboost.cc/{movie_id}/{q}.mp4" for q in qualities)
+    encoded = base64.b64encode(urls.encode("utf-8")).decode("utf-8")
+    step = max(len(encoded) // len(TRASH_LIST), 1)
+    parts = [encoded[i:i + step] for i in range(0, len(encoded), step)]
+    return "#h" + "".join(part + TRASH_LIST[i % len(TRASH_LIST)] for i, part in enumerate(parts[:-1])) + parts[-1]
+
+
+def decode_video_urls(_: int) -> Tuple[Callable[[], Any], int]:
+    streams = [encode_streams(movie_id, QUALITIES[:4]) for movie_id in range(100)]
+    return lambda: [PlayerBuilder.decode_video_urls(item) for item in streams], len(streams)
+
+
+def scale_decode_video_urls(scale: int) -> Tuple[Callable[[], Any], int]:
+    streams = encode_streams(1, [f"{q} {n}" for n in range(scale) for q in QUALITIES])
+    return lambda: PlayerBuilder.decode_video_urls(streams), 1
+
+
+def generate_comments(number: int, depth: int = 2) -> List[Dict[str, Any]]:
+    start = datetime(2023, 5, 10, 12, 0, 0)
+    return [{
+        "id": depth * 100000 + n,
+        "author": {"name": f"user{n}", "img_url": NO_AVATAR},
+        "timestamp": (start - timedelta(minutes=n * 37)).strftime("%Y-%m-%d %H:%M:%S"),
+        "text": f"Комментарий {n} <spoiler>спойлер</spoiler> https://rezka.ag/films/{n}-film.html",
+        "likes_num": n % 4,
+        "edit": n % 7 == 0,
+        "replies": generate_comments(2, depth - 1) if depth and n % 3 == 0 else [],
+    } for n in range(number)]
+
+
+def extreact_comments(scale: int) -> Tuple[Callable[[], Any], int]:
+    soup = bs4.BeautifulSoup(generate_comment(generate_comments(20 * scale)), "lxml")
+    iterator = CommentsIterator(1)
+    return lambda: iterator.extreact_comments(soup), 1
+
+
+def generate_urls(scale: int) -> List[str]:
+    urls = list(URLS) + [poster["url"] for name in POSTER_PAGES for poster in generate_fake_html(name)[0]]
+    return [url if n == 0 else url.replace("rezka.ag", f"rezka{n}.ag") for n in range(scale) for url in urls]
+
+
+def url_type(scale: int) -> Tuple[Callable[[], Any], int]:
+    # Классификатор без кеша: после первого повтора все URL оказались бы в кеше и замерялись бы только попадания
+    classify = determine_url_type.__wrapped__
+    urls = generate_urls(scale)
+    return lambda: [classify(url) for url in urls], len(urls)
+
+
+def cached_url_type(scale: int) -> Tuple[Callable[[], Any], int]:
+    # Каждый URL встречается несколько раз, как ссылки на разных страницах; кеш очищается перед каждым запуском
+    urls = [url for url in generate_urls(scale) for _ in range(5)]
+
+    def classify():
+        determine_url_type.cache_clear()
+        return [determine_url_type(url) for url in urls]
+
+    return classify, len(urls)
+
+
+def generate_datetime_strings(scale: int) -> List[str]:
+    start = datetime(2023, 5, 10, 12, 0, 0)
+    return list(DATES) + [
+        convert_datetime_into_string((start - timedelta(hours=n * 7)).strftime("%Y-%m-%d %H:%M:%S"))
+        for n in range(len(DATES) * (scale - 1))
+    ]
+
+
+def datetime_strings(scale: int) -> Tuple[Callable[[], Any], int]:
+    strings = generate_datetime_strings(scale)
+    return lambda: [convert_string_into_datetime(item) for item in strings], len(strings)
+
+
+def comment_dates(scale: int) -> Tuple[Callable[[], Any], int]:
+    # Даты комментариев большой выгрузки: у многих комментариев одна и та же минута
+    strings = [item for item in generate_datetime_strings(scale) for _ in range(5)]
+    return lambda: convert_strings_into_datetimes(strings), len(strings)
+
+
+CASES: Dict[str, Case] = {
+    "PosterBuilder": posters,
+    "PosterBuilder_scaled": scale_posters,
+    "MovieDetailsBuilder": movie_details,
+    "InfoTableBuilder": info_table,
+    "decode_video_urls": decode_video_urls,
+    "decode_video_urls_scaled": scale_decode_video_urls,
+    "extreact_comments": lambda _: extreact_comments(1),
+    "extreact_comments_scaled": extreact_comments,
+    "determine_url_type": url_type,
+    "determine_url_type_cached": cached_url_type,
+    "convert_string_into_datetime": datetime_strings,
+    "convert_strings_into_datetimes": comment_dates,
+}
+
+
+def measure(case: Case, scale: int, repeat: int) -> Dict[str, float]:
+    function, calls = case(scale)
+    seconds = min(timeit.repeat(function, number=1, repeat=repeat))
+    return {"us_per_call": round(seconds / calls * 1e6, 2), "calls": calls}
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, check=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(history: str, record: Dict[str, Any], threshold: float) -> Dict[str, Dict[str, float]]:
+    """
+    Appends the record to the history and compares it with the last record of another commit.
+
+    :return: The cases slower than `threshold` times with the previous and the current time.
+    """
+    previous = None
+    if os.path.exists(history):
+        with open(history, encoding="utf-8") as file:
+            records = [json.loads(line) for line in file if line.strip()]
+        previous = next((item for item in reversed(records) if item["commit"] != record["commit"]), None)
+    with open(history, "a", encoding="utf-8") as file:
+        file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    regressions = {}
+    if previous is None or previous["scale"] != record["scale"]:
+        return regressions
+    for name, result in record["results"].items():
+        before = previous["results"].get(name)
+        if before is not None and result["us_per_call"] > before["us_per_call"] * threshold:
+            regressions[name] = {"before": before["us_per_call"], "after": result["us_per_call"]}
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Time of the parsers on the fixtures and the scaled pages.")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs of every case, the best is taken")
+    parser.add_argument("--scale", type=int, default=10, help="how many times the scaled pages are larger")
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="run only the given cases")
+    parser.add_argument("--history", help="JSON Lines file to record the results in and compare them with")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    record = {
+        "commit": current_commit(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "scale": args.scale,
+        "results": {name: measure(CASES[name], args.scale, args.repeat) for name in args.case or CASES},
+    }
+    if args.history:
+        record["regressions"] = compare(args.history, record, args.threshold)
+    print(json.dumps(record, indent=2, ensure_ascii=False))
+    return 1 if record.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Compares `determine_url_type` with the sequential implementation it replaced, which ran `re.fullmatch`
+over the patterns of `URL_REGEX_DICT` one by one.
+
+The benchmark classifies ``--urls`` URLs drawn at random from ``--unique`` distinct URLs, as a crawler meets
+the same links on many pages, and reports the time per URL of:
+
+* ``sequential`` - the previous implementation;
+* ``compiled`` - the combined precompiled pattern without the cache (`determine_url_type.__wrapped__`);
+* ``cached`` - `determine_url_type` itself, with the cache cleared before the run.
+
+It also checks that all of them classify every URL identically::
+
+    python -m benchmarks.url_classifier --urls 1000000 --unique 10000
+"""
+import argparse
+import json
+import random
+import re
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib import parse
+
+from HDrezka.utility import (
+    REGEX_FRAGMENT,
+    REGEX_MOVIE_FRAGMENT,
+    REGEX_QUERY,
+    URL_REGEX_DICT,
+    URLsType,
+    determine_url_type,
+)
+
+PATHS = (
+    "", "/", "/page/{n}/", "/films/", "/series/drama/page/{n}/", "/cartoons/best/{n}/", "/ua/animation/",
+    "/films/drama/{n}-film-{n}-2020.html", "/series/comedy/{n}-serial-{n}.html", "/collections/",
+    "/collections/{n}-podborka/", "/qa/", "/qa/page/{n}/", "/qa/vopros-{n}.html", "/franchises/",
+    "/franchises/{n}-franshiza/", "/person/{n}-person/", "/year/20{n}/", "/search/", "/unknown/{n}/",
+)
+SUFFIXES = ("", "", "", "#t:1-s:{n}-e:2", "#akter", "?filter=popular&genre={n}")
+
+
+def sequential_url_type(url: str) -> URLsType:
+    url_split = parse.urlsplit(url)
+    if url_split.path == "":
+        return URLsType.main
+    if re.fullmatch(REGEX_QUERY, url_split.query):
+        return URLsType.poster
+    if re.fullmatch(REGEX_FRAGMENT, url_split.fragment):
+        return URLsType.person_info
+    if re.fullmatch(REGEX_MOVIE_FRAGMENT, url_split.fragment):
+        return URLsType.movie
+    for page_type, pattern in URL_REGEX_DICT.items():
+        if re.fullmatch(pattern, url_split.path):
+            return page_type
+    return URLsType.unknown
+
+
+def generate_urls(number: int, unique: int, seed: int = 0) -> List[str]:
+    generator = random.Random(seed)
+    corpus = [
+        "https://rezka.ag" + generator.choice(PATHS).format(n=n % 97 + 2) + generator.choice(SUFFIXES).format(n=n)
+        for n in range(unique)
+    ]
+    return [generator.choice(corpus) for _ in range(number)]
+
+
+def measure(classifier: Callable[[str], URLsType], urls: List[str]) -> Tuple[Dict[str, float], List[URLsType]]:
+    start_time = time.perf_counter()
+    result = [classifier(url) for url in urls]
+    elapsed = time.perf_counter() - start_time
+    return {"us_per_url": round(elapsed / len(urls) * 1e6, 3), "total_seconds": round(elapsed, 2)}, result
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Time of the classification of URLs by determine_url_type.")
+    parser.add_argument("--urls", type=int, default=1000000, help="number of URLs to classify")
+    parser.add_argument("--unique", type=int, default=10000, help="number of distinct URLs among them")
+    args = parser.parse_args(argv)
+
+    urls = generate_urls(args.urls, args.unique)
+    determine_url_type.cache_clear()
+    results = {}
+    types = {}
+    for name, classifier in (
+            ("sequential", sequential_url_type),
+            ("compiled", determine_url_type.__wrapped__),
+            ("cached", determine_url_type),
+    ):
+        results[name], types[name] = measure(classifier, urls)
+    results["speedup_compiled"] = round(results["sequential"]["us_per_url"] / results["compiled"]["us_per_url"], 2)
+    results["speedup_cached"] = round(results["sequential"]["us_per_url"] / results["cached"]["us_per_url"], 2)
+    results["identical_types"] = types["sequential"] == types["compiled"] == types["cached"]
+    print(json.dumps({"urls": args.urls, "unique": args.unique, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
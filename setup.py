@@ -33,6 +33,7 @@ setup(
     include_package_data=True,
     python_requires=">=3.7",
     install_requires=requires,
+    extras_require={"async": ["httpx>=0.24.0"], "http2": ["httpx[http2]>=0.24.0"]},
     license=about["__license__"],
     keywords="hdrezka,hdrezka-api,rezka,rezka-api,movie,film,api",
     classifiers=[
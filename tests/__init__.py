@@ -5,12 +5,28 @@ from tests.test_best import TestBest
 from tests.test_cartoon import TestCartoons
 from tests.test_collections import TestCollections
 from tests.test_comments import TestCommentsIterator
+from tests.test_connector import *
 from tests.test_film import TestFilms
 from tests.test_html_representation import TestPageRepresentation
 from tests.test_meta_data import TestMetaData
 from tests.test_movie_page_descriptor import *
 from tests.test_new import TestNew
 from tests.test_page_representation import *
+from tests.test_retry import TestRetryPolicy
+from tests.test_rate_limit import TestRateLimit
+from tests.test_mirrors import TestMirrorPool
+from tests.test_cache import TestResponseCache
+from tests.test_single_flight import TestSingleFlight
+from tests.test_replay import TestReplayConnector
+from tests.test_mock_server import TestMockServer
+from tests.test_routing import TestEndpointRouter
+from tests.test_proxies import TestProxyPool
+from tests.test_circuit_breaker import TestCircuitBreaker
+from tests.test_http2_connector import TestHTTP2Connector
+from tests.test_metrics import TestInstrumentation
+from tests.test_parser_backend import TestParserBackend
+from tests.test_player_builder import TestDecodeVideoUrls
 from tests.test_search import TestSearch
 from tests.test_series import TestSeries
 from tests.test_trailer import TestTrailerBuilder
+from tests.test_utility import TestDetermineUrlType, TestConvertStringsIntoDatetimes
@@ -0,0 +1,420 @@
+"""
+A local stand-in of the site built on the HTML constructors of the tests.
+
+The server answers the same paths as the site: category pages with pagination, movie pages,
+the AJAX endpoints used by the library and range-capable fake MP4 files, so the whole stack can be
+benchmarked without the network. Run it standalone with::
+
+    python -m tests.mock_html.server --port 8080 --pages 50
+
+or in-process::
+
+    with MockHDrezkaServer(pages=50) as server:
+        with server.create_client().scope():
+            HDrezka().films().page(2).get()
+"""
+import argparse
+import base64
+import copy
+import json
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from tests.mock_html.html_construcror import (
+    NO_AVATAR,
+    generate_collections_html,
+    generate_comment,
+    generate_navigation_string,
+    generate_poster_html,
+    generate_trailer_info,
+    read_reference_file,
+)
+
+REZKA_URL = "https://rezka.ag"
+QUALITIES = ("360p", "480p", "720p", "1080p")
+TRASH = "//_//QEBAQEAhIyMhXl5e"
+MP4_HEADER = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom"
+REGEX_MOVIE_PATH = r"/(?:[0-9a-zA-Z-_]+/)+(\d+)(?:-.+?)+\.html"
+
+QUICK_CONTENT = '<div class="b-content__bubble_title"><a href="{url}">{title}</a></div>' \
+                '<div class="b-content__bubble_text"><i class="entity">{entity}</i></div>' \
+                '<div class="b-content__bubble_rates"><span class="imdb">IMDb: <b>7.1</b> <i>(1 234)</i></span>' \
+                '</div><div class="b-content__bubble_rating"><b>8.5</b> (123)</div>' \
+                '<div class="b-content__bubble_text">{description}</div>' \
+                '<div class="b-content__bubble_text"><span class="label">Жанр:</span> ' \
+                '<a href="{base_url}/films/drama/">Драмы</a>, <a href="{base_url}/films/comedy/">Комедии</a></div>' \
+                '<div class="b-content__bubble_text"><span class="label">Режиссер:</span> {directors}</div>' \
+                '<div class="b-content__bubble_text"><span class="label">В ролях:</span> {actors}</div>'
+QUICK_CONTENT_PERSON = '<span class="person-name-item" data-id="{id}" data-pid="{film_id}">' \
+                       '<a href="{base_url}/person/{id}-person-{id}/"><span>Person {id}</span></a></span>'
+SEASON_ITEM = '<li class="b-simple_season__item" data-tab_id="{season}">Сезон {season}</li>'
+EPISODES_LIST = '<ul class="b-simple_episodes__list clearfix" id="simple-episodes-list-{season}">{episodes}</ul>'
+EPISODE_ITEM = '<li class="b-simple_episode__item" data-id="{id}" data-season_id="{season}" ' \
+               'data-episode_id="{episode}">Серия {episode}</li>'
+
+
+class MockHDrezkaServer(ThreadingHTTPServer):
+    """
+    A threaded HTTP server imitating the site.
+
+    :param host: The interface to listen on.
+    :param port: The port to listen on, 0 selects a free port.
+    :param pages: The number of pages in every category.
+    :param comment_pages: The number of pages of comments of every movie.
+    :param comments_per_page: The number of comments on one page.
+    :param seasons: The number of seasons of every serial.
+    :param episodes: The number of episodes in every season.
+    :param video_size: The size of every fake MP4 file in bytes.
+    :param latency: The delay in seconds before every response.
+    """
+
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(  # pylint: disable=R0913
+            self,
+            host: str = "127.0.0.1",
+            port: int = 0,
+            *,
+            pages: int = 10,
+            comment_pages: int = 3,
+            comments_per_page: int = 20,
+            seasons: int = 2,
+            episodes: int = 10,
+            video_size: int = 2 ** 20,
+            latency: float = 0.0,
+    ):
+        super().__init__((host, port), MockHDrezkaHandler)
+        self.pages = pages
+        self.comment_pages = comment_pages
+        self.comments_per_page = comments_per_page
+        self.seasons = seasons
+        self.episodes = episodes
+        self.video_size = video_size
+        self.latency = latency
+        self.requests_count = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self._posters = read_reference_file("reference_posters.json")
+        movie_html = read_reference_file("reference_movie_html.json")
+        self._movies = {re.search(REGEX_MOVIE_PATH, self._og_url(html)).group(0): html for html in movie_html.values()}
+        self._movie_templates = [html for html in movie_html.values() if '"streams"' in html]
+        self._trailers = [response for _, response in generate_trailer_info()]
+        self._category_html: Dict[str, str] = {}
+
+    @property
+    def domain(self) -> str:
+        return f"{self.server_address[0]}:{self.server_address[1]}"
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.domain}"
+
+    def start(self) -> "MockHDrezkaServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def create_client(self, **kwargs: Any):
+        """
+        Creates a `NetworkClient` pointing to this server, make it current with `scope()`.
+        """
+        from HDrezka.connector import NetworkClient  # pylint: disable=C0415
+
+        client = NetworkClient.create(domain=self.domain, **kwargs)
+        client.scheme = "http"
+        return client
+
+    def count_request(self):
+        with self._lock:
+            self.requests_count += 1
+
+    def localize(self, text: str) -> str:
+        return text.replace(REZKA_URL, self.url).replace(REZKA_URL.replace("/", "\\/"), self.url.replace("/", "\\/"))
+
+    @staticmethod
+    def _og_url(html: str) -> str:
+        return re.search(r'<meta content="([^"]+)" property="og:url"', html).group(1)
+
+    def category_page(self, category: str, page: int) -> Optional[str]:
+        if category not in self._posters or not 1 <= page <= self.pages:
+            return None
+        if category not in self._category_html:
+            content = copy.deepcopy(self._posters[category])
+            if category == "collections":
+                self._category_html[category] = generate_collections_html(content)
+            else:
+                self._category_html[category] = generate_poster_html(content)
+        navigation = generate_navigation_string(0, page, 1, self.pages)
+        return self.localize(self._category_html[category].replace("</body>", f"{navigation}</body>"))
+
+    def movie_page(self, path: str, movie_id: int) -> str:
+        html = self._movies.get(path) or self._movie_templates[movie_id % len(self._movie_templates)]
+        streams = self.encode_streams(movie_id).replace("/", "\\/")
+        return self.localize(re.sub(r'"streams":"[^"]*"', lambda _: f'"streams":"{streams}"', html, count=1))
+
+    def encode_streams(self, movie_id: int) -> str:
+        urls = ",".join(f"[{q}]{self.url}/video/{movie_id}_{q}.mp4 or {self.url}/video/{movie_id}_{q}.mp4"
+                        for q in QUALITIES)
+        encoded = base64.b64encode(urls.encode("utf-8")).decode("utf-8")
+        return f"#h{encoded[:10]}{TRASH}{encoded[10:]}"
+
+    def cdn_series(self, form: Dict[str, str]) -> Dict[str, Any]:
+        movie_id = int(form.get("id", 0))
+        response = {
+            "success": True,
+            "message": "",
+            "url": self.encode_streams(movie_id),
+            "quality": "720p",
+            "subtitle": f"[Русский]{self.url}/video/{movie_id}_ru.vtt",
+            "subtitle_lns": {"Русский": "ru"},
+            "subtitle_def": "ru",
+            "thumbnails": "",
+        }
+        if form.get("action") == "get_episodes":
+            response["seasons"] = "".join(SEASON_ITEM.format(season=s) for s in range(1, self.seasons + 1))
+            response["episodes"] = "".join(
+                EPISODES_LIST.format(
+                    season=s,
+                    episodes="".join(EPISODE_ITEM.format(id=movie_id, season=s, episode=e)
+                                     for e in range(1, self.episodes + 1)),
+                )
+                for s in range(1, self.seasons + 1)
+            )
+        return response
+
+    def comments(self, film_id: int, page: int) -> Dict[str, Any]:
+        start = datetime(2023, 5, 10, 12, 0, 0)
+        comments = []
+        for number in range(self.comments_per_page):
+            comment_id = film_id * 10000 + page * 100 + number
+            comments.append({
+                "id": comment_id,
+                "author": {"name": f"user{number}", "img_url": NO_AVATAR},
+                "timestamp": (start - timedelta(minutes=comment_id % 5000)).strftime("%Y-%m-%d %H:%M:%S"),
+                "text": f"Комментарий {comment_id} <spoiler>спойлер</spoiler>",
+                "likes_num": number % 4,
+                "edit": number % 7 == 0,
+                "replies": [],
+            })
+        return {
+            "navigation": generate_navigation_string(film_id, page, 1, self.comment_pages),
+            "comments": generate_comment(comments),
+            "last_update_id": 0,
+        }
+
+    def quick_content(self, movie_id: int) -> str:
+        people = [QUICK_CONTENT_PERSON.format(id=movie_id * 10 + n, film_id=movie_id, base_url=self.url)
+                  for n in range(4)]
+        return QUICK_CONTENT.format(
+            url=f"{self.url}/films/drama/{movie_id}-movie-{movie_id}.html",
+            title=f"Movie {movie_id}",
+            entity="Фильм",
+            description=f"Описание фильма {movie_id}",
+            base_url=self.url,
+            directors=people[0],
+            actors=", ".join(people[1:]),
+        )
+
+    def trailer(self, movie_id: int) -> Dict[str, Any]:
+        response = dict(self._trailers[movie_id % len(self._trailers)])
+        return json.loads(self.localize(json.dumps(response)))
+
+    def person_info(self, person_id: int) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "person": {
+                "name": f"Person {person_id}",
+                "name_alt": f"Person {person_id}",
+                "person_height": None,
+                "birthday": "1 января 1970",
+                "birthplace": "Москва, СССР",
+                "age": "53 года",
+                "deathday": None,
+                "deathplace": None,
+                "agefull": None,
+                "stats": "Фильмы: 10",
+                "careers": "Актер",
+                "gender": "male",
+                "photos_count": "3",
+                "photo": NO_AVATAR,
+                "link": f"{self.url}/person/{person_id}-person-{person_id}/",
+            },
+        }
+
+    def video_chunk(self, start: int, end: int) -> bytes:
+        """
+        :return: The bytes of the fake MP4 file from `start` to `end` inclusive.
+        """
+        header = MP4_HEADER[start:end + 1]
+        offset = max(start, len(MP4_HEADER))
+        body = bytes((i & 0xFF for i in range(offset, end + 1)))
+        return header + body
+
+
+class MockHDrezkaHandler(BaseHTTPRequestHandler):
+    server: MockHDrezkaServer
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело пишутся отдельно, без этого keep-alive соединения ждали бы отложенный ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # pylint: disable=W0622
+        pass
+
+    def do_GET(self):  # pylint: disable=C0103
+        self._handle({})
+
+    def do_HEAD(self):  # pylint: disable=C0103
+        self._handle({})
+
+    def do_POST(self):  # pylint: disable=C0103
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8")
+        self._handle({k: v[-1] for k, v in parse_qs(body).items()})
+
+    def _handle(self, form: Dict[str, str]):
+        self.server.count_request()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        url_split = urlsplit(self.path)
+        path = url_split.path
+        query = {k: v[-1] for k, v in parse_qs(url_split.query).items()}
+
+        if path.startswith("/video/"):
+            return self._send_video(path)
+        if path == "/ajax/get_cdn_series/":
+            return self._send_json(self.server.cdn_series(form))
+        if path == "/ajax/get_comments/":
+            return self._send_json(self.server.comments(int(query.get("news_id", 0)), int(query.get("cstart", 1))))
+        if path == "/ajax/person_info/":
+            return self._send_json(self.server.person_info(int(form.get("id", 0))))
+        if path == "/engine/ajax/quick_content.php":
+            return self._send(200, self.server.quick_content(int(form.get("id", 0))))
+        if path == "/engine/ajax/gettrailervideo.php":
+            return self._send_json(self.server.trailer(int(form.get("id", 0))))
+
+        movie = re.fullmatch(REGEX_MOVIE_PATH, path)
+        if movie:
+            return self._send(200, self.server.movie_page(path, int(movie.group(1))))
+
+        page = re.search(r"/page/(\d+)/?$", path)
+        category = path.strip("/").split("/")[0] or "films"
+        html = self.server.category_page(category, int(page.group(1)) if page else 1)
+        if html is None:
+            return self._send(404, "<html><body>Not found</body></html>")
+        return self._send(200, html)
+
+    def _send(self, status: int, text: str, content_type: str = "text/html; charset=utf-8"):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_json(self, data: Dict[str, Any]):
+        self._send(200, json.dumps(data, ensure_ascii=False), "application/json; charset=utf-8")
+
+    def _parse_range(self, size: int) -> Optional[Tuple[int, int]]:
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+        if not match or not any(match.groups()):
+            return None
+        if not match.group(1):
+            return max(0, size - int(match.group(2))), size - 1
+        return int(match.group(1)), min(int(match.group(2)) if match.group(2) else size - 1, size - 1)
+
+    def _send_video(self, path: str):
+        size = self.server.video_size
+        if path.endswith(".vtt"):
+            return self._send(200, "WEBVTT\n\n00:00.000 --> 00:01.000\nСубтитры\n", "text/vtt; charset=utf-8")
+        byte_range = self._parse_range(size)
+        start, end = byte_range or (0, size - 1)
+        if start >= size or start > end:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+        self.send_response(206 if byte_range else 200)
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        if byte_range:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if self.command == "HEAD":
+            return None
+        for chunk_start in range(start, end + 1, 2 ** 16):
+            self.wfile.write(self.server.video_chunk(chunk_start, min(chunk_start + 2 ** 16 - 1, end)))
+        return None
+
+
+def crawl(server: MockHDrezkaServer, pages: int, workers: int) -> Dict[str, float]:
+    """
+    Crawls `pages` pages of films with their movie pages and quick content, returns the throughput figures.
+    """
+    from HDrezka.main_page import HDrezka  # pylint: disable=C0415
+
+    def worker(page: int) -> int:
+        with server.create_client().scope():
+            posters = HDrezka().films().page(page).get()
+            for poster in random.sample(posters, min(len(posters), 3)):
+                poster.quick_content()
+                poster.get()
+            return 1 + 2 * min(len(posters), 3)
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        requests_count = sum(executor.map(worker, range(1, pages + 1)))
+    elapsed = time.perf_counter() - start_time
+    return {"requests": requests_count, "seconds": elapsed, "requests_per_second": requests_count / elapsed}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Local stand-in HDrezka server for performance testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pages", type=int, default=10, help="number of pages in every category")
+    parser.add_argument("--video-size", type=int, default=2 ** 20, help="size of the fake MP4 files in bytes")
+    parser.add_argument("--latency", type=float, default=0.0, help="delay before every response in seconds")
+    parser.add_argument("--crawl", type=int, default=0, help="crawl this many pages of films and exit")
+    parser.add_argument("--workers", type=int, default=4, help="number of crawling threads")
+    args = parser.parse_args(argv)
+
+    server = MockHDrezkaServer(
+        args.host, args.port, pages=max(args.pages, args.crawl), video_size=args.video_size, latency=args.latency
+    )
+    if args.crawl:
+        with server:
+            print(json.dumps(crawl(server, args.crawl, args.workers)))
+        return
+    print(f"Serving on {server.url}, use NetworkClient(domain=\"{server.domain}\") with scheme \"http\"")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
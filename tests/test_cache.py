@@ -0,0 +1,157 @@
+import asyncio
+import time
+from unittest import TestCase, mock
+
+import httpx
+import requests_mock
+
+from HDrezka.comments import CommentsIterator
+from HDrezka.connector import AsyncConnector, NetworkClient, SessionConnector
+from HDrezka.transport import CachedResponse, EndpointType, MemoryCache, MirrorPool, ResponseCache, SQLiteCache
+from HDrezka.utility import URLsType
+
+
+class TestResponseCache(TestCase):
+    def setUp(self) -> None:
+        self.cache = ResponseCache()
+        self.connector = SessionConnector()
+        self.connector.cache = self.cache
+
+    def tearDown(self) -> None:
+        del self.cache
+        del self.connector
+
+    def test_ttl(self):
+        self.assertEqual(self.cache.get_ttl("https://rezka.ag/films/comedy/1-film.html"), 3600)
+        self.assertEqual(self.cache.get_ttl("https://rezka.ag/person/1-name/"), 86400)
+        self.assertEqual(self.cache.get_ttl("https://rezka.ag/films/"), 300)
+        self.assertEqual(self.cache.get_ttl("https://rezka.ag/ajax/get_comments/"), 300)
+        self.assertEqual(self.cache.get_ttl("https://rezka.ag/unknown.php"), 0)
+
+        cache = ResponseCache(ttl={URLsType.movie: 10, EndpointType.comments: 0})
+        self.assertEqual(cache.get_ttl("https://rezka.ag/films/comedy/1-film.html"), 10)
+        self.assertFalse(cache.is_cacheable("GET", "https://rezka.ag/ajax/get_comments/", {}))
+
+    def test_cacheable(self):
+        self.assertTrue(self.cache.is_cacheable("GET", "https://rezka.ag/films/", {}))
+        self.assertTrue(self.cache.is_cacheable("POST", "https://rezka.ag/engine/ajax/quick_content.php", {}))
+        self.assertFalse(self.cache.is_cacheable("POST", "https://rezka.ag/ajax/get_cdn_series/", {}))
+        self.assertFalse(self.cache.is_cacheable("POST", "https://rezka.ag/ajax/add_comment/", {}))
+        self.assertFalse(self.cache.is_cacheable("GET", "https://rezka.ag/films/", {"stream": True}))
+
+    def test_key(self):
+        url = "https://rezka.ag/engine/ajax/quick_content.php"
+        self.assertEqual(
+            ResponseCache.make_key("POST", url, {"data": {"id": 1, "is_touch": 1}}),
+            ResponseCache.make_key("post", url, {"data": {"is_touch": 1, "id": 1}}),
+        )
+        self.assertNotEqual(
+            ResponseCache.make_key("POST", url, {"data": {"id": 1}}),
+            ResponseCache.make_key("POST", url, {"data": {"id": 2}}),
+        )
+        self.assertNotEqual(ResponseCache.make_key("GET", url, {}), ResponseCache.make_key("POST", url, {}))
+
+    @requests_mock.Mocker()
+    def test_hit(self, m):
+        m.get("https://rezka.ag/films/comedy/1-film.html", text="movie")
+        m.post("https://rezka.ag/engine/ajax/quick_content.php", text="quick")
+        m.post("https://rezka.ag/ajax/get_cdn_series/", json={"success": True})
+
+        for _ in range(3):
+            self.assertEqual(self.connector.get("https://rezka.ag/films/comedy/1-film.html").text, "movie")
+            response = self.connector.post("https://rezka.ag/engine/ajax/quick_content.php", data={"id": 1})
+            self.assertEqual(response.text, "quick")
+            response = self.connector.post("https://rezka.ag/ajax/get_cdn_series/", data={"id": 1})
+            self.assertTrue(response.json()["success"])
+        self.assertEqual(m.call_count, 5)
+        statistics = {"hits": 4, "misses": 2, "revalidated": 0, "stores": 2, "bypassed": 3}
+        self.assertEqual(self.cache.statistics.as_dict(), statistics)
+
+    @requests_mock.Mocker()
+    def test_comments_hit(self, m):
+        comments = (
+            '<ol class="comments-tree-list"><li class="comments-tree-item" data-id="1"><div>'
+            '<div class="ava"><img src="https://static.hdrezka.ac/avatar.png"></div><span class="name">User</span>'
+            '<span class="date">оставлен 12 мая 2023 14:01</span><div class="text"><div>Text</div></div>'
+            '<span class="b-comment__likes_count">(<i>3</i>)</span></div></li></ol>'
+        )
+        m.get("https://rezka.ag/ajax/get_comments/", json={"success": True, "comments": comments, "navigation": ""})
+        client = NetworkClient.create()
+        client.adapter = self.connector
+
+        for offset in range(3):
+            with mock.patch("time.time", return_value=time.time() + offset):
+                self.assertEqual(CommentsIterator(1).use_client(client).get()[0].text, "Text")
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(self.cache.statistics.as_dict()["hits"], 2)
+        self.assertEqual(self.cache.statistics.as_dict()["stores"], 1)
+
+    @requests_mock.Mocker()
+    def test_errors_are_not_cached(self, m):
+        m.get("https://rezka.ag/films/comedy/1-film.html", [{"status_code": 503}, {"text": "movie"}])
+        self.assertEqual(self.connector.get("https://rezka.ag/films/comedy/1-film.html").status_code, 503)
+        self.assertEqual(self.connector.get("https://rezka.ag/films/comedy/1-film.html").text, "movie")
+
+    @requests_mock.Mocker()
+    def test_revalidation(self, m):
+        url = "https://rezka.ag/films/comedy/1-film.html"
+        m.get(url, [{"text": "movie", "headers": {"ETag": '"v1"'}}, {"status_code": 304}])
+        self.connector.get(url)
+
+        with mock.patch("time.time", return_value=time.time() + 7200):
+            response = self.connector.get(url)
+            self.assertEqual(m.last_request.headers["If-None-Match"], '"v1"')
+            self.assertEqual(m.last_request.headers["Host"], "rezka.ag")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.text, "movie")
+            self.connector.get(url)
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(self.cache.statistics.revalidated, 1)
+
+    @requests_mock.Mocker()
+    def test_revalidation_on_mirror(self, m):
+        url = "https://rezka.ag/films/comedy/1-film.html"
+        m.get(url, text="movie", headers={"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        m.get("https://hdrezka.ag/films/comedy/1-film.html", status_code=304)
+        self.connector.get(url)
+
+        self.connector.mirror_pool = MirrorPool(["rezka.ag", "hdrezka.ag"])
+        self.connector.mirror_pool.report_failure("rezka.ag")
+        with mock.patch("time.time", return_value=time.time() + 7200):
+            self.assertEqual(self.connector.get(url).text, "movie")
+        self.assertEqual(m.last_request.headers["Host"], "hdrezka.ag")
+        self.assertEqual(m.last_request.headers["If-Modified-Since"], "Wed, 21 Oct 2015 07:28:00 GMT")
+
+    def test_memory_lru(self):
+        backend = MemoryCache(maxsize=2)
+        for key in "abc":
+            backend.set(key, CachedResponse(key, 200))
+            backend.get("a")
+        self.assertIsNotNone(backend.get("a"))
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(len(backend), 2)
+
+    def test_sqlite(self):
+        backend = SQLiteCache(":memory:")
+        entry = CachedResponse("https://rezka.ag/", 200, {"ETag": '"v1"'}, "привет".encode(), "utf-8", 1.0, 2.0)
+        backend.set("key", entry)
+        self.assertEqual(backend.get("key"), entry)
+        backend.purge()
+        self.assertIsNone(backend.get("key"))
+        backend.close()
+
+    def test_async_hit(self):
+        calls = []
+
+        def handler(request: httpx.Request):
+            calls.append(request)
+            return httpx.Response(200, text="movie", headers={"Content-Encoding": "identity"})
+
+        connector = AsyncConnector(transport=httpx.MockTransport(handler))
+        connector.cache = self.cache
+
+        async def fetch():
+            return [await connector.get("https://rezka.ag/films/comedy/1-film.html") for _ in range(3)]
+
+        self.assertEqual([r.text for r in asyncio.run(fetch())], ["movie"] * 3)
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,80 @@
+import asyncio
+from unittest import TestCase, mock
+
+import httpx
+import requests
+import requests_mock
+
+from HDrezka.connector import AsyncConnector, SessionConnector
+from HDrezka.exceptions import CircuitOpenError, ServiceUnavailable
+from HDrezka.transport import CircuitBreaker, CircuitState, RetryPolicy
+
+CDN_SERIES_URL = "https://rezka.ag/ajax/get_cdn_series/"
+
+
+class TestCircuitBreaker(TestCase):
+    def setUp(self) -> None:
+        self.breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+        self.connector = SessionConnector()
+        self.connector.circuit_breaker = self.breaker
+        self.now = 1000.0
+        self.clock = mock.patch("HDrezka.transport.circuit_breaker.time.monotonic", side_effect=lambda: self.now)
+        self.clock.start()
+
+    def tearDown(self) -> None:
+        self.clock.stop()
+        del self.breaker
+        del self.connector
+
+    @requests_mock.Mocker()
+    def test_open_and_recover(self, m):
+        m.post(CDN_SERIES_URL, [{"status_code": 503}, {"exc": requests.exceptions.ReadTimeout}, {"json": {}}])
+        m.get("https://rezka.ag/ajax/get_comments/", json={})
+        self.assertEqual(self.connector.post(CDN_SERIES_URL).status_code, 503)
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.connector.post(CDN_SERIES_URL)
+        self.assertEqual(self.breaker.get_state(CDN_SERIES_URL), CircuitState.open)
+
+        with self.assertRaises(CircuitOpenError):
+            self.connector.post(CDN_SERIES_URL)
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(self.connector.get("https://rezka.ag/ajax/get_comments/").status_code, 200)
+
+        self.now += 30
+        self.assertEqual(self.breaker.get_state(CDN_SERIES_URL), CircuitState.half_open)
+        self.connector.post(CDN_SERIES_URL)
+        self.assertEqual(self.breaker.get_state(CDN_SERIES_URL), CircuitState.closed)
+        self.assertEqual(self.breaker.as_dict()["rezka.ag/ajax/get_cdn_series/"]["rejected"], 1)
+
+    def test_half_open_probes(self):
+        url = "https://rezka.ag/films/"
+        self.breaker.record(url, True)
+        self.breaker.record(url, True)
+        self.now += 31
+        self.breaker.before_request(url)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request(url)
+
+        self.breaker.record(url, True)
+        self.assertEqual(self.breaker.get_state(url), CircuitState.open)
+        self.assertIsInstance(CircuitOpenError(), ServiceUnavailable)
+
+    @requests_mock.Mocker()
+    def test_not_retried(self, m):
+        m.get("https://rezka.ag/films/", status_code=502)
+        self.connector.retry_policy = RetryPolicy(max_attempts=5, backoff_factor=0)
+        with self.assertRaises(CircuitOpenError):
+            self.connector.get("https://rezka.ag/films/")
+        self.assertEqual(m.call_count, 2)
+
+    def test_async_breaker(self):
+        connector = AsyncConnector(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+        connector.circuit_breaker = self.breaker
+
+        async def send():
+            for _ in range(2):
+                await connector.get("https://rezka.ag/")
+            await connector.get("https://rezka.ag/")
+
+        with self.assertRaises(CircuitOpenError):
+            asyncio.run(send())
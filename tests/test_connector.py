@@ -0,0 +1,232 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, mock
+
+import httpx
+import requests_mock
+
+from HDrezka.comments import CommentsIterator
+from HDrezka.connector import NetworkClient, AsyncConnector, SessionConnector
+from HDrezka.exceptions import ServiceUnavailable
+from HDrezka.main_page import HDrezka
+from HDrezka.site_navigation import Films
+from HDrezka.transport import RetryPolicy
+from tests.mock_html.html_construcror import generate_fake_html
+
+
+class TestSessionConnector(TestCase):
+    def test_default_connector(self):
+        self.assertIsInstance(NetworkClient().adapter, SessionConnector)
+
+    def test_proxies(self):
+        proxies = {"https": "http://127.0.0.1:3128"}
+        self.assertEqual(SessionConnector(proxies=proxies).proxies, proxies)
+
+    def test_pool_size(self):
+        connector = SessionConnector(pool_connections=3, pool_maxsize=7)
+        adapter = connector.adapters["https://"]
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 7)
+
+    @requests_mock.Mocker()
+    def test_headers_per_url(self, m):
+        connector = SessionConnector()
+        m.get("https://rezka.ag/films/", text="")
+        m.post("https://rezka.ag/films/", text="")
+        m.get("https://stream.voidboost.cc/movie.mp4", text="")
+
+        connector.get("https://rezka.ag/films/")
+        self.assertEqual(m.last_request.headers["Host"], "rezka.ag")
+        self.assertEqual(m.last_request.timeout, 15)
+
+        connector.get("https://stream.voidboost.cc/movie.mp4")
+        self.assertEqual(m.last_request.headers["Host"], "stream.voidboost.cc")
+
+        connector.post("https://rezka.ag/films/", headers={"Range": "bytes=0-"}, timeout=30)
+        self.assertNotIn("Host", m.last_request.headers)
+        self.assertEqual(m.last_request.timeout, 30)
+
+    @requests_mock.Mocker()
+    def test_expire_idle_connections(self, m):
+        m.get("https://rezka.ag/", text="")
+        connector = SessionConnector(keep_alive_timeout=60)
+        adapter = connector.adapters["https://"]
+
+        with mock.patch.object(adapter.poolmanager, "clear") as clear:
+            connector.get("https://rezka.ag/")
+            clear.assert_not_called()
+
+            connector._last_activity -= 61
+            connector.get("https://rezka.ag/")
+            clear.assert_called_once()
+
+
+class TestNetworkClientContext(TestCase):
+    def test_same_instance_in_context(self):
+        self.assertIs(NetworkClient(), NetworkClient())
+
+    def test_thread_owns_instance(self):
+        result = {}
+        thread = threading.Thread(target=lambda: result.setdefault("client", NetworkClient()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(result["client"], NetworkClient())
+
+    def test_thread_inherits_settings(self):
+        default_client = NetworkClient()
+        retry_policy = RetryPolicy()
+        domain, proxies = default_client.domain, default_client.proxies
+        default_client.domain = "hdrezka.me"
+        default_client.proxies = {"https": "http://127.0.0.1:3128"}
+        default_client.retry_policy = retry_policy
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                client = executor.submit(NetworkClient).result()
+        finally:
+            default_client.domain = domain
+            default_client.proxies = proxies
+            default_client.retry_policy = None
+        self.assertIsNot(client, default_client)
+        self.assertIsNot(client.adapter, default_client.adapter)
+        self.assertEqual(client.domain, "hdrezka.me")
+        self.assertEqual(client.proxies, {"https": "http://127.0.0.1:3128"})
+        self.assertIs(client.retry_policy, retry_policy)
+
+    def test_scope(self):
+        default_client = NetworkClient()
+        client = NetworkClient.create(domain="hdrezka.me")
+        self.assertIsNot(client, default_client)
+
+        with client.scope():
+            self.assertIs(NetworkClient(), client)
+            self.assertEqual(str(HDrezka().films()), "https://hdrezka.me/films/")
+        self.assertIs(NetworkClient(), default_client)
+        self.assertEqual(str(HDrezka().films()), "https://rezka.ag/films/")
+
+    def test_tasks_isolation(self):
+        async def worker(domain):
+            with NetworkClient.create(domain=domain).scope():
+                await asyncio.sleep(0)
+                return str(Films())
+
+        async def run():
+            return await asyncio.gather(worker("hdrezka.me"), worker("rezka.ag"), worker("hdrezka.ag"))
+
+        result = asyncio.run(run())
+        self.assertEqual(result, ["https://hdrezka.me/films/", "https://rezka.ag/films/", "https://hdrezka.ag/films/"])
+
+    def test_use_client(self):
+        client = NetworkClient.create(domain="hdrezka.me")
+        self.assertEqual(str(Films().use_client(client)), "https://hdrezka.me/films/")
+        self.assertEqual(str(HDrezka("https://hdrezka.ag/", client=client)), "https://hdrezka.ag/")
+        self.assertEqual(client.domain, "hdrezka.ag")
+        self.assertEqual(NetworkClient().domain, "rezka.ag")
+
+        rezka = HDrezka(client=client)
+        for iterator in (rezka.films(), rezka.new(), rezka.search("text"), rezka.series().find_best(year=2020)):
+            self.assertTrue(str(iterator).startswith("https://hdrezka.ag/"), iterator)
+
+
+class TestAsyncConnector(TestCase):
+    def setUp(self) -> None:
+        self.routes = {}
+        self.requests = []
+
+        def handler(request: httpx.Request):
+            self.requests.append(request)
+            status_code, text = self.routes.get(str(request.url).split("?")[0], (404, "Not found"))
+            return httpx.Response(status_code, text=text)
+
+        NetworkClient().async_adapter = AsyncConnector(transport=httpx.MockTransport(handler))
+
+    def tearDown(self) -> None:
+        NetworkClient().async_adapter = None
+        del self.routes
+        del self.requests
+
+    def test_default_headers(self):
+        self.routes["https://rezka.ag/films/"] = (200, "")
+        asyncio.run(NetworkClient().aget("https://rezka.ag/films/"))
+        self.assertEqual(self.requests[0].headers["Host"], "rezka.ag")
+        self.assertEqual(self.requests[0].headers["X-Requested-With"], "XMLHttpRequest")
+
+    def test_domain_forwarding(self):
+        client = NetworkClient()
+        client.async_adapter.domain = "rezka.ag"
+        try:
+            client.domain = "hdrezka.me"
+            self.assertEqual(client.async_adapter.url, "https://hdrezka.me")
+        finally:
+            client.domain = "rezka.ag"
+
+    def test_positive_aget_url(self):
+        reference_data, text = generate_fake_html("films")
+        self.routes["https://rezka.ag/films/"] = (200, text)
+
+        films_list = asyncio.run(HDrezka().aget("https://rezka.ag/films/"))
+        self.assertListEqual(reference_data, json.loads(json.dumps(films_list, default=lambda x: x.__dict__)))
+
+    def test_async_iteration(self):
+        reference_data, text = generate_fake_html("films")
+        self.routes["https://rezka.ag/films/"] = (200, text)
+        self.routes["https://rezka.ag/films/page/2/"] = (200, text)
+
+        async def collect():
+            return [page async for page in Films().page(1)]
+
+        result = asyncio.run(collect())
+        self.assertEqual(len(result), 1)
+        self.assertListEqual(reference_data, json.loads(json.dumps(result[0], default=lambda x: x.__dict__)))
+
+    def test_gather_pages(self):
+        _, text = generate_fake_html("films")
+        for page in range(2, 12):
+            self.routes[f"https://rezka.ag/films/page/{page}/"] = (200, text)
+
+        async def gather():
+            return await asyncio.gather(*(Films().page(page).aget() for page in range(2, 12)))
+
+        self.assertEqual(len(asyncio.run(gather())), 10)
+        self.assertEqual(len(self.requests), 10)
+
+    def test_loop_change_closes_client(self):
+        self.routes["https://rezka.ag/films/"] = (200, "")
+        connector = NetworkClient().async_adapter
+        asyncio.run(connector.get("https://rezka.ag/films/"))
+        first = connector._client  # noqa
+        asyncio.run(connector.get("https://rezka.ag/films/"))
+        self.assertTrue(first.is_closed)
+        self.assertIsNot(connector._client, first)  # noqa
+        self.assertEqual(connector._retired_clients, [])  # noqa
+
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(connector.get("https://rezka.ag/films/"), loop).result()
+            second = connector._client  # noqa
+            asyncio.run(connector.get("https://rezka.ag/films/"))
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result()
+            self.assertTrue(second.is_closed)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        asyncio.run(connector.close())
+
+    def test_proxy_mounts(self):
+        connector = AsyncConnector(proxies={"https": "http://127.0.0.1:3128"})
+
+        async def get_mounts():
+            return connector.client._mounts  # noqa
+
+        mounts = asyncio.run(get_mounts())
+        self.assertEqual([str(pattern.pattern) for pattern in mounts], ["https://"])
+        self.assertEqual(len(list(filter(None, mounts.values()))), 1)
+
+    def test_negative_comments_aget(self):
+        self.routes["https://rezka.ag/ajax/get_comments/"] = (504, "request fall")
+        with self.assertRaises(ServiceUnavailable):
+            asyncio.run(CommentsIterator(43477).aget(1))
@@ -1,10 +1,21 @@
 import io
+import json
+from datetime import datetime, date
 from unittest import TestCase
 
 import requests_mock
 
 from HDrezka.connector import NetworkClient
-from HDrezka.html_representation import PageRepresentation
+from HDrezka.html_representation import HTMLDocument, PageRepresentation
+from HDrezka.main_page import HDrezka
+from HDrezka.movie_page_descriptor import MovieDetails, MovieDetailsBuilder
+from HDrezka.player import PlayerBuilder
+from tests.mock_html.html_construcror import read_reference_file
+from tests.mock_html.server import MockHDrezkaServer
+
+
+def dump(data) -> str:
+    return json.dumps(data, default=lambda x: x.__dict__ if not isinstance(x, (datetime, date)) else str(x))
 
 
 class TestPageRepresentation(TestCase):
@@ -38,3 +49,83 @@ class TestPageRepresentation(TestCase):
     def test_negative_html_content(self):
         with self.assertRaises(TypeError):
             PageRepresentation(1234567890)  # noqa
+
+    def test_incremental_parsing(self):
+        data = self.html.encode("utf-8")
+        page = HTMLDocument.from_chunks(data[i:i + 5] for i in range(0, len(data), 5))
+        self.assertEqual(str(page.soup), str(PageRepresentation(self.html).page.soup))
+        self.assertEqual(page.soup.title.text, "Важное")
+        self.assertIsNone(page.source)
+
+        page = HTMLDocument.from_chunks(iter([data]), keep_source=True)
+        self.assertEqual(page.source, data)
+        self.assertEqual(page.html, self.html)
+
+    @requests_mock.Mocker()
+    def test_streamed_response(self, m):
+        url = 'https://rezka.ag/test/data/'
+        m.get(url, content=self.html.encode("utf-8"), headers={"Content-Type": "text/html"})
+        response = NetworkClient().get(url, stream=True)
+        page = HTMLDocument(response)
+        self.assertEqual(page.soup.find("div", class_="message-title").text, "Тут был Саша...")
+        self.assertIsNone(page.source)
+        self.assertTrue(response._content_consumed)  # noqa
+
+    def test_stream_pages(self):
+        with MockHDrezkaServer() as server:
+            client = server.create_client()
+            with client.scope():
+                url = HDrezka().films().get()[0].url
+                expected = HDrezka().get(url)
+                client.stream_pages = True
+                self.assertEqual(HDrezka().films().get()[0].url, url)
+                details = HDrezka().get(url)
+        self.assertEqual(details.title, expected.title)
+        self.assertEqual(details.player.get_video_url("720p"), expected.player.get_video_url("720p"))
+
+    def test_lean_mode(self):
+        html = read_reference_file("reference_movie_html.json")["57370"]
+        page = HTMLDocument(html, lean=True)
+        self.assertIsNone(page._html)  # noqa
+        self.assertEqual(len(page.scripts), 1)
+        self.assertIn("sof.tv.initCDNSeriesEvents(57370", page.scripts[0])
+        self.assertEqual(type(page.scripts[0]), str)
+        self.assertEqual(PlayerBuilder(page).extract_init_params(), PlayerBuilder(html).extract_init_params())
+        self.assertIsNone(HTMLDocument(html).scripts)
+
+        builder = MovieDetailsBuilder(html)
+        self.assertIsNone(builder.page._html)  # noqa
+        self.assertEqual(builder.page.scripts, page.scripts)
+        self.assertIsNotNone(builder.extract_content().player)
+        self.assertIsNotNone(PlayerBuilder(html).page.scripts)
+
+    def test_subtrees(self):
+        subtrees = (("div", {"class": "content"}), ("title", {}))
+        page = HTMLDocument(self.html, subtrees=subtrees)
+        self.assertEqual([i.name for i in page.soup.find_all(True)], ["title", "div", "div"])
+        self.assertEqual(page.soup.find("div", class_="message-title").text, "Тут был Саша...")
+        self.assertIsNone(page.soup.find("div", class_="main"))
+        self.assertEqual(page.html, self.html)
+
+        data = self.html.encode("utf-8")
+        streamed = HTMLDocument.from_chunks((data[i:i + 7] for i in range(0, len(data), 7)), subtrees=subtrees)
+        self.assertEqual(str(streamed.soup), str(page.soup))
+        self.assertEqual(len(HTMLDocument(self.html, subtrees=(("div", {"id": "missing"}),)).soup.find_all(True)), 0)
+
+    def test_builder_subtrees(self):
+        html = read_reference_file("reference_movie_html.json")["57370"]
+        page = MovieDetailsBuilder(html).page
+        self.assertIsNotNone(page.strainer)
+        self.assertIsNone(page.soup.find("body"))
+        self.assertEqual(dump(MovieDetailsBuilder(html).extract_content()),
+                         dump(MovieDetailsBuilder(HTMLDocument(html)).extract_content()))
+        self.assertIsNone(PageRepresentation(html).page.strainer)
+
+        with MockHDrezkaServer() as server:
+            with server.create_client().scope():
+                films = HDrezka().films()
+                posters = films.get()
+                details = HDrezka().get(posters[0].url)
+        self.assertEqual(films.last_page, server.pages)
+        self.assertIsInstance(details, MovieDetails)
+        self.assertIsNotNone(details.player)
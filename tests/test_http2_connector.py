@@ -0,0 +1,69 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import httpx
+import requests
+
+from HDrezka.connector import NetworkClient, HTTP2Connector
+from HDrezka.downloader import media_loader
+from HDrezka.main_page import HDrezka
+from HDrezka.transport import RetryPolicy
+from tests.mock_html.server import MockHDrezkaServer, MP4_HEADER
+
+
+class TestHTTP2Connector(TestCase):
+    def test_convert_response(self):
+        requests_list = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests_list.append(request)
+            return httpx.Response(
+                200,
+                json={"success": True},
+                headers=[("Set-Cookie", "a=1"), ("Set-Cookie", "b=2")],
+                extensions={"http_version": b"HTTP/2"},
+            )
+
+        connector = HTTP2Connector(transport=httpx.MockTransport(handler))
+        response = connector.post("https://rezka.ag/ajax/get_cdn_series/", data={"id": 1})
+        self.assertIsInstance(response, requests.Response)
+        self.assertEqual(response.json(), {"success": True})
+        self.assertEqual(response.headers["set-cookie"], "a=1, b=2")
+        self.assertEqual(response.http_version, "HTTP/2")
+        self.assertEqual(requests_list[0].headers["Host"], "rezka.ag")
+        self.assertEqual(requests_list[0].content, b"id=1")
+        connector.close()
+
+    def test_convert_exception(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        connector = HTTP2Connector(transport=httpx.MockTransport(handler))
+        connector.retry_policy = RetryPolicy(max_attempts=2, backoff_factor=0)
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            connector.get("https://rezka.ag/")
+        self.assertEqual(connector.retry_policy.statistics.attempts, 2)
+
+    def test_mock_server(self):
+        with MockHDrezkaServer(pages=3, video_size=70_000) as server:
+            client = NetworkClient.create(domain=server.domain, connector=HTTP2Connector)
+            client.scheme = "http"
+
+            def load_page(page):
+                with client.scope():
+                    return HDrezka().films().page(page).get()
+
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                self.assertTrue(all(executor.map(load_page, range(1, 4))))
+
+            with client.scope():
+                with tempfile.TemporaryDirectory() as directory:
+                    file_name = os.path.join(directory, "movie.mp4")
+                    media_loader.load_from_url(f"{server.url}/video/1_720p.mp4", file_name, chunk_size=2 ** 14)
+                    with open(file_name, "rb") as file:
+                        content = file.read()
+            client.close()
+        self.assertEqual(len(content), 70_000)
+        self.assertTrue(content.startswith(MP4_HEADER))
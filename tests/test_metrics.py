@@ -0,0 +1,134 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+import requests
+import requests_mock
+
+from HDrezka.connector import NetworkClient, AsyncConnector, HTTP2Connector, SessionConnector
+from HDrezka.downloader import media_loader
+from HDrezka.main_page import HDrezka
+from HDrezka.transport import Instrumentation, JSONLinesExporter, PrometheusExporter, SpanExporter
+from tests.mock_html.server import MockHDrezkaServer
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self) -> None:
+        self.records = []
+        self.prometheus = PrometheusExporter()
+        self.spans = SpanExporter()
+        self.stream = io.StringIO()
+        self.instrumentation = Instrumentation(
+            [self.records.append, self.prometheus, self.spans, JSONLinesExporter(self.stream)]
+        )
+
+    @requests_mock.Mocker()
+    def test_request_record(self, m):
+        m.post("https://rezka.ag/ajax/get_cdn_series/", json={"success": True})
+        m.get("https://rezka.ag/films/", exc=requests.exceptions.ConnectTimeout)
+        connector = SessionConnector()
+        connector.instrumentation = self.instrumentation
+
+        with self.spans.trace("enrich", movie=1) as parent:
+            connector.post("https://rezka.ag/ajax/get_cdn_series/", data={"id": 10})
+        with self.assertRaises(requests.exceptions.ConnectTimeout):
+            connector.get("https://rezka.ag/films/")
+
+        record, failed = self.records
+        self.assertEqual((record.endpoint, record.status_code, record.host), ("cdn_series", 200, "rezka.ag"))
+        self.assertEqual(record.bytes_sent, len("id=10"))
+        self.assertEqual(record.bytes_received, len('{"success": true}'))
+        self.assertEqual((failed.error, failed.status_code, failed.endpoint), ("ConnectTimeout", None, "page"))
+
+        metrics = self.prometheus.render()
+        self.assertIn('hdrezka_requests_total{kind="request",endpoint="cdn_series",method="POST",status="200"} 1',
+                      metrics)
+        self.assertIn('hdrezka_requests_total{kind="request",endpoint="page",method="GET",status="ConnectTimeout"} 1',
+                      metrics)
+        self.assertIn('hdrezka_request_duration_seconds_count{kind="request",endpoint="cdn_series"} 1', metrics)
+
+        request_span = self.spans.spans[0]
+        self.assertEqual(request_span["name"], "HTTP POST")
+        self.assertEqual(request_span["trace_id"], parent["trace_id"])
+        self.assertEqual(request_span["parent_span_id"], parent["span_id"])
+        self.assertEqual(request_span["attributes"]["hdrezka.endpoint"], "cdn_series")
+        self.assertEqual(self.spans.spans[-1]["status"]["code"], "ERROR")
+
+        lines = [json.loads(line) for line in self.stream.getvalue().splitlines()]
+        self.assertEqual([line["status_code"] for line in lines], [200, None])
+
+    def test_request_hooks(self):
+        def add_header(record, kwargs):
+            kwargs["headers"] = {"X-Trace": record.endpoint}
+
+        def broken_hook(record, *args):
+            raise RuntimeError("exporter is down")
+
+        instrumentation = Instrumentation([broken_hook], [add_header])
+        with requests_mock.Mocker() as m:
+            m.get("https://rezka.ag/ajax/get_comments/", text="")
+            connector = SessionConnector()
+            connector.instrumentation = instrumentation
+            with self.assertWarns(UserWarning):
+                connector.get("https://rezka.ag/ajax/get_comments/")
+            self.assertEqual(m.last_request.headers["X-Trace"], "comments")
+
+            instrumentation.request_hooks.insert(0, broken_hook)
+            with self.assertWarns(UserWarning):
+                self.assertEqual(connector.get("https://rezka.ag/ajax/get_comments/").status_code, 200)
+            self.assertEqual(m.call_count, 2)
+
+    def test_parse_record(self):
+        with MockHDrezkaServer() as server:
+            client = server.create_client()
+            client.instrumentation = self.instrumentation
+            with client.scope():
+                posters = HDrezka().films().get()
+                posters[0].get()
+
+        kinds = [(record.kind, record.endpoint) for record in self.records]
+        self.assertEqual(kinds, [("request", "page"), ("parse", "page")] * 2)
+        films_parse, movie_parse = self.records[1], self.records[3]
+        self.assertEqual(films_parse.url, f"{server.url}/films/")
+        self.assertEqual(movie_parse.url, posters[0].url)
+        self.assertGreater(movie_parse.duration, 0)
+        self.assertIn('hdrezka_requests_total{kind="parse",endpoint="page",method="GET",status="none"} 2',
+                      self.prometheus.render())
+
+    def test_connection_phases(self):
+        with MockHDrezkaServer(video_size=30_000) as server:
+            connector = HTTP2Connector(server.domain, http2=False)
+            connector.instrumentation = self.instrumentation
+            connector.get(f"{server.url}/films/")
+            connector.close()
+
+            async_connector = AsyncConnector(server.domain)
+            async_connector.instrumentation = self.instrumentation
+
+            async def fetch():
+                try:
+                    return await async_connector.get(f"{server.url}/ajax/get_comments/?news_id=1&cstart=1")
+                finally:
+                    await async_connector.close()
+
+            asyncio.run(fetch())
+
+            client = NetworkClient.create(domain=server.domain)
+            client.instrumentation = self.instrumentation
+            with tempfile.TemporaryDirectory() as directory, client.scope():
+                media_loader.load_from_url(f"{server.url}/video/1_720p.mp4", os.path.join(directory, "movie.mp4"))
+
+        page, comments, stream, download = self.records
+        for record in (page, comments):
+            self.assertTrue({"connect", "ttfb", "transfer"} <= set(record.timings), record.timings)
+            self.assertEqual(record.http_version, "HTTP/1.1")
+        self.assertEqual(comments.endpoint, "comments")
+        self.assertEqual((stream.endpoint, stream.bytes_received), ("media", 30_000))
+        self.assertNotIn("transfer", stream.timings)
+        self.assertEqual((download.kind, download.bytes_received, download.status_code), ("download", 30_000, 200))
+        self.assertGreaterEqual(download.duration, stream.duration)
+        self.assertIn('hdrezka_request_phase_seconds_count{kind="request",endpoint="page",phase="connect"} 1',
+                      self.prometheus.render())
@@ -0,0 +1,145 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, mock
+
+import httpx
+import requests
+import requests_mock
+
+from HDrezka.connector import NetworkClient, AsyncConnector, SessionConnector
+from HDrezka.transport import CircuitBreaker, EndpointLimit, EndpointType, Instrumentation, MirrorPool, RequestGovernor
+
+
+class TestMirrorPool(TestCase):
+    def setUp(self) -> None:
+        self.pool = MirrorPool(["rezka.ag", "hdrezka.ag", "hdrezka.me"], cooldown=30)
+        self.connector = SessionConnector()
+        self.connector.mirror_pool = self.pool
+
+    def tearDown(self) -> None:
+        del self.pool
+        del self.connector
+
+    def test_latency_order(self):
+        self.assertEqual(self.pool.active, "rezka.ag")
+        self.pool.report_success("hdrezka.me", 0.2)
+        self.pool.report_success("rezka.ag", 0.9)
+        self.assertEqual([m.domain for m in self.pool.get_candidates()], ["hdrezka.me", "rezka.ag", "hdrezka.ag"])
+
+        self.pool.report_success("hdrezka.me", 2.2)
+        self.assertAlmostEqual(self.pool.mirrors[2].latency, 0.8)
+        self.assertEqual(self.pool.active, "hdrezka.me")
+
+    def test_rewrite_url(self):
+        self.pool.report_failure("rezka.ag")
+        url = self.pool.rewrite_url("https://rezka.ag/films/?filter=last")
+        self.assertEqual(url, "https://hdrezka.ag/films/?filter=last")
+        url = self.pool.rewrite_url("https://stream.voidboost.cc/movie.mp4")
+        self.assertEqual(url, "https://stream.voidboost.cc/movie.mp4")
+
+    @requests_mock.Mocker()
+    def test_failover(self, m):
+        m.get("https://rezka.ag/films/", exc=requests.exceptions.ConnectTimeout)
+        m.get("https://hdrezka.ag/films/", status_code=503)
+        m.get("https://hdrezka.me/films/", text="ok")
+
+        response = self.connector.get("https://rezka.ag/films/")
+        self.assertEqual(response.text, "ok")
+        self.assertEqual(m.last_request.headers["Host"], "hdrezka.me")
+        self.assertEqual(self.pool.failovers, 2)
+        self.assertEqual(self.connector.domain, "hdrezka.me")
+
+        self.connector.get("https://rezka.ag/films/")
+        self.assertEqual(m.call_count, 4)
+        self.assertEqual(m.last_request.url, "https://hdrezka.me/films/")
+
+    @requests_mock.Mocker()
+    def test_failover_endpoint_type(self, m):
+        m.get("https://rezka.ag/films/", exc=requests.exceptions.ConnectTimeout)
+        m.get("https://hdrezka.ag/films/", text="ok")
+        records = []
+        self.connector.instrumentation = Instrumentation([records.append])
+        self.connector.governor = RequestGovernor({EndpointType.page: EndpointLimit(rate=100, burst=10)})
+
+        self.connector.get("https://rezka.ag/films/")
+        self.assertEqual([(r.host, r.endpoint) for r in records], [("rezka.ag", "page"), ("hdrezka.ag", "page")])
+        groups = set(self.connector.governor._buckets)  # noqa
+        self.assertEqual(groups, {("rezka.ag", EndpointType.page), ("hdrezka.ag", EndpointType.page)})
+        self.assertEqual(self.connector.get_site_domain("https://hdrezka.me/films/"), "hdrezka.me")
+        self.assertEqual(self.connector.get_site_domain("https://stream.voidboost.cc/1/"), "hdrezka.ag")
+
+    @requests_mock.Mocker()
+    def test_all_mirrors_down(self, m):
+        m.get(requests_mock.ANY, exc=requests.exceptions.ConnectionError)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.connector.get("https://rezka.ag/")
+        self.assertEqual(m.call_count, 3)
+
+        m.get("https://stream.voidboost.cc/movie.mp4", text="")
+        self.connector.get("https://stream.voidboost.cc/movie.mp4")
+        self.assertEqual(m.call_count, 4)
+
+    @requests_mock.Mocker()
+    def test_non_idempotent_post(self, m):
+        m.post("https://rezka.ag/ajax/add_comment/", status_code=502)
+        self.assertEqual(self.connector.post("https://rezka.ag/ajax/add_comment/").status_code, 502)
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(self.pool.active, "hdrezka.ag")
+
+    @requests_mock.Mocker()
+    def test_open_circuit_failover(self, m):
+        m.get("https://hdrezka.ag/films/", text="ok")
+        self.connector.circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        self.connector.circuit_breaker.record("https://rezka.ag/films/", True)
+
+        self.assertEqual(self.connector.get("https://rezka.ag/films/").text, "ok")
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(self.pool.failovers, 1)
+        self.assertEqual(self.pool.active, "hdrezka.ag")
+
+    @requests_mock.Mocker()
+    def test_check_health(self, m):
+        m.get("https://rezka.ag/", exc=requests.exceptions.ConnectTimeout)
+        m.get("https://hdrezka.ag/", text="")
+        m.get("https://hdrezka.me/", text="")
+        with mock.patch("time.monotonic", side_effect=[100, 101, 200, 200.5, 300, 300.1] + [400] * 10):
+            self.pool.check_health(self.connector)
+        self.assertEqual(m.request_history[0].timeout, 5)
+        self.assertEqual([m.domain for m in self.pool.get_candidates()], ["hdrezka.me", "hdrezka.ag", "rezka.ag"])
+
+    def test_network_client(self):
+        client = NetworkClient.create()
+        client.mirror_pool = self.pool
+        self.assertIs(client.async_adapter.mirror_pool, self.pool)
+
+    def test_async_failover(self):
+        def handler(request: httpx.Request):
+            if request.url.host == "rezka.ag":
+                raise httpx.ConnectTimeout("timeout", request=request)
+            return httpx.Response(200, text=request.url.host)
+
+        connector = AsyncConnector(transport=httpx.MockTransport(handler))
+        connector.mirror_pool = self.pool
+        self.assertEqual(asyncio.run(connector.get("https://rezka.ag/")).text, "hdrezka.ag")
+        self.assertEqual(connector.domain, "hdrezka.ag")
+
+    def test_async_open_circuit_failover(self):
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, text=request.url.host))
+        connector = AsyncConnector(transport=transport)
+        connector.mirror_pool = self.pool
+        connector.circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        connector.circuit_breaker.record("https://rezka.ag/", True)
+        self.assertEqual(asyncio.run(connector.get("https://rezka.ag/")).text, "hdrezka.ag")
+        self.assertEqual(self.pool.failovers, 1)
+
+    def test_concurrent_failovers(self):
+        def send(mirror_url):
+            if "//rezka.ag/" in mirror_url:
+                raise requests.exceptions.ConnectionError()
+            return mock.Mock(status_code=200)
+
+        # Без учёта здоровья каждый запрос начинается с rezka.ag и переключается ровно один раз
+        with mock.patch.object(self.pool, "report_failure"), mock.patch.object(self.pool, "report_success"):
+            with ThreadPoolExecutor(8) as executor:
+                list(executor.map(lambda _: self.pool.execute("GET", "https://rezka.ag/", send), range(200)))
+        self.assertEqual(self.pool.failovers, 200)
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import tempfile
+from unittest import TestCase
+
+from HDrezka.comments import CommentsIterator
+from HDrezka.downloader import media_loader
+from HDrezka.main_page import HDrezka
+from HDrezka.person import PersonBriefInfo
+from HDrezka.player import Film, Serial
+from HDrezka.trailer import TrailerBuilder
+from tests.mock_html.server import MockHDrezkaServer, MP4_HEADER
+
+
+class TestMockServer(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = MockHDrezkaServer(pages=5, comment_pages=2, video_size=100_000).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.client = self.server.create_client()
+        self.scope = self.client.scope()
+        self.scope.__enter__()
+
+    def tearDown(self) -> None:
+        self.scope.__exit__(None, None, None)
+
+    def test_pagination(self):
+        films = HDrezka().films()
+        self.assertEqual(str(films), f"{self.server.url}/films/")
+        posters = films.page(3).get()
+        self.assertTrue(posters)
+        self.assertEqual(films.last_page, 5)
+        self.assertTrue(posters[0].url.startswith(self.server.url))
+        self.assertEqual(len(list(HDrezka().series().page(4))), 2)
+
+    def test_movie_page(self):
+        poster = HDrezka().films().get()[0]
+        details = poster.get()
+        self.assertIsInstance(details.player, (Film, Serial))
+        self.assertTrue(all(url.startswith(self.server.url) for url in details.player.get_video_url("720p")))
+        self.assertEqual(poster.quick_content().title, f"Movie {poster.id}")
+
+    def test_ajax(self):
+        comments = CommentsIterator(57370)
+        self.assertEqual(len(comments.get(2)), 20)
+        self.assertEqual(comments.last_page, 2)
+        self.assertTrue(TrailerBuilder(66601).extract_content().url.startswith(self.server.url))
+        person = PersonBriefInfo("Person", id=7, film_id=1).quick_content()
+        self.assertEqual(person.id, 7)
+
+    def test_serial_episodes(self):
+        serial = HDrezka().get(f"{self.server.url}/series/drama/57370-tancuyuschie-bratya-2023.html").player
+        serial.update()
+        self.assertEqual([s.id for s in serial.seasons_tabs], [1, 2])
+        self.assertEqual(len(serial.get_current_season().episodes), 10)
+
+    def test_async(self):
+        async def gather():
+            return await asyncio.gather(*(HDrezka().films().page(page).aget() for page in range(1, 6)))
+
+        try:
+            self.assertEqual(len(asyncio.run(gather())), 5)
+        finally:
+            self.client.async_adapter = None
+
+    def test_range_video(self):
+        response = self.client.get(f"{self.server.url}/video/1_720p.mp4", headers={"Range": "bytes=99990-"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.headers["Content-Range"], "bytes 99990-99999/100000")
+        self.assertEqual(response.content, bytes(i & 0xFF for i in range(99990, 100000)))
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "movie.mp4")
+            media_loader.load_from_url(f"{self.server.url}/video/1_720p.mp4", file_name, chunk_size=2 ** 14)
+            with open(file_name, "rb") as file:
+                content = file.read()
+        self.assertEqual(len(content), 100_000)
+        self.assertTrue(content.startswith(MP4_HEADER))
@@ -1,12 +1,21 @@
+import dataclasses
 import json
 from datetime import datetime, date
 from unittest import TestCase
+from unittest.mock import patch
 
 import requests_mock
+from bs4 import BeautifulSoup
 
 from HDrezka.exceptions import EmptyPage
-from HDrezka.movie_page_descriptor import MovieDetailsBuilder, InfoTableBuilder
+from HDrezka.main_page import HDrezka
+from HDrezka.movie_page_descriptor import MovieDetailsBuilder, InfoTableBuilder, LazyMovieDetails
 from tests.mock_html.page_html_constructor import generate_info_table, read_reference_file
+from tests.mock_html.server import MockHDrezkaServer
+
+
+def dump(data) -> str:
+    return json.dumps(data, default=lambda x: x.__dict__ if not isinstance(x, (datetime, date)) else str(x))
 
 
 class TestInfoTable(TestCase):
@@ -45,6 +54,57 @@ class TestMovieDetailBuilder(TestCase):
 
             self.assertEqual(extracted_movie_info, reference_movie_info)
 
+    def test_parse_once(self):
+        reference_html = read_reference_file("reference_movie_html.json")
+        for key in reference_html:
+            # Статистика озвучек хранится в атрибуте в виде HTML, её приходится разбирать отдельно
+            expected = 1 if "b-rgstats__help" not in reference_html[key] else 2
+            with patch.object(BeautifulSoup, "__init__", side_effect=BeautifulSoup.__init__, autospec=True) as init:
+                MovieDetailsBuilder(reference_html[key]).extract_content()
+            self.assertEqual(init.call_count, expected, key)
+
+    def test_lazy_content(self):
+        reference_html = read_reference_file("reference_movie_html.json")
+
+        for html in list(reference_html.values())[:5]:
+            expected = MovieDetailsBuilder(html).extract_content()
+            lazy = MovieDetailsBuilder(html).extract_lazy_content()
+            self.assertIsInstance(lazy, LazyMovieDetails)
+            self.assertEqual(lazy.title, expected.title)
+            self.assertIs(lazy.info_table, lazy.info_table)
+            self.assertEqual(set(lazy.__dict__), {"title", "info_table"})
+            for item in dataclasses.fields(expected):
+                self.assertEqual(dump(getattr(lazy, item.name)), dump(getattr(expected, item.name)), item.name)
+            self.assertIsNone(lazy._builder)  # noqa
+
+    def test_fields(self):
+        html = next(iter(read_reference_file("reference_movie_html.json").values()))
+        expected = MovieDetailsBuilder(html).extract_content()
+        details = MovieDetailsBuilder(html).extract_content(fields=["id", "title"])
+        self.assertEqual((details.id, details.title), (expected.id, expected.title))
+        self.assertIsNone(details.info_table)
+        self.assertIsNone(details.player)
+        self.assertEqual(MovieDetailsBuilder(html).extract_content(fields="url").url, expected.url)
+        with self.assertRaises(ValueError):
+            MovieDetailsBuilder(html).extract_content(fields=["title", "unknown"])
+
+    def test_get_fields(self):
+        with MockHDrezkaServer() as server:
+            with server.create_client().scope():
+                url = HDrezka().films().get()[0].url
+                details = HDrezka().get(url, fields=["title", "player"])
+                lazy = HDrezka().get(url, lazy=True)
+                generated = HDrezka().get(url, fields=(name for name in ["title", "id"]))
+                self.assertEqual((generated.title, generated.id), (details.title, lazy.id))
+                self.assertIsNotNone(generated.title)
+                self.assertIsNotNone(details.player)
+                self.assertIsNone(details.description)
+                self.assertEqual(lazy.title, details.title)
+                with self.assertRaises(ValueError):
+                    HDrezka().get(url, fields=["title"], lazy=True)
+                with self.assertRaises(ValueError):
+                    HDrezka().get("https://rezka.ag/films/", fields=["title"])
+
 
 class TestTopList(TestCase):
     @requests_mock.Mocker()
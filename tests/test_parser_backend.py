@@ -0,0 +1,137 @@
+import json
+from datetime import datetime, date
+from unittest import TestCase
+
+from HDrezka.franchise import FranchiseBuilder
+from HDrezka.html_representation import (
+    HTMLDocument,
+    ParserBackend,
+    find_element,
+    find_elements,
+    element_text,
+    next_node_text,
+)
+from HDrezka.main_page import HDrezka
+from HDrezka.movie_page_descriptor import MovieDetailsBuilder, InfoTableBuilder
+from HDrezka.movie_posters import PosterBuilder
+from HDrezka.person import PersonBuilder
+from tests.mock_html.html_construcror import generate_fake_html
+from tests.mock_html.page_html_constructor import generate_info_table, read_reference_file
+from tests.mock_html.server import MockHDrezkaServer
+
+PERSON_HTML = '<html><head><meta property="og:url" content="https://rezka.ag/person/123-person-name/"></head>' \
+              '<body><div class="b-post__title"><h1><span itemprop="name"> Имя Фамилия </span></h1>' \
+              '<div><span itemprop="alternativeHeadline">Name Surname</span></div></div>' \
+              '<div class="b-post__infotable clearfix"><div class="b-post__infotable_left">' \
+              '<img src="https://static.hdrezka.ac/person.jpg"></div><div class="b-post__infotable_right">' \
+              '<div class="b-post__infotable_right_inner"><table class="b-post__info">' \
+              '<tr><td>Карьера:</td><td><a href="/actors/">Актер</a>, <a href="/directors/">Режиссер</a></td></tr>' \
+              '<tr><td>Дата рождения:</td><td><time>4 мая 1960</time> (63 года)</td></tr>' \
+              '<tr><td>Место рождения:</td><td> Москва, СССР </td></tr>' \
+              '<tr><td>Рост:</td><td>1.80 м</td></tr>' \
+              '<tr><td colspan="2"><div class="b-person__gallery_holder"><a href="https://static.hdrezka.ac/1.jpg">' \
+              '</a><a href="https://static.hdrezka.ac/2.jpg"></a></div></td></tr>' \
+              '</table></div></div></div><div class="b-person__career"><h2>Актер</h2>' \
+              '<div class="b-content__inline_item" data-id="7" data-url="https://rezka.ag/films/7-film.html">' \
+              '<div class="b-content__inline_item-cover"><a><img src="https://static.hdrezka.ac/7.jpg"/>' \
+              '<span class="info">1 сезон, 2 серия</span><i class="entity">Фильм</i></a></div>' \
+              '<div class="b-content__inline_item-link"><a>Фильм 7</a><div>2010, США, Драмы</div></div>' \
+              '</div></div></body></html>'
+
+FRANCHISE_HTML = '<html><head><meta property="og:url" content="https://rezka.ag/franchises/12-topor/"></head><body>' \
+                 '<a href="https://static.hdrezka.ac/franchise.jpg"><img data-caption-title=" Топор "></a>' \
+                 '<div class="b-post__partcontent_item" data-url="https://rezka.ag/films/1-topor.html">' \
+                 '<div class="td num">1</div><div class="td title"><a>Топор</a></div>' \
+                 '<div class="td year">2019 год</div><div class="td rating"><i>—</i></div></div>' \
+                 '<div class="b-post__partcontent_item" data-url="https://rezka.ag/films/2-topor.html">' \
+                 '<div class="td num">2</div><div class="td title"><a>Топор 2</a></div>' \
+                 '<div class="td year">2020 год</div><div class="td rating"><i>6.52</i></div></div></body></html>'
+
+
+def dump(data) -> str:
+    return json.dumps(data, default=lambda x: x.__dict__ if not isinstance(x, (datetime, date)) else str(x))
+
+
+class TestParserBackend(TestCase):
+    def assertSameContent(self, builder, html):
+        reference = builder(HTMLDocument(html, backend=ParserBackend.beautifulsoup))
+        page = HTMLDocument(html, backend=ParserBackend.lxml)
+        implementation = builder(page)
+
+        self.assertIsNot(type(implementation), builder)
+        self.assertTrue(issubclass(type(implementation), builder))
+        self.assertEqual(dump(reference.extract_content()), dump(implementation.extract_content()))
+        self.assertIsNone(page._soup)  # noqa
+
+    def test_query_helpers(self):
+        page = HTMLDocument(
+            '<div class="a  b" data-id="1"><p>x<!-- c --><b> y </b>z</p><span class="a b">q</span></div>',
+            backend=ParserBackend.lxml,
+        )
+        div = find_element(page.tree, "div", "b")
+        self.assertEqual(div.get("data-id"), "1")
+        self.assertEqual([i.tag for i in find_elements(page.tree, class_="a b")], ["span"])
+        self.assertEqual([i.tag for i in find_elements(div, recursive=False)], ["p", "span"])
+        self.assertIsNone(find_element(div, "b", recursive=False))
+        self.assertIsNone(find_element(page.tree, "div", "c"))
+        self.assertEqual(element_text(div), "x y zq")
+        self.assertEqual(element_text(div, strip=True), "xyzq")
+        self.assertEqual(next_node_text(div), "x y z")
+        self.assertEqual(next_node_text(find_element(div, "p")), "x")
+        self.assertEqual(next_node_text(find_element(div, "b"), strip=True), "y")
+
+    def test_lazy_soup(self):
+        page = HTMLDocument(PERSON_HTML, backend=ParserBackend.lxml)
+        self.assertIsNone(page._soup)  # noqa
+        self.assertEqual(page.soup.find("time").text, "4 мая 1960")
+        self.assertEqual(HTMLDocument(page.tree).backend, ParserBackend.lxml)
+        self.assertEqual(HTMLDocument(page.soup).backend, ParserBackend.beautifulsoup)
+
+    def test_posters(self):
+        for name in ("films", "best", "new", "announce"):
+            self.assertSameContent(PosterBuilder, generate_fake_html(name)[1])
+
+    def test_info_table(self):
+        for _, html in generate_info_table():
+            self.assertSameContent(InfoTableBuilder, html)
+
+    def test_movie_details(self):
+        reference_html = read_reference_file("reference_movie_html.json")
+        reference_data = read_reference_file("reference_movie_data.json")
+        for key, html in reference_html.items():
+            page = HTMLDocument(html, backend=ParserBackend.lxml)
+            details = json.loads(dump(MovieDetailsBuilder(page).extract_content()))
+            self.assertEqual(details, reference_data[key])
+            self.assertIsNone(page._soup)  # noqa
+
+    def test_person(self):
+        self.assertSameContent(PersonBuilder, PERSON_HTML)
+        person = PersonBuilder(HTMLDocument(PERSON_HTML, backend=ParserBackend.lxml)).extract_content()
+        self.assertEqual(person.id, 123)
+        self.assertEqual(person.careers, ["Актер", "Режиссер"])
+        self.assertEqual(person.age, "63 года")
+        self.assertEqual(len(person.stats["актер"]), 1)
+
+    def test_franchise(self):
+        self.assertSameContent(FranchiseBuilder, FRANCHISE_HTML)
+        franchise = FranchiseBuilder(HTMLDocument(FRANCHISE_HTML, backend=ParserBackend.lxml)).extract_content()
+        self.assertEqual([i.num for i in franchise.items_list], [2, 1])
+        self.assertEqual(franchise.items_list[1].rating, None)
+
+    def test_default_backend(self):
+        with MockHDrezkaServer() as server:
+            client = server.create_client()
+            with client.scope():
+                url = HDrezka().films().get()[0].url
+                expected = HDrezka().get(url)
+                HTMLDocument.default_backend = ParserBackend.lxml
+                try:
+                    posters = HDrezka().films().get()
+                    details = HDrezka().get(url)
+                    client.stream_pages = True
+                    streamed = HDrezka().get(url)
+                finally:
+                    HTMLDocument.default_backend = ParserBackend.beautifulsoup
+        self.assertEqual(posters[0].url, url)
+        self.assertEqual(dump(details), dump(expected))
+        self.assertEqual(dump(streamed), dump(expected))
@@ -0,0 +1,96 @@
+import base64
+import random
+import re
+from unittest import TestCase
+
+from HDrezka.player.movie_player_builder import PlayerBuilder, TRASH_LIST
+
+QUALITIES = ("360p", "480p", "720p", "1080p", "1080p Ultra", "4K")
+URLS = (
+    "https://stream.voidboost.cc/1/360.mp4:hls:manifest.m3u8",
+    "https://stream.voidboost.cc/1/360.mp4",
+    "http://prx.voidboost.top/2/720.mp4",
+    "https://stream.voidboost.cc/3/1080.m3u8",
+    "ftp://stream.voidboost.cc/4/4k.mp4",
+    "https://stream.voidboost.cc/5/тест.mp4",
+    "https://stream.voidboost.cc/6/720.mp4\n",
+    "https://stream.voidboost.cc/7/\n720.mp4",
+    "https://stream.voidboost.cc/8/720.mp4\n\n",
+    "https://.mp4",
+    "",
+)
+
+
+def legacy_decode_video_urls(encoded_string):
+    if encoded_string is False:
+        return {}
+
+    while any(substring in encoded_string for substring in TRASH_LIST):
+        encoded_string = re.sub("|".join(map(re.escape, TRASH_LIST)), "", encoded_string)
+
+    decoded_string = base64.b64decode(encoded_string.replace("#h", "", 1)).decode("utf-8")
+    urls_container = {}
+    for line in decoded_string.split(","):
+        quality_name = re.search(r"\[.*?]", line)[0]
+        quality_urls = line[len(quality_name):]
+        filtered_urls = [url for url in re.split(r"\sor\s", quality_urls) if re.match(r"https?://.*\.mp4$", url)]
+        urls_container[quality_name[1:-1]] = filtered_urls
+    return urls_container
+
+
+def insert_trash(encoded: str, generator: random.Random) -> str:
+    for _ in range(generator.randint(0, 8)):
+        position = generator.randint(0, len(encoded))
+        trash = generator.choice(TRASH_LIST)
+        if generator.random() < 0.3:
+            # Вставка внутрь другой вставки: мусор появляется снова после первого удаления
+            split = generator.randint(1, len(trash) - 1)
+            trash = trash[:split] + generator.choice(TRASH_LIST) + trash[split:]
+        encoded = encoded[:position] + trash + encoded[position:]
+    return encoded
+
+
+def generate_streams(generator: random.Random) -> str:
+    lines = []
+    for _ in range(generator.randint(1, 6)):
+        urls = [generator.choice(URLS) for _ in range(generator.randint(1, 3))]
+        separator = generator.choice((" or ", " or ", "\tor\n", " or"))
+        lines.append(f"[{generator.choice(QUALITIES)}]" + separator.join(urls))
+    if generator.random() < 0.05:
+        lines.append("без качества")
+    encoded = base64.b64encode(",".join(lines).encode("utf-8")).decode("utf-8")
+    if generator.random() < 0.05:
+        encoded = encoded[:-1]
+    return "#h" + insert_trash(encoded, generator)
+
+
+class TestDecodeVideoUrls(TestCase):
+    def assertSameResult(self, encoded_string):
+        try:
+            expected = legacy_decode_video_urls(encoded_string)
+        except Exception as error:  # noqa
+            with self.assertRaises(type(error), msg=encoded_string):
+                PlayerBuilder.decode_video_urls(encoded_string)
+        else:
+            self.assertEqual(PlayerBuilder.decode_video_urls(encoded_string), expected, encoded_string)
+
+    def test_decode(self):
+        urls = "[360p]https://a.cc/1.mp4:hls:manifest.m3u8 or https://a.cc/1.mp4,[720p]https://a.cc/2.mp4"
+        encoded = base64.b64encode(urls.encode("utf-8")).decode("utf-8")
+        encoded_string = f"#h{encoded[:10]}{TRASH_LIST[0]}{encoded[10:20]}{TRASH_LIST[3]}{encoded[20:]}"
+        self.assertEqual(PlayerBuilder.decode_video_urls(encoded_string),
+                         {"360p": ["https://a.cc/1.mp4"], "720p": ["https://a.cc/2.mp4"]})
+        self.assertEqual(PlayerBuilder.decode_video_urls(False), {})
+
+    def test_nested_trash(self):
+        encoded = base64.b64encode(b"[480p]https://a.cc/1.mp4").decode("utf-8")
+        trash = TRASH_LIST[1][:7] + TRASH_LIST[2] + TRASH_LIST[1][7:]
+        self.assertEqual(PlayerBuilder.decode_video_urls(f"#h{encoded[:4]}{trash}{encoded[4:]}"),
+                         {"480p": ["https://a.cc/1.mp4"]})
+
+    def test_same_as_legacy(self):
+        generator = random.Random(0)
+        for _ in range(3000):
+            self.assertSameResult(generate_streams(generator))
+        for encoded_string in ("", "#h", "#h#h", "абв", "#h" + TRASH_LIST[0]):
+            self.assertSameResult(encoded_string)
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import tempfile
+from unittest import TestCase
+
+import requests
+
+from HDrezka.connector import NetworkClient
+from HDrezka.downloader import media_loader
+from HDrezka.main_page import HDrezka
+from HDrezka.transport import ProxyPool, RetryPolicy
+from tests.mock_html.server import MockHDrezkaServer, MP4_HEADER
+
+DEAD_PROXY = "http://127.0.0.1:1"
+
+
+class TestProxyPool(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Сервер принимает абсолютные URL в строке запроса, поэтому работает и как HTTP-прокси
+        cls.server = MockHDrezkaServer(pages=2, video_size=50_000).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.client = NetworkClient.create(domain="rezka.invalid")
+        self.client.scheme = "http"
+
+    def test_scoring(self):
+        pool = ProxyPool(["http://a:1", "http://b:1", "http://c:1"], max_failures=2, cooldown=60)
+        first, second, third = pool.proxies
+        for proxy, latency in ((first, 0.5), (second, 0.1), (third, 0.3)):
+            proxy.in_flight = 1
+            pool.release(proxy, latency=latency)
+        self.assertEqual([pool.acquire().url for _ in range(2)], ["http://b:1", "http://b:1"])
+
+        pool.release(second, failed=True)
+        pool.release(second, failed=True)
+        self.assertFalse(pool.as_dict()["http://b:1"]["healthy"])
+        self.assertEqual(pool.acquire(), third)
+        self.assertLess(second.success_rate, 1)
+        with self.assertRaises(ValueError):
+            ProxyPool([])
+
+    def test_throughput_metric(self):
+        pool = ProxyPool(["http://a:1", "http://b:1"], metric="throughput")
+        first, second = pool.proxies
+        first.in_flight = second.in_flight = 1
+        pool.release(first, latency=0.01, size=1000, elapsed=1)
+        pool.release(second, latency=1, size=10 ** 6, elapsed=1)
+        self.assertEqual(pool.acquire(), second)
+
+    def test_connector_rotation(self):
+        self.client.proxy_pool = ProxyPool([self.server.url, DEAD_PROXY], max_failures=1)
+        self.client.retry_policy = RetryPolicy(max_attempts=3, backoff_factor=0)
+        with self.client.scope():
+            for page in range(1, 3):
+                self.assertTrue(HDrezka().films().page(page).get())
+        statistics = self.client.proxy_pool.as_dict()
+        self.assertGreaterEqual(statistics[self.server.url]["requests"], 2)
+        self.assertEqual(statistics[self.server.url]["success_rate"], 1.0)
+        if statistics[DEAD_PROXY]["requests"]:
+            self.assertFalse(statistics[DEAD_PROXY]["healthy"])
+
+    def test_explicit_proxies(self):
+        self.client.proxy_pool = ProxyPool([DEAD_PROXY])
+        response = self.client.get(f"{self.server.url}/films/", proxies={})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.proxy_pool.as_dict()[DEAD_PROXY]["requests"], 0)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client.get(f"{self.server.url}/films/")
+        self.assertEqual(self.client.proxy_pool.proxies[0].failures, 1)
+
+    def test_async_rotation(self):
+        self.client.proxy_pool = ProxyPool([self.server.url])
+
+        async def fetch():
+            try:
+                return await self.client.aget("http://rezka.invalid/films/")
+            finally:
+                await self.client.async_adapter.close()
+
+        self.assertEqual(asyncio.run(fetch()).status_code, 200)
+        self.assertIsNotNone(self.client.proxy_pool.proxies[0].latency)
+
+    def test_media_pool(self):
+        media_pool = ProxyPool([self.server.url], metric="throughput")
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "movie.mp4")
+            with self.client.scope():
+                media_loader.load_from_url("http://cdn.invalid/video/1_720p.mp4", file_name, proxy_pool=media_pool)
+            with open(file_name, "rb") as file:
+                self.assertTrue(file.read().startswith(MP4_HEADER))
+        proxy = media_pool.proxies[0]
+        self.assertEqual((proxy.requests, proxy.in_flight), (1, 0))
+        self.assertIsNotNone(proxy.throughput)
+
+    def test_media_pool_stream_failure(self):
+        media_pool = ProxyPool([self.server.url], metric="throughput", max_failures=2)
+        url = "http://cdn.invalid/video/1_720p.mp4"
+        with self.client.scope():
+            for _ in range(2):
+                with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+                    with media_loader._open_proxied_stream([url], proxy_pool=media_pool):  # noqa
+                        raise requests.exceptions.ChunkedEncodingError("Connection broken")
+            with self.assertRaises(KeyboardInterrupt):
+                with media_loader._open_proxied_stream([url], proxy_pool=media_pool):  # noqa
+                    raise KeyboardInterrupt
+        proxy = media_pool.proxies[0]
+        self.assertEqual((proxy.requests, proxy.in_flight, proxy.ejections), (3, 0, 1))
+        self.assertLess(proxy.success_rate, 1)
+        self.assertFalse(media_pool.as_dict()[self.server.url]["healthy"])
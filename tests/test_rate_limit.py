@@ -0,0 +1,136 @@
+import asyncio
+import gc
+import threading
+import time
+from unittest import TestCase, mock
+
+import httpx
+import requests_mock
+
+from HDrezka.connector import AsyncConnector, NetworkClient, SessionConnector
+from HDrezka.transport import EndpointLimit, EndpointType, RequestGovernor, TokenBucket, determine_endpoint_type
+
+
+class TestRateLimit(TestCase):
+    def test_endpoint_type(self):
+        self.assertEqual(determine_endpoint_type("https://rezka.ag/films/", "rezka.ag"), EndpointType.page)
+        self.assertEqual(determine_endpoint_type("https://rezka.ag/ajax/get_cdn_series/?t=1"), EndpointType.cdn_series)
+        self.assertEqual(determine_endpoint_type("https://rezka.ag/ajax/get_comments/"), EndpointType.comments)
+        self.assertEqual(determine_endpoint_type("https://rezka.ag/engine/ajax/quick_content.php"), EndpointType.ajax)
+        self.assertEqual(determine_endpoint_type("https://static.hdrezka.ac/i/poster.jpg"), EndpointType.static)
+        self.assertEqual(determine_endpoint_type("https://stream.voidboost.cc/1/movie.mp4"), EndpointType.media)
+        self.assertEqual(determine_endpoint_type("https://stream.voidboost.cc/1/", "rezka.ag"), EndpointType.media)
+
+    def test_token_bucket(self):
+        with mock.patch("time.monotonic", return_value=100.0) as monotonic:
+            bucket = TokenBucket(rate=2, capacity=2)
+            self.assertEqual([bucket.reserve() for _ in range(4)], [0, 0, 0.5, 1])
+
+            monotonic.return_value = 101.5
+            self.assertEqual(bucket.reserve(), 0)
+            self.assertEqual(bucket.reserve(), 0.5)
+
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+    @requests_mock.Mocker()
+    def test_rate(self, m):
+        m.get("https://rezka.ag/films/", text="")
+        m.post("https://rezka.ag/ajax/get_cdn_series/", text="")
+        connector = SessionConnector()
+        connector.governor = RequestGovernor({EndpointType.page: EndpointLimit(rate=1, burst=2)})
+
+        with mock.patch("time.sleep") as sleep:
+            for _ in range(3):
+                connector.get("https://rezka.ag/films/")
+            connector.post("https://rezka.ag/ajax/get_cdn_series/")
+        sleep.assert_called_once()
+        self.assertTrue(0.9 <= sleep.call_args[0][0] <= 1)
+        self.assertEqual(connector.governor.statistics.requests, 4)
+        self.assertEqual(connector.governor.statistics.throttled, 1)
+
+    def test_max_in_flight(self):
+        governor = RequestGovernor({EndpointType.media: EndpointLimit(max_in_flight=2)})
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def worker():
+            with governor.acquire("https://stream.voidboost.cc/movie.mp4", "rezka.ag"):
+                with lock:
+                    state["active"] += 1
+                    state["peak"] = max(state["peak"], state["active"])
+                time.sleep(0.02)
+                with lock:
+                    state["active"] -= 1
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(state["peak"], 2)
+
+    @requests_mock.Mocker()
+    def test_streamed_max_in_flight(self, m):
+        url = "https://cdn.voidboost.cc/a.mp4"
+        m.get(url, content=b"data")
+        connector = SessionConnector()
+        connector.governor = RequestGovernor({EndpointType.media: EndpointLimit(max_in_flight=1)})
+        opened = threading.Event()
+
+        def download():
+            with connector.get(url, stream=True) as response:
+                response.content  # noqa
+                opened.set()
+
+        first = connector.get(url, stream=True)
+        thread = threading.Thread(target=download)
+        thread.start()
+        self.assertFalse(opened.wait(0.1))
+        first.close()
+        self.assertTrue(opened.wait(5))
+        thread.join()
+
+        connector.get(url, stream=True)
+        gc.collect()
+        self.assertEqual(connector.get(url).content, b"data")
+        semaphore = connector.governor._semaphores[("cdn.voidboost.cc", EndpointType.media)]  # noqa
+        self.assertEqual(semaphore._value, 1)  # noqa
+
+    def test_async_max_in_flight(self):
+        state = {"active": 0, "peak": 0}
+
+        async def handler(request: httpx.Request):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            return httpx.Response(200, text=str(request.url))
+
+        connector = AsyncConnector(transport=httpx.MockTransport(handler))
+        connector.governor = RequestGovernor({EndpointType.page: EndpointLimit(max_in_flight=3)})
+
+        async def gather():
+            return await asyncio.gather(*(connector.get(f"https://rezka.ag/films/page/{i}/") for i in range(10)))
+
+        self.assertEqual(len(asyncio.run(gather())), 10)
+        self.assertEqual(state["peak"], 3)
+        self.assertEqual(connector.governor.statistics.requests, 10)
+
+    def test_async_semaphores_per_loop(self):
+        connector = AsyncConnector(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        connector.governor = RequestGovernor({EndpointType.page: EndpointLimit(max_in_flight=1)})
+
+        async def fetch():
+            await connector.get("https://rezka.ag/films/")
+            await connector.close()
+            return len(connector.governor._async_semaphores)  # noqa
+
+        self.assertEqual([asyncio.run(fetch()) for _ in range(3)], [1, 1, 1])
+        gc.collect()
+        self.assertEqual(len(connector.governor._async_semaphores), 0)  # noqa
+
+    def test_async_adapter_inherits_governor(self):
+        client = NetworkClient.create()
+        client.governor = RequestGovernor()
+        self.assertIs(client.async_adapter.governor, client.governor)
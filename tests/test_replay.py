@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+import time
+from unittest import TestCase, mock
+
+import requests_mock
+
+from HDrezka.comments import CommentsIterator
+from HDrezka.connector import NetworkClient, ReplayConnector
+from HDrezka.exceptions import ReplayMissError
+from HDrezka.main_page import HDrezka
+from HDrezka.player import Film, MovieQueryData
+from HDrezka.transport import ReplayArchive
+from tests.mock_html.html_construcror import generate_fake_html
+
+
+class TestReplayConnector(TestCase):
+    def setUp(self) -> None:
+        self.reference_data, self.text = generate_fake_html("films")
+        self.archive = ReplayArchive()
+        with requests_mock.Mocker() as m:
+            m.get("https://rezka.ag/films/", text=self.text, headers={"Content-Type": "text/html; charset=utf-8"})
+            m.get("https://stream.voidboost.cc/movie.mp4", content=bytes(range(256)) * 4)
+            m.post("https://rezka.ag/ajax/get_cdn_series/", [{"json": {"id": 1}}, {"json": {"id": 2}}])
+
+            recorder = ReplayConnector(archive=self.archive, record=True)
+            recorder.get("https://rezka.ag/films/")
+            recorder.get("https://stream.voidboost.cc/movie.mp4", stream=True)
+            recorder.post("https://rezka.ag/ajax/get_cdn_series/", data={"id": 1})
+            recorder.post("https://rezka.ag/ajax/get_cdn_series/", data={"id": 1})
+        self.connector = ReplayConnector(archive=self.archive)
+
+    def tearDown(self) -> None:
+        del self.archive
+        del self.connector
+
+    def test_replay(self):
+        response = self.connector.get("https://rezka.ag/films/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.text, self.text)
+
+        self.assertEqual(self.connector.post("https://rezka.ag/ajax/get_cdn_series/", data={"id": 1}).json(), {"id": 1})
+        self.assertEqual(self.connector.post("https://rezka.ag/ajax/get_cdn_series/", data={"id": 1}).json(), {"id": 2})
+        self.assertEqual(self.connector.post("https://rezka.ag/ajax/get_cdn_series/", data={"id": 1}).json(), {"id": 2})
+
+        with self.assertRaises(ReplayMissError):
+            self.connector.post("https://rezka.ag/ajax/get_cdn_series/", data={"id": 2})
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "traffic.zip")
+            self.archive.save(path)
+            archive = ReplayArchive.load(path)
+        self.assertEqual(len(archive), 4)
+        self.assertEqual(len(archive.bodies), 4)
+        self.assertEqual(archive.entries, self.archive.entries)
+
+    def test_network_client(self):
+        client = NetworkClient.create()
+        client.adapter = self.connector
+        with client.scope():
+            films_list = HDrezka().get("https://rezka.ag/films/")
+        self.assertListEqual(self.reference_data, json.loads(json.dumps(films_list, default=lambda x: x.__dict__)))
+
+    def test_latency_and_bandwidth(self):
+        self.connector.latency = 0.25
+        self.connector.bandwidth = 512
+        with mock.patch("time.sleep") as sleep:
+            response = self.connector.get("https://stream.voidboost.cc/movie.mp4", stream=True)
+            sleep.assert_called_once_with(0.25)
+            chunks = list(response.iter_content(chunk_size=256))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(sum(call.args[0] for call in sleep.call_args_list), 2.25)
+
+    def test_range(self):
+        response = self.connector.get("https://stream.voidboost.cc/movie.mp4", headers={"Range": "bytes=1000-"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.headers["Content-Length"], "24")
+        self.assertEqual(response.headers["Content-Range"], "bytes 1000-1023/1024")
+        self.assertEqual(response.content, (bytes(range(256)) * 4)[1000:])
+
+    def test_cache_busting_params(self):
+        client = NetworkClient.create()
+        client.adapter = ReplayConnector(archive=self.archive, record=True)
+        comments = {"success": True, "comments": "<ul></ul>", "navigation": ""}
+        film = Film(MovieQueryData(1, 2, "favs", False, False, False), {}, [], []).use_client(client)
+        with requests_mock.Mocker() as m:
+            m.get("https://rezka.ag/ajax/get_comments/", json=comments)
+            m.post("https://rezka.ag/ajax/get_cdn_series/", json={"success": True, "url": ""})
+            CommentsIterator(1).use_client(client)._query(page=1)
+            film._get()
+
+        client.adapter = self.connector
+        with mock.patch("time.time", return_value=time.time() + 60):
+            self.assertEqual(CommentsIterator(1).use_client(client)._query(page=1), comments)
+            self.assertEqual(film._get(), {"success": True, "url": ""})
+            with self.assertRaises(ReplayMissError):
+                CommentsIterator(2).use_client(client)._query(page=1)
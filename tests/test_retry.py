@@ -0,0 +1,114 @@
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase, mock
+
+import httpx
+import requests
+import requests_mock
+
+from HDrezka.comments import CommentsIterator
+from HDrezka.connector import NetworkClient, AsyncConnector, SessionConnector
+from HDrezka.exceptions import ServiceUnavailable
+from HDrezka.transport import RetryPolicy
+
+
+class TestRetryPolicy(TestCase):
+    def setUp(self) -> None:
+        self.policy = RetryPolicy(max_attempts=3, backoff_factor=0)
+        self.connector = SessionConnector()
+        self.connector.retry_policy = self.policy
+
+    def tearDown(self) -> None:
+        del self.policy
+        del self.connector
+
+    def test_idempotent(self):
+        self.assertTrue(self.policy.is_idempotent("get", "https://rezka.ag/films/"))
+        self.assertTrue(self.policy.is_idempotent("POST", "https://rezka.ag/ajax/get_cdn_series/?t=1"))
+        self.assertTrue(self.policy.is_idempotent("POST", "https://rezka.ag/engine/ajax/quick_content.php"))
+        self.assertFalse(self.policy.is_idempotent("POST", "https://rezka.ag/ajax/add_comment/"))
+        self.assertFalse(self.policy.is_idempotent("DELETE", "https://rezka.ag/"))
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+        self.assertEqual([policy.get_backoff(i) for i in range(1, 6)], [0.5, 1, 2, 3, 3])
+
+        policy.jitter = True
+        for attempt in range(1, 10):
+            self.assertTrue(0 <= policy.get_backoff(attempt) <= 3)
+
+    def test_retry_after(self):
+        policy = RetryPolicy(max_backoff=60)
+        response = requests.Response()
+        self.assertIsNone(policy.get_retry_after(response))
+
+        response.headers["Retry-After"] = "7"
+        self.assertEqual(policy.get_delay(1, response), 7)
+
+        response.headers["Retry-After"] = "3600"
+        self.assertEqual(policy.get_retry_after(response), 60)
+
+        response.headers["Retry-After"] = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), True)
+        self.assertTrue(25 <= policy.get_retry_after(response) <= 30)
+
+        response.headers["Retry-After"] = "tomorrow"
+        self.assertIsNone(policy.get_retry_after(response))
+
+    @requests_mock.Mocker()
+    def test_retry_status(self, m):
+        url = "https://rezka.ag/films/"
+        m.get(url, [{"status_code": 503}, {"status_code": 429, "headers": {"Retry-After": "0"}}, {"text": "ok"}])
+
+        response = self.connector.get(url)
+        self.assertEqual(response.text, "ok")
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(self.policy.statistics.retries, 2)
+        self.assertEqual(dict(self.policy.statistics.statuses), {503: 1, 429: 1})
+        self.assertEqual(self.policy.statistics.failures, 0)
+
+    @requests_mock.Mocker()
+    def test_retry_exception(self, m):
+        url = "https://rezka.ag/ajax/get_cdn_series/"
+        m.post(url, [{"exc": requests.exceptions.ConnectTimeout}, {"json": {"success": True}}])
+
+        self.assertEqual(self.connector.post(url, data={"id": 1}).json(), {"success": True})
+        self.assertEqual(dict(self.policy.statistics.exceptions), {"ConnectTimeout": 1})
+
+        m.post(url, exc=requests.exceptions.ConnectionError)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.connector.post(url)
+        self.assertEqual(self.policy.statistics.failures, 1)
+
+    @requests_mock.Mocker()
+    def test_non_idempotent_post(self, m):
+        url = "https://rezka.ag/ajax/add_comment/"
+        m.post(url, status_code=503)
+
+        self.assertEqual(self.connector.post(url).status_code, 503)
+        self.assertEqual(m.call_count, 1)
+
+    @requests_mock.Mocker()
+    def test_attempts_exhausted(self, m):
+        m.get("https://rezka.ag/ajax/get_comments/", status_code=504)
+        client = NetworkClient()
+        client.retry_policy = self.policy
+        try:
+            with mock.patch("time.sleep") as sleep:
+                with self.assertRaises(ServiceUnavailable):
+                    CommentsIterator(43477).get(1)
+                self.assertEqual(sleep.call_count, 2)
+        finally:
+            client.retry_policy = None
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(self.policy.statistics.failures, 1)
+        self.assertEqual(self.policy.statistics.as_dict()["attempts"], 3)
+
+    def test_async_retry(self):
+        responses = [httpx.Response(502), httpx.Response(200, text="ok")]
+        connector = AsyncConnector(transport=httpx.MockTransport(lambda request: responses.pop(0)))
+        connector.retry_policy = self.policy
+
+        response = asyncio.run(connector.get("https://rezka.ag/"))
+        self.assertEqual(response.text, "ok")
+        self.assertEqual(self.policy.statistics.retries, 1)
@@ -0,0 +1,85 @@
+import asyncio
+from unittest import TestCase
+
+import httpx
+import requests_mock
+
+from HDrezka.connector import NetworkClient, AsyncConnector, SessionConnector
+from HDrezka.main_page import HDrezka
+from HDrezka.transport import EndpointRouter, EndpointType, Route
+from tests.mock_html.server import MockHDrezkaServer
+
+
+class TestEndpointRouter(TestCase):
+    def setUp(self) -> None:
+        self.router = EndpointRouter({
+            EndpointType.page: "http://127.0.0.1:3128",
+            EndpointType.ajax: Route("https://edge.local/rezka/", preserve_host=False),
+            EndpointType.media: None,
+        })
+        self.connector = SessionConnector()
+        self.connector.router = self.router
+
+    def tearDown(self) -> None:
+        del self.router
+        del self.connector
+
+    def test_rewrite(self):
+        route = Route("https://edge.local/rezka/")
+        self.assertEqual(route.rewrite("https://rezka.ag/films/?filter=last#top"),
+                         "https://edge.local/rezka/films/?filter=last#top")
+        self.assertEqual(Route().rewrite("https://rezka.ag/films/"), "https://rezka.ag/films/")
+        with self.assertRaises(ValueError):
+            EndpointRouter({EndpointType.page: "edge.local"})
+
+    def test_resolve(self):
+        domain = "rezka.ag"
+        self.assertEqual(self.router.resolve("https://rezka.ag/films/", domain)[0], "http://127.0.0.1:3128/films/")
+        self.assertEqual(self.router.resolve(b"https://rezka.ag/ajax/get_comments/?t=1", domain)[0],
+                         "https://edge.local/rezka/ajax/get_comments/?t=1")
+        self.assertEqual(self.router.resolve("https://static.rezka.ag/i/poster.jpg", domain)[0],
+                         "https://static.rezka.ag/i/poster.jpg")
+        self.assertEqual(self.router.resolve("https://cdn.net/video/1.mp4", domain)[0], "https://cdn.net/video/1.mp4")
+        self.assertEqual(self.router.statistics["direct"], 2)
+
+    @requests_mock.Mocker()
+    def test_preserve_host(self, m):
+        m.get("http://127.0.0.1:3128/films/", text="page")
+        m.post("https://edge.local/rezka/ajax/get_cdn_series/", json={"success": True})
+
+        self.assertEqual(self.connector.get("https://rezka.ag/films/").text, "page")
+        self.assertEqual(m.last_request.headers["Host"], "rezka.ag")
+        self.assertEqual(m.last_request.headers["Referer"], "https://rezka.ag")
+
+        self.connector.post("https://rezka.ag/ajax/get_cdn_series/", data={"id": 1})
+        self.assertEqual(m.last_request.headers["Host"], "edge.local")
+
+    def test_base_url(self):
+        client = NetworkClient.create()
+        client.url = "http://127.0.0.1:8080"
+        self.assertEqual((client.scheme, client.domain), ("http", "127.0.0.1:8080"))
+        self.assertEqual(client.async_adapter.url, "http://127.0.0.1:8080")
+        with self.assertRaises(ValueError):
+            client.url = "rezka.ag"
+
+    def test_async_router(self):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, text="ok")
+
+        connector = AsyncConnector(transport=httpx.MockTransport(handler))
+        connector.router = self.router
+        asyncio.run(connector.get("https://rezka.ag/series/"))
+        self.assertEqual(str(requests[0].url), "http://127.0.0.1:3128/series/")
+        self.assertEqual(requests[0].headers["Host"], "rezka.ag")
+
+    def test_local_edge(self):
+        with MockHDrezkaServer(pages=2) as server:
+            client = NetworkClient.create()
+            client.router = EndpointRouter({EndpointType.page: server.url})
+            with client.scope():
+                posters = HDrezka().films().get()
+            self.assertTrue(posters)
+            self.assertEqual(server.requests_count, 1)
@@ -0,0 +1,153 @@
+import asyncio
+import gc
+import threading
+import time
+from unittest import TestCase
+
+import httpx
+import requests
+import requests_mock
+
+from HDrezka.connector import AsyncConnector, SessionConnector
+from HDrezka.transport import SingleFlight
+
+
+class TestSingleFlight(TestCase):
+    def setUp(self) -> None:
+        self.single_flight = SingleFlight()
+
+    def tearDown(self) -> None:
+        del self.single_flight
+
+    def wait_requests(self, number):
+        deadline = time.monotonic() + 5
+        while self.single_flight.statistics.requests < number and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    def test_key(self):
+        url = "https://rezka.ag/engine/ajax/quick_content.php"
+        self.assertEqual(
+            SingleFlight.make_key("POST", url, {"data": {"id": 1, "is_touch": 1}}),
+            SingleFlight.make_key("POST", url, {"data": {"is_touch": 1, "id": 1}}),
+        )
+        self.assertNotEqual(
+            SingleFlight.make_key("GET", url, {}),
+            SingleFlight.make_key("GET", url, {"headers": {"Range": "bytes=0-"}}),
+        )
+        self.assertTrue(self.single_flight.is_coalescable("POST", url, {}))
+        self.assertFalse(self.single_flight.is_coalescable("POST", "https://rezka.ag/ajax/add_comment/", {}))
+        self.assertFalse(self.single_flight.is_coalescable("GET", url, {"stream": True}))
+
+    @requests_mock.Mocker()
+    def test_threads(self, m):
+        release = threading.Event()
+
+        def callback(request, context):
+            release.wait(5)
+            return "movie"
+
+        m.get("https://rezka.ag/films/comedy/1-film.html", text=callback)
+        connector = SessionConnector()
+        connector.single_flight = self.single_flight
+        responses = []
+
+        def worker():
+            responses.append(connector.get("https://rezka.ag/films/comedy/1-film.html"))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        self.wait_requests(5)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(len(responses), 5)
+        self.assertTrue(all(response is responses[0] for response in responses))
+        self.assertEqual(self.single_flight.statistics.as_dict(), {"requests": 5, "sent": 1, "deduplicated": 4})
+        self.assertEqual(self.single_flight.in_flight, 0)
+
+    def test_shared_exception(self):
+        release = threading.Event()
+        errors = []
+
+        def send():
+            release.wait(5)
+            raise requests.exceptions.ConnectionError("down")
+
+        def worker():
+            try:
+                self.single_flight.execute("GET", "https://rezka.ag/", {}, send)
+            except requests.exceptions.ConnectionError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        self.wait_requests(3)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(self.single_flight.statistics.sent, 1)
+
+    def test_sequential_requests(self):
+        for _ in range(3):
+            self.single_flight.execute("GET", "https://rezka.ag/", {}, lambda: "response")
+        self.assertEqual(self.single_flight.statistics.sent, 3)
+
+    def test_async(self):
+        calls = []
+
+        async def handler(request: httpx.Request):
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, text=request.url.path)
+
+        connector = AsyncConnector(transport=httpx.MockTransport(handler))
+        connector.single_flight = self.single_flight
+
+        async def gather():
+            urls = ["https://rezka.ag/person/1-name/"] * 5 + ["https://rezka.ag/person/2-name/"]
+            return await asyncio.gather(*(connector.get(url) for url in urls))
+
+        responses = asyncio.run(gather())
+        self.assertEqual(len(calls), 2)
+        self.assertIs(responses[0], responses[4])
+        self.assertEqual(responses[5].text, "/person/2-name/")
+        self.assertEqual(self.single_flight.statistics.deduplicated, 4)
+
+    def test_async_calls_per_loop(self):
+        connector = AsyncConnector(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        connector.single_flight = self.single_flight
+
+        async def fetch():
+            await connector.get("https://rezka.ag/films/")
+            await connector.close()
+            return len(self.single_flight._async_calls)  # noqa
+
+        self.assertEqual([asyncio.run(fetch()) for _ in range(3)], [1, 1, 1])
+        gc.collect()
+        self.assertEqual(len(self.single_flight._async_calls), 0)  # noqa
+        self.assertEqual(self.single_flight.in_flight, 0)
+
+    def test_abandoned_loop(self):
+        loop = asyncio.new_event_loop()
+        started = []
+
+        async def hang():
+            started.append(True)
+            await asyncio.sleep(3600)
+
+        loop.create_task(self.single_flight.aexecute("GET", "https://rezka.ag/films/", {}, hang))
+        loop.run_until_complete(asyncio.sleep(0))
+        loop.close()
+        self.assertEqual(started, [True])
+
+        async def send():
+            return "response"
+
+        result = asyncio.run(self.single_flight.aexecute("GET", "https://rezka.ag/films/", {}, send))
+        self.assertEqual(result, "response")
+        self.assertEqual(self.single_flight.statistics.sent, 2)
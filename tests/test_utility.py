@@ -0,0 +1,111 @@
+import random
+import re
+from datetime import datetime, timedelta
+from unittest import TestCase
+from unittest.mock import patch
+from urllib import parse
+
+from HDrezka.utility import (
+    REGEX_FRAGMENT,
+    REGEX_MOVIE_FRAGMENT,
+    REGEX_QUERY,
+    URL_REGEX_DICT,
+    URLsType,
+    convert_string_into_datetime,
+    convert_strings_into_datetimes,
+    determine_url_type,
+)
+from tests.mock_html.html_construcror import generate_fake_html, read_reference_file
+
+URLS = {
+    "https://rezka.ag": URLsType.main,
+    "https://rezka.ag/": URLsType.main,
+    "https://rezka.ag/page/1/": URLsType.main,
+    "https://rezka.ag/page/3/": URLsType.poster,
+    "https://rezka.ag/films/": URLsType.poster,
+    "https://rezka.ag/films/best/2021/page/2/": URLsType.poster,
+    "https://rezka.ag/ua/cartoons/best/fantasy/": URLsType.poster,
+    "https://rezka.ag/country/%D0%A1%D0%A8%D0%90/": URLsType.poster,
+    "https://rezka.ag/collections/": URLsType.collections,
+    "https://rezka.ag/collections/123-pro-drakonov/": URLsType.poster,
+    "https://rezka.ag/qa/": URLsType.qa,
+    "https://rezka.ag/qa/kak-nazyvaetsya-film.html": URLsType.qa_info,
+    "https://rezka.ag/franchises/page/2/": URLsType.franchises,
+    "https://rezka.ag/franchises/12-topor/": URLsType.franchises_info,
+    "https://rezka.ag/person/123-person-name/": URLsType.person_info,
+    "https://rezka.ag/films/drama/123-film-2020.html": URLsType.movie,
+    "https://rezka.ag/films/drama/123-film-2020.html#akter": URLsType.person_info,
+    "https://rezka.ag/unknown/#t:1-s:1-e:5": URLsType.movie,
+    "https://rezka.ag/unknown/?filter=popular&genre=1": URLsType.poster,
+    "https://rezka.ag/index.php?do=search&subaction=search&q=топор": URLsType.poster,
+    "https://rezka.ag/unknown/path": URLsType.unknown,
+}
+
+
+def sequential_url_type(url: str) -> URLsType:
+    url_split = parse.urlsplit(url)
+    if url_split.path == "":
+        return URLsType.main
+    if re.fullmatch(REGEX_QUERY, url_split.query):
+        return URLsType.poster
+    if re.fullmatch(REGEX_FRAGMENT, url_split.fragment):
+        return URLsType.person_info
+    if re.fullmatch(REGEX_MOVIE_FRAGMENT, url_split.fragment):
+        return URLsType.movie
+    for page_type, pattern in URL_REGEX_DICT.items():
+        if re.fullmatch(pattern, url_split.path):
+            return page_type
+    return URLsType.unknown
+
+
+class TestDetermineUrlType(TestCase):
+    def test_known_urls(self):
+        for url, url_type in URLS.items():
+            self.assertEqual(determine_url_type(url), url_type, url)
+
+    def test_same_as_sequential(self):
+        urls = list(URLS) + [item["url"] for item in read_reference_file("reference_movie_data.json").values()]
+        urls += [poster["url"] for name in ("films", "series", "best", "new") for poster in generate_fake_html(name)[0]]
+        parts = ["films", "series", "best", "page", "1", "2", "qa", "collections", "franchises", "person", "ua",
+                 "country", "year", "search", "new", "123-name", "12-film-2020.html", "drama", "x.html", ""]
+        suffixes = ["", "/", "#akter", "#t:1-s:2-e:3", "?filter=last", "?filter=soon&genre=2", "?page=2"]
+        generator = random.Random(0)
+        for _ in range(5000):
+            path = "/".join(generator.choice(parts) for _ in range(generator.randint(1, 5)))
+            urls.append(f"https://rezka.ag/{path}{generator.choice(suffixes)}")
+
+        for url in urls:
+            self.assertEqual(determine_url_type(url), sequential_url_type(url), url)
+
+    def test_cache(self):
+        determine_url_type.cache_clear()
+        determine_url_type("https://rezka.ag/films/")
+        determine_url_type("https://rezka.ag/films/")
+        self.assertEqual(determine_url_type.cache_info().hits, 1)
+
+
+class TestConvertStringsIntoDatetimes(TestCase):
+    def test_same_as_single(self):
+        strings = ["12 мая 2023 14:01", "1 января 2020", "февраль 2021", "2019 год", "25 декабря 2022 года",
+                   "3 марта 2018 - ...", "", None, "12 мая 2023 14:01", "сегодня, 10:30", "вчера, 23:59"]
+        self.assertEqual(convert_strings_into_datetimes(strings), [convert_string_into_datetime(i) for i in strings])
+        self.assertEqual(convert_strings_into_datetimes(iter(strings[:2])), [datetime(2023, 5, 12, 14, 1),
+                                                                             datetime(2020, 1, 1)])
+
+    def test_one_today_per_batch(self):
+        today = datetime.combine(datetime.now(), datetime.min.time())
+        with patch("HDrezka.utility.datetime", wraps=datetime) as mock_datetime:
+            dates = convert_strings_into_datetimes(["сегодня, 10:30", "вчера, 23:59", "сегодня", "вчера"])
+        self.assertEqual(mock_datetime.now.call_count, 1)
+        self.assertEqual(dates, [today + timedelta(hours=10, minutes=30), today - timedelta(minutes=1),
+                                 today, today - timedelta(days=1)])
+
+    def test_repeated_strings(self):
+        with patch("HDrezka.utility.convert_string_into_datetime", wraps=convert_string_into_datetime) as convert:
+            dates = convert_strings_into_datetimes(["12 мая 2023 14:01"] * 3 + ["2019 год"])
+        self.assertEqual(convert.call_count, 2)
+        self.assertIs(dates[0], dates[2])
+
+    def test_unexpected_month(self):
+        with self.assertRaises(ValueError):
+            convert_strings_into_datetimes(["1 января 2020", "1 янв 2020"])